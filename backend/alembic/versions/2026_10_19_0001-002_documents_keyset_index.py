@@ -0,0 +1,26 @@
+"""Composite index for keyset pagination of documents
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "002"
+down_revision: Union[str, None] = "001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Matches ORDER BY created_at DESC, id DESC and the (created_at, id) seek
+    op.create_index("ix_documents_created_at_id", "documents", ["created_at", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_documents_created_at_id", table_name="documents")
@@ -0,0 +1,61 @@
+"""Denormalised owner column on documents
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+
+# revision identifiers, used by Alembic.
+revision: str = "003"
+down_revision: Union[str, None] = "002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("documents", sa.Column("user_id", UUID(as_uuid=True), nullable=True))
+
+    # Backfill owner from source
+    op.execute(
+        "UPDATE documents AS d SET user_id = s.user_id "
+        "FROM sources AS s WHERE d.source_id = s.id"
+    )
+    op.alter_column("documents", "user_id", nullable=False)
+    op.create_foreign_key(
+        "fk_documents_user_id", "documents", "users",
+        ["user_id"], ["id"], ondelete="CASCADE",
+    )
+
+    # Keep documents.user_id consistent with sources.user_id
+    op.create_unique_constraint("uq_sources_id_user_id", "sources", ["id", "user_id"])
+    op.create_foreign_key(
+        "fk_documents_source_owner", "documents", "sources",
+        ["source_id", "user_id"], ["id", "user_id"],
+        ondelete="CASCADE", onupdate="CASCADE",
+    )
+
+    # User-scoped indexes replace the unscoped keyset index
+    op.drop_index("ix_documents_created_at_id", table_name="documents")
+    op.create_index(
+        "ix_documents_user_created_at", "documents", ["user_id", "created_at", "id"]
+    )
+    op.create_index("ix_documents_user_is_read", "documents", ["user_id", "is_read"])
+    op.create_index("ix_documents_user_is_starred", "documents", ["user_id", "is_starred"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_documents_user_is_starred", table_name="documents")
+    op.drop_index("ix_documents_user_is_read", table_name="documents")
+    op.drop_index("ix_documents_user_created_at", table_name="documents")
+    op.create_index("ix_documents_created_at_id", "documents", ["created_at", "id"])
+    op.drop_constraint("fk_documents_source_owner", "documents", type_="foreignkey")
+    op.drop_constraint("uq_sources_id_user_id", "sources", type_="unique")
+    op.drop_constraint("fk_documents_user_id", "documents", type_="foreignkey")
+    op.drop_column("documents", "user_id")
@@ -0,0 +1,36 @@
+"""Stored chunk count on documents
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "004"
+down_revision: Union[str, None] = "003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "documents",
+        sa.Column("chunks_count", sa.Integer, nullable=False, server_default="0"),
+    )
+
+    # Backfill from existing chunks
+    op.execute(
+        "UPDATE documents AS d SET chunks_count = c.n "
+        "FROM (SELECT document_id, count(*) AS n FROM document_chunks "
+        "GROUP BY document_id) AS c WHERE d.id = c.document_id"
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("documents", "chunks_count")
@@ -0,0 +1,28 @@
+"""HTTP validators on sources for conditional feed fetching
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "005"
+down_revision: Union[str, None] = "004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("sources", sa.Column("etag", sa.String(512), nullable=True))
+    op.add_column("sources", sa.Column("last_modified", sa.String(64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("sources", "last_modified")
+    op.drop_column("sources", "etag")
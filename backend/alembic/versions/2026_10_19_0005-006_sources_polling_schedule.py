@@ -0,0 +1,35 @@
+"""Polling schedule columns on sources
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "006"
+down_revision: Union[str, None] = "005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("sources", sa.Column("fetch_interval_seconds", sa.Integer, nullable=True))
+    op.add_column("sources", sa.Column("next_fetch_at", sa.DateTime, nullable=True))
+    op.add_column(
+        "sources",
+        sa.Column("consecutive_failures", sa.Integer, nullable=False, server_default="0"),
+    )
+    op.create_index("ix_sources_next_fetch_at", "sources", ["next_fetch_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_sources_next_fetch_at", table_name="sources")
+    op.drop_column("sources", "consecutive_failures")
+    op.drop_column("sources", "next_fetch_at")
+    op.drop_column("sources", "fetch_interval_seconds")
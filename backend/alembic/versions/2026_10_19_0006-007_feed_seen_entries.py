@@ -0,0 +1,37 @@
+"""Seen-entry index for feed sources
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+
+# revision identifiers, used by Alembic.
+revision: str = "007"
+down_revision: Union[str, None] = "006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "feed_seen_entries",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True),
+        sa.Column("source_id", UUID(as_uuid=True), sa.ForeignKey("sources.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("entry_key", sa.String(2048), nullable=False),
+        sa.Column("entry_updated_at", sa.DateTime, nullable=True),
+        sa.Column("document_id", UUID(as_uuid=True), sa.ForeignKey("documents.id", ondelete="SET NULL"), nullable=True),
+        sa.Column("created_at", sa.DateTime, nullable=False, server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime, nullable=False, server_default=sa.func.now()),
+        sa.UniqueConstraint("source_id", "entry_key", name="uq_feed_seen_entry"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("feed_seen_entries")
@@ -0,0 +1,52 @@
+"""Raw fetch archive linked to documents
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+
+# revision identifiers, used by Alembic.
+revision: str = "009"
+down_revision: Union[str, None] = "008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "raw_fetches",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True),
+        sa.Column("sha256", sa.String(64), nullable=False, unique=True),
+        sa.Column("size_bytes", sa.Integer, nullable=False),
+        sa.Column("stored_bytes", sa.Integer, nullable=False),
+        sa.Column("created_at", sa.DateTime, nullable=False, server_default=sa.func.now()),
+    )
+    op.add_column(
+        "documents",
+        sa.Column(
+            "raw_fetch_id",
+            UUID(as_uuid=True),
+            sa.ForeignKey("raw_fetches.id", ondelete="SET NULL"),
+            nullable=True,
+        ),
+    )
+    # Partial: only archived documents are scanned by re-extraction
+    op.create_index(
+        "ix_documents_raw_fetch_id",
+        "documents",
+        ["raw_fetch_id"],
+        postgresql_where=sa.text("raw_fetch_id IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_documents_raw_fetch_id", table_name="documents")
+    op.drop_column("documents", "raw_fetch_id")
+    op.drop_table("raw_fetches")
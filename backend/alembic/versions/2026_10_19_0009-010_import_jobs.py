@@ -0,0 +1,52 @@
+"""Batch URL import jobs
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import ENUM, JSONB, UUID
+
+
+# revision identifiers, used by Alembic.
+revision: str = "010"
+down_revision: Union[str, None] = "009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+import_job_status_enum = ENUM(
+    "pending", "running", "completed", "failed", name="importjobstatus", create_type=False
+)
+
+
+def upgrade() -> None:
+    import_job_status_enum.create(op.get_bind(), checkfirst=True)
+
+    op.create_table(
+        "import_jobs",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True),
+        sa.Column("user_id", UUID(as_uuid=True), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("source_id", UUID(as_uuid=True), sa.ForeignKey("sources.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("status", import_job_status_enum, nullable=False, server_default="pending"),
+        sa.Column("total", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("processed", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("succeeded", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("duplicates", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("failed", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("failures", JSONB, nullable=False, server_default="[]"),
+        sa.Column("error", sa.Text, nullable=True),
+        sa.Column("created_at", sa.DateTime, nullable=False, server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime, nullable=False, server_default=sa.func.now()),
+        sa.Column("finished_at", sa.DateTime, nullable=True),
+    )
+    op.create_index("ix_import_jobs_user_id", "import_jobs", ["user_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_import_jobs_user_id", table_name="import_jobs")
+    op.drop_table("import_jobs")
+    import_job_status_enum.drop(op.get_bind(), checkfirst=True)
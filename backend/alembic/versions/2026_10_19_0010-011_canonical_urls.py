@@ -0,0 +1,158 @@
+"""Canonical document URLs and per-user URL bucket sources
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+from urllib.parse import unquote_plus, urlsplit, urlunsplit
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "011"
+down_revision: Union[str, None] = "010"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Copy of app.services.url_canonical at this revision, so later changes to
+# the application code cannot alter what this migration does.
+
+# Query parameters that only track the referrer and never change the page
+TRACKING_PARAMS = {
+    "fbclid",
+    "gclid",
+    "dclid",
+    "msclkid",
+    "mc_cid",
+    "mc_eid",
+    "igshid",
+    "spm",
+    "ref_src",
+}
+TRACKING_PREFIXES = ("utm_",)
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# Longest canonical URL stored (documents.canonical_url is String(2048))
+MAX_CANONICAL_URL_LENGTH = 2048
+
+
+def _canonicalize_url(url: str) -> str:
+    """
+    Normalise a URL so trivially different spellings compare equal.
+
+    Lowercases the scheme and host, drops default ports, fragments and
+    tracking parameters and trailing slashes, and sorts the remaining
+    query parameters by name. Parameters are kept exactly as written
+    (encoding, blank values, order of repeated names).
+
+    Args:
+        url: Absolute http(s) URL
+
+    Returns:
+        Canonical URL string
+
+    Raises:
+        ValueError: If the URL is malformed (e.g. a bad port) or its
+            canonical form is longer than MAX_CANONICAL_URL_LENGTH
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if ":" in host:
+        # IPv6 literal
+        host = f"[{host}]"
+
+    port = parts.port
+    if port is not None and port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{port}"
+    if parts.username:
+        credentials = parts.username
+        if parts.password:
+            credentials = f"{credentials}:{parts.password}"
+        host = f"{credentials}@{host}"
+
+    # Filter and sort the raw "name=value" pairs; the sort is stable, so
+    # repeated names keep their relative order
+    params = []
+    for param in parts.query.split("&"):
+        if not param:
+            continue
+        name = unquote_plus(param.split("=", 1)[0])
+        if name.lower() in TRACKING_PARAMS or name.lower().startswith(TRACKING_PREFIXES):
+            continue
+        params.append((name, param))
+    query = "&".join(param for _, param in sorted(params, key=lambda item: item[0]))
+
+    path = parts.path.rstrip("/") or "/"
+
+    canonical_url = urlunsplit((scheme, host, path, query, ""))
+    if len(canonical_url) > MAX_CANONICAL_URL_LENGTH:
+        raise ValueError(f"URL longer than {MAX_CANONICAL_URL_LENGTH} characters")
+    return canonical_url
+
+
+def upgrade() -> None:
+    op.add_column(
+        "documents",
+        sa.Column("canonical_url", sa.String(2048), nullable=True),
+    )
+    op.add_column(
+        "sources",
+        sa.Column("is_bucket", sa.Boolean, nullable=False, server_default="false"),
+    )
+
+    # Backfill in Python so existing rows use the same canonical form as new
+    # ones. Where a user already has the same URL twice, only the oldest
+    # document claims it.
+    conn = op.get_bind()
+    rows = conn.execute(
+        sa.text(
+            "SELECT id, user_id, url FROM documents "
+            "WHERE url IS NOT NULL ORDER BY created_at, id"
+        )
+    )
+    claimed = set()
+    updates = []
+    for doc_id, user_id, url in rows:
+        try:
+            canonical_url = _canonicalize_url(url)
+        except ValueError:
+            continue
+        if (user_id, canonical_url) in claimed:
+            continue
+        claimed.add((user_id, canonical_url))
+        updates.append({"id": doc_id, "canonical_url": canonical_url})
+
+    if updates:
+        conn.execute(
+            sa.text("UPDATE documents SET canonical_url = :canonical_url WHERE id = :id"),
+            updates,
+        )
+
+    op.create_index(
+        "uq_documents_user_canonical_url",
+        "documents",
+        ["user_id", "canonical_url"],
+        unique=True,
+        postgresql_where=sa.text("canonical_url IS NOT NULL"),
+    )
+    op.create_index(
+        "uq_sources_user_bucket",
+        "sources",
+        ["user_id", "type"],
+        unique=True,
+        postgresql_where=sa.text("is_bucket"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_sources_user_bucket", table_name="sources")
+    op.drop_index("uq_documents_user_canonical_url", table_name="documents")
+    op.drop_column("sources", "is_bucket")
+    op.drop_column("documents", "canonical_url")
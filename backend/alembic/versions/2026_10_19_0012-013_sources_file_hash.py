@@ -0,0 +1,33 @@
+"""Content hash of uploaded source files
+
+Revision ID: 013
+Revises: 012
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "013"
+down_revision: Union[str, None] = "012"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("sources", sa.Column("file_hash", sa.String(64), nullable=True))
+    op.create_index(
+        "ix_sources_user_file_hash",
+        "sources",
+        ["user_id", "file_hash"],
+        postgresql_where=sa.text("file_hash IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_sources_user_file_hash", table_name="sources")
+    op.drop_column("sources", "file_hash")
@@ -0,0 +1,41 @@
+"""Per-source boilerplate line model
+
+Revision ID: 016
+Revises: 015
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+
+
+# revision identifiers, used by Alembic.
+revision: str = "016"
+down_revision: Union[str, None] = "015"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "source_boilerplate",
+        sa.Column(
+            "source_id",
+            UUID(as_uuid=True),
+            sa.ForeignKey("sources.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("fingerprints", JSONB, nullable=False, server_default="{}"),
+        sa.Column("entries_seen", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("documents_stripped", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("lines_removed", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("tokens_removed", sa.BigInteger, nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime, nullable=False, server_default=sa.func.now()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("source_boilerplate")
@@ -0,0 +1,52 @@
+"""Unique uploaded file content per user
+
+Revision ID: 017
+Revises: 016
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "017"
+down_revision: Union[str, None] = "016"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Sources created by concurrent uploads of one file: the oldest keeps
+    # the hash (and is reused from now on), the others keep working unhashed
+    op.execute(
+        """
+        UPDATE sources AS s SET file_hash = NULL
+        WHERE s.file_hash IS NOT NULL AND EXISTS (
+            SELECT 1 FROM sources AS o
+            WHERE o.user_id = s.user_id
+              AND o.file_hash = s.file_hash
+              AND (o.created_at, o.id) < (s.created_at, s.id)
+        )
+        """
+    )
+    op.drop_index("ix_sources_user_file_hash", table_name="sources")
+    op.create_index(
+        "uq_sources_user_file_hash",
+        "sources",
+        ["user_id", "file_hash"],
+        unique=True,
+        postgresql_where=sa.text("file_hash IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_sources_user_file_hash", table_name="sources")
+    op.create_index(
+        "ix_sources_user_file_hash",
+        "sources",
+        ["user_id", "file_hash"],
+        postgresql_where=sa.text("file_hash IS NOT NULL"),
+    )
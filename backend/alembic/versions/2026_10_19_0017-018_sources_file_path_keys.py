@@ -0,0 +1,39 @@
+"""Rewrite legacy upload paths to storage keys
+
+Revision ID: 018
+Revises: 017
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "018"
+down_revision: Union[str, None] = "017"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Uploads before storage backends were saved at <upload_dir>/<user_id>/<uuid>.pdf
+    # and recorded by that path (e.g. backend/data/uploads/<user_id>/<uuid>.pdf).
+    # The local backend resolves keys under upload_dir, so the last two
+    # components are the key. Files are not moved: deployments switching to
+    # S3 must copy them to the bucket under the same keys.
+    op.execute(
+        r"""
+        UPDATE sources
+        SET file_path = regexp_replace(file_path, '^.*/([^/]+/[^/]+)$', '\1')
+        WHERE file_path IS NOT NULL
+          AND file_path NOT LIKE 'blobs/%'
+          AND file_path ~ '/[^/]+/[^/]+$'
+        """
+    )
+
+
+def downgrade() -> None:
+    # Keys stay valid relative to upload_dir; the original prefixes are not kept
+    pass
@@ -0,0 +1,40 @@
+"""Per-source count of seen feed entries
+
+Revision ID: 019
+Revises: 018
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "019"
+down_revision: Union[str, None] = "018"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "sources",
+        sa.Column("seen_entry_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.execute(
+        """
+        UPDATE sources AS s SET seen_entry_count = c.rows
+        FROM (
+            SELECT source_id, count(*) AS rows
+            FROM feed_seen_entries
+            GROUP BY source_id
+        ) AS c
+        WHERE c.source_id = s.id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("sources", "seen_entry_count")
@@ -3,7 +3,7 @@ Chat API endpoints with streaming support.
 """
 import logging
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -19,6 +19,7 @@ router = APIRouter(prefix="/chat", tags=["chat"])
 @router.post("/stream")
 async def stream_chat(
     request: ChatRequest,
+    http_request: Request,
     db: AsyncSession = Depends(get_db),
 ) -> StreamingResponse:
     """
@@ -26,6 +27,7 @@ async def stream_chat(
 
     Args:
         request: Chat request with message and parameters
+        http_request: Underlying HTTP request, used to detect client disconnects
         db: Database session
 
     Returns:
@@ -43,6 +45,7 @@ async def stream_chat(
         scope=request.scope,
         include_web=request.include_web,
         user_id=None,  # TODO: Get from auth context
+        is_disconnected=http_request.is_disconnected,
     )
 
     return StreamingResponse(
@@ -1,22 +1,32 @@
 """
 Documents API endpoints for listing and retrieving documents.
 """
+import base64
+import mimetypes
+from datetime import datetime
 from typing import Annotated, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
-from sqlalchemy import func, select
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from fastapi.responses import RedirectResponse, StreamingResponse
+from sqlalchemy import func, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer
 
+from app.core.config import get_settings
 from app.db.session import get_db
-from app.models.models import Document, DocumentChunk, Source
+from app.models.models import Document, DocumentChunk, Embedding, Source
 from app.schemas.document_schemas import (
     DocumentDetailResponse,
     DocumentListItem,
     DocumentListResponse,
     DocumentUpdateRequest,
 )
+from app.schemas.import_schemas import DocumentStatusResponse
 from app.schemas.response import APIResponse
+from app.services.storage_service import get_storage_backend
+
+settings = get_settings()
 
 router = APIRouter(prefix="/documents", tags=["documents"])
 
@@ -37,8 +47,10 @@ async def get_current_user_id(
 
 @router.get("", response_model=APIResponse[DocumentListResponse])
 async def list_documents(
-    page: int = Query(1, ge=1, description="Page number"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    page: int = Query(1, ge=1, description="Page number (ignored when cursor is given)"),
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
+    include_total: bool = Query(False, description="Compute the exact total (extra count query)"),
     status_filter: Optional[str] = Query(None, description="Filter by status"),
     is_read: Optional[bool] = Query(None, description="Filter by read status"),
     is_starred: Optional[bool] = Query(None, description="Filter by starred status"),
@@ -47,14 +59,27 @@ async def list_documents(
     db: AsyncSession = Depends(get_db),
 ):
     """
-    List documents with pagination and filters.
+    List documents with keyset pagination and filters.
     """
-    # Build query
+    # Build query (owner filter on documents; Source only supplies display columns)
+    # Only list columns are selected so document bodies are never read
     stmt = (
-        select(Document, Source.name.label("source_name"), Source.type.label("source_type"))
+        select(
+            Document.id,
+            Document.title,
+            Document.url,
+            Document.author,
+            Document.summary,
+            Document.status,
+            Document.is_read,
+            Document.is_starred,
+            Document.published_at,
+            Document.created_at,
+            Source.name.label("source_name"),
+            Source.type.label("source_type"),
+        )
         .join(Source, Document.source_id == Source.id)
-        .where(Source.user_id == user_id)
-        .order_by(Document.created_at.desc())
+        .where(Document.user_id == user_id)
     )
     
     # Apply filters
@@ -67,39 +92,51 @@ async def list_documents(
     if source_type:
         stmt = stmt.where(Source.type == source_type)
     
-    # Count total
-    count_stmt = select(func.count()).select_from(stmt.subquery())
-    total_result = await db.execute(count_stmt)
-    total = total_result.scalar() or 0
+    # Count total (optional, the only query whose cost grows with the library)
+    total = None
+    if include_total:
+        count_stmt = select(func.count()).select_from(stmt.subquery())
+        total_result = await db.execute(count_stmt)
+        total = total_result.scalar() or 0
     
-    # Paginate
-    offset = (page - 1) * page_size
-    stmt = stmt.offset(offset).limit(page_size)
+    # Paginate: seek past the cursor on (created_at, id), matching the index order
+    stmt = stmt.order_by(Document.created_at.desc(), Document.id.desc())
+    if cursor:
+        cursor_created_at, cursor_id = _decode_cursor(cursor)
+        stmt = stmt.where(
+            tuple_(Document.created_at, Document.id) < tuple_(cursor_created_at, cursor_id)
+        )
+    else:
+        stmt = stmt.offset((page - 1) * page_size)
     
-    # Execute
-    result = await db.execute(stmt)
+    # Fetch one extra row to detect further pages
+    result = await db.execute(stmt.limit(page_size + 1))
     rows = result.all()
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
     
     # Build response
     items = []
-    for doc, source_name, source_type in rows:
+    for row in rows:
         item = DocumentListItem(
-            id=doc.id,
-            title=doc.title,
-            url=doc.url,
-            author=doc.author,
-            summary=doc.summary,
-            status=doc.status.value,
-            is_read=doc.is_read,
-            is_starred=doc.is_starred,
-            published_at=doc.published_at,
-            created_at=doc.created_at,
-            source_name=source_name,
-            source_type=source_type.value,
+            id=row.id,
+            title=row.title,
+            url=row.url,
+            author=row.author,
+            summary=row.summary,
+            status=row.status.value,
+            is_read=row.is_read,
+            is_starred=row.is_starred,
+            published_at=row.published_at,
+            created_at=row.created_at,
+            source_name=row.source_name,
+            source_type=row.source_type.value,
         )
         items.append(item)
     
-    has_more = (offset + page_size) < total
+    next_cursor = None
+    if has_more and rows:
+        next_cursor = _encode_cursor(rows[-1].created_at, rows[-1].id)
     
     return APIResponse(
         success=True,
@@ -109,10 +146,30 @@ async def list_documents(
             page=page,
             page_size=page_size,
             has_more=has_more,
+            next_cursor=next_cursor,
         )
     )
 
 
+def _encode_cursor(created_at: datetime, document_id: UUID) -> str:
+    """Encode a (created_at, id) keyset position as an opaque cursor."""
+    raw = f"{created_at.isoformat()}|{document_id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """Decode an opaque cursor into its (created_at, id) keyset position."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        created_at, document_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), UUID(document_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
 @router.get("/{document_id}", response_model=APIResponse[DocumentDetailResponse])
 async def get_document(
     document_id: UUID,
@@ -126,7 +183,8 @@ async def get_document(
     stmt = (
         select(Document, Source.name.label("source_name"), Source.type.label("source_type"))
         .join(Source, Document.source_id == Source.id)
-        .where(Document.id == document_id, Source.user_id == user_id)
+        .where(Document.id == document_id, Document.user_id == user_id)
+        .options(undefer(Document.content), undefer(Document.content_html))
     )
     
     result = await db.execute(stmt)
@@ -140,11 +198,6 @@ async def get_document(
     
     doc, source_name, source_type = row
     
-    # Count chunks
-    chunks_stmt = select(func.count()).select_from(DocumentChunk).where(DocumentChunk.document_id == document_id)
-    chunks_result = await db.execute(chunks_stmt)
-    chunks_count = chunks_result.scalar() or 0
-    
     # Build response
     detail = DocumentDetailResponse(
         id=doc.id,
@@ -153,7 +206,9 @@ async def get_document(
         author=doc.author,
         summary=doc.summary,
         content=doc.content,
+        content_html=doc.content_html,
         status=doc.status.value,
+        processing_error=doc.processing_error,
         is_read=doc.is_read,
         is_starred=doc.is_starred,
         read_position=doc.read_position,
@@ -163,12 +218,144 @@ async def get_document(
         source_id=doc.source_id,
         source_name=source_name,
         source_type=source_type.value,
-        chunks_count=chunks_count,
+        chunks_count=doc.chunks_count,
     )
     
     return APIResponse(success=True, data=detail)
 
 
+@router.get("/{document_id}/status", response_model=APIResponse[DocumentStatusResponse])
+async def get_document_status(
+    document_id: UUID,
+    user_id: UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Get document processing status (for polling background ingestion).
+    """
+    embeddings_count = (
+        select(func.count(Embedding.id))
+        .join(DocumentChunk, Embedding.chunk_id == DocumentChunk.id)
+        .where(DocumentChunk.document_id == Document.id)
+        .scalar_subquery()
+    )
+    stmt = select(
+        Document.status,
+        Document.chunks_count,
+        Document.processing_error,
+        embeddings_count,
+    ).where(Document.id == document_id, Document.user_id == user_id)
+    
+    result = await db.execute(stmt)
+    row = result.one_or_none()
+    
+    if not row:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Document not found"
+        )
+    
+    doc_status, chunks_count, processing_error, embeddings = row
+    
+    return APIResponse(
+        success=True,
+        data=DocumentStatusResponse(
+            document_id=document_id,
+            status=doc_status.value,
+            chunks_count=chunks_count,
+            embeddings_count=embeddings or 0,
+            error=processing_error,
+        )
+    )
+
+
+@router.get("/{document_id}/file")
+async def download_document_file(
+    document_id: UUID,
+    range_header: Optional[str] = Header(None, alias="Range"),
+    user_id: UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Download the uploaded file behind a document.
+    Redirects to a presigned URL when the storage backend can issue one;
+    otherwise streams the file, honouring single byte-range requests
+    (PDF viewers fetch individual pages this way).
+    """
+    stmt = (
+        select(Source.file_path)
+        .join(Document, Document.source_id == Source.id)
+        .where(Document.id == document_id, Document.user_id == user_id)
+    )
+    file_key = await db.scalar(stmt)
+    
+    if not file_key:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Document has no stored file"
+        )
+    
+    backend = get_storage_backend()
+    url = await backend.presigned_url(file_key, settings.storage_presign_expiry_seconds)
+    if url:
+        return RedirectResponse(url, status_code=status.HTTP_307_TEMPORARY_REDIRECT)
+    
+    try:
+        size = await backend.size(file_key)
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Stored file not found"
+        )
+    
+    media_type = mimetypes.guess_type(file_key)[0] or "application/octet-stream"
+    byte_range = _parse_range(range_header, size)
+    if byte_range:
+        start, end = byte_range
+        return Response(
+            content=await backend.read_range(file_key, start, end),
+            status_code=status.HTTP_206_PARTIAL_CONTENT,
+            media_type=media_type,
+            headers={"Content-Range": f"bytes {start}-{end}/{size}", "Accept-Ranges": "bytes"},
+        )
+    
+    return StreamingResponse(
+        backend.open_read(file_key),
+        media_type=media_type,
+        headers={"Content-Length": str(size), "Accept-Ranges": "bytes"},
+    )
+
+
+def _parse_range(header: Optional[str], size: int) -> Optional[tuple[int, int]]:
+    """
+    Parse a single "bytes=" Range header into inclusive (start, end).
+    Returns None (serve the whole file) for absent, malformed or multi-range headers.
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    
+    first, _, last = header[len("bytes="):].strip().partition("-")
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else size - 1
+        else:
+            # Suffix range: the last N bytes
+            start = max(0, size - int(last))
+            end = size - 1
+    except ValueError:
+        return None
+    
+    end = min(end, size - 1)
+    if start > end:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    return start, end
+
+
 @router.patch("/{document_id}", response_model=APIResponse[dict])
 async def update_document(
     document_id: UUID,
@@ -180,10 +367,8 @@ async def update_document(
     Update document metadata (read status, starred, position).
     """
     # Fetch document
-    stmt = (
-        select(Document)
-        .join(Source, Document.source_id == Source.id)
-        .where(Document.id == document_id, Source.user_id == user_id)
+    stmt = select(Document).where(
+        Document.id == document_id, Document.user_id == user_id
     )
     
     result = await db.execute(stmt)
@@ -4,6 +4,7 @@ Health check API endpoint.
 from fastapi import APIRouter
 
 from app.core.config import get_settings
+from app.core.metrics import get_metrics
 from app.schemas.response import APIResponse, HealthStatus
 
 router = APIRouter(tags=["health"])
@@ -29,3 +30,19 @@ async def health_check() -> APIResponse[HealthStatus]:
         environment=settings.environment,
     )
     return APIResponse.ok(status)
+
+
+@router.get(
+    "/metrics",
+    response_model=APIResponse[dict],
+    summary="Metrics",
+    description="In-process operational counters",
+)
+async def metrics() -> APIResponse[dict]:
+    """
+    Return the in-process counters of this worker.
+    
+    Returns:
+        APIResponse with counters keyed by name
+    """
+    return APIResponse.ok(get_metrics().snapshot())
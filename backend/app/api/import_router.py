@@ -15,12 +15,26 @@ from fastapi import (
     UploadFile,
     status,
 )
-from sqlalchemy import select
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.session import get_db
-from app.models.models import Source, SourceType
+from app.core.config import get_settings
+from app.core.metrics import get_metrics
+from app.models.models import (
+    Document,
+    DocumentStatus,
+    ImportJob,
+    ImportJobStatus,
+    Source,
+    SourceBoilerplate,
+    SourceType,
+)
 from app.schemas.import_schemas import (
+    BatchURLImportRequest,
+    BoilerplateStatsResponse,
+    ImportJobResponse,
     PDFUploadResponse,
     RSSFetchResponse,
     RSSSourceCreate,
@@ -29,11 +43,17 @@ from app.schemas.import_schemas import (
     URLImportResponse,
 )
 from app.schemas.response import APIResponse
+from app.services.answer_cache import get_answer_cache
+from app.services.feed_refresh_service import FeedRefreshService
+from app.services.import_job_service import run_import_job
 from app.services.ingestion_orchestrator import IngestionOrchestrator
-from app.services.pdf_service import PDFService
+from app.services.raw_archive import RawArchive
 from app.services.rss_service import RSSService
 from app.services.storage_service import FileStorage
-from app.services.url_service import URLService
+from app.services.url_canonical import canonicalize_url
+from app.services.url_import_service import URLImportService
+
+settings = get_settings()
 
 router = APIRouter(prefix="/import", tags=["import"])
 
@@ -77,6 +97,7 @@ async def create_rss_source(
         name=data.name,
         url=str(data.url),
         is_active=True,
+        fetch_full_text=data.fetch_full_text,
     )
     
     db.add(source)
@@ -121,6 +142,9 @@ async def delete_rss_source(
     await db.delete(source)
     await db.commit()
     
+    # Deleted chunks invalidate the owner's cached chat answers
+    get_answer_cache().invalidate(user_id)
+    
     return APIResponse(
         success=True,
         data={"message": "RSS source deleted successfully"}
@@ -168,6 +192,66 @@ async def fetch_rss_articles(
     )
 
 
+@router.get("/rss/{source_id}/boilerplate", response_model=APIResponse[BoilerplateStatsResponse])
+async def get_rss_boilerplate_stats(
+    source_id: UUID,
+    user_id: UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Get boilerplate stripping stats for an RSS source.
+    """
+    stmt = (
+        select(Source.id, SourceBoilerplate)
+        .outerjoin(SourceBoilerplate, SourceBoilerplate.source_id == Source.id)
+        .where(
+            Source.id == source_id,
+            Source.user_id == user_id,
+            Source.type == SourceType.RSS
+        )
+    )
+    result = await db.execute(stmt)
+    row = result.one_or_none()
+    
+    if not row:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="RSS source not found"
+        )
+    
+    _, stats = row
+    if stats is None:
+        # Not refreshed since boilerplate stripping was enabled
+        return APIResponse(
+            success=True,
+            data=BoilerplateStatsResponse(
+                source_id=source_id,
+                entries_seen=0,
+                boilerplate_lines=0,
+                documents_stripped=0,
+                lines_removed=0,
+                tokens_removed=0,
+                updated_at=None,
+            )
+        )
+    
+    return APIResponse(
+        success=True,
+        data=BoilerplateStatsResponse(
+            source_id=source_id,
+            entries_seen=stats.entries_seen,
+            boilerplate_lines=sum(
+                1 for count in stats.fingerprints.values()
+                if count >= settings.boilerplate_min_occurrences
+            ),
+            documents_stripped=stats.documents_stripped,
+            lines_removed=stats.lines_removed,
+            tokens_removed=stats.tokens_removed,
+            updated_at=stats.updated_at,
+        )
+    )
+
+
 async def fetch_rss_articles_task(source_id: UUID):
     """Background task to fetch RSS articles."""
     from app.db.session import async_session_maker
@@ -182,46 +266,7 @@ async def fetch_rss_articles_task(source_id: UUID):
             if not source or not source.url:
                 return
             
-            # Fetch RSS feed
-            rss_service = RSSService()
-            success, entries, error = await rss_service.fetch_feed(source.url)
-            
-            if not success:
-                return
-            
-            # Ingest articles
-            orchestrator = IngestionOrchestrator(db)
-            articles_created = 0
-            articles_skipped = 0
-            
-            for entry in entries:
-                # Use content or summary
-                content = entry.content or entry.summary or ""
-                
-                if not content:
-                    continue
-                
-                # Create document
-                document, is_new, error = await orchestrator.create_document(
-                    source_id=source_id,
-                    title=entry.title,
-                    content=content,
-                    url=entry.url,
-                    author=entry.author,
-                    summary=entry.summary,
-                    published_at=entry.published_at,
-                )
-                
-                if document and is_new:
-                    articles_created += 1
-                    # Process in background
-                    await orchestrator.process_document(document.id)
-                elif document:
-                    articles_skipped += 1
-            
-            # Update last_fetched_at
-            source.last_fetched_at = datetime.utcnow()
-            await db.commit()
+            await FeedRefreshService(db).refresh(source)
         
         except Exception as e:
             # Log error properly
@@ -237,7 +282,8 @@ async def upload_pdf(
     db: AsyncSession = Depends(get_db),
 ):
     """
-    Upload a PDF file and extract text.
+    Upload a PDF file.
+    Returns a pending document immediately; text is extracted in the background.
     """
     # Validate file type
     if not file.filename.lower().endswith(".pdf"):
@@ -246,80 +292,125 @@ async def upload_pdf(
             detail="Only PDF files are allowed"
         )
     
-    # Read file content
-    file_content = await file.read()
-    
-    # Save file
+    # Hash into content-addressed storage (the body size is capped by
+    # UploadSizeLimitMiddleware before it is received)
     storage = FileStorage()
     try:
-        file_path, file_id = storage.save_uploaded_file(
-            user_id=user_id,
-            file_content=file_content,
-            original_filename=file.filename
-        )
+        stored = await storage.save_upload(file, file.filename)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
             detail=str(e)
         )
     
-    # Create PDF source
-    source = Source(
-        user_id=user_id,
-        type=SourceType.PDF,
-        name=custom_title or file.filename,
-        file_path=file_path,
+    source_stmt = select(Source).where(
+        Source.user_id == user_id,
+        Source.type == SourceType.PDF,
+        Source.file_hash == stored.sha256
     )
-    db.add(source)
-    await db.commit()
-    await db.refresh(source)
-    
-    # Extract PDF text
-    pdf_service = PDFService()
-    abs_file_path = storage.get_file_path(file_path)
-    success, text, error = pdf_service.extract_text(abs_file_path)
+    source = await db.scalar(source_stmt)
+    document = None
     
-    if not success:
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail=error or "Failed to extract PDF text"
+    if source is None:
+        # Source and placeholder document are committed together, so a
+        # concurrent upload of the same file finds both
+        source = Source(
+            user_id=user_id,
+            type=SourceType.PDF,
+            name=custom_title or file.filename,
+            file_path=stored.key,
+            file_hash=stored.sha256,
         )
-    
-    # Get metadata for title
-    metadata = pdf_service.get_metadata(abs_file_path)
-    title = custom_title or metadata.get("title") or file.filename
-    
-    # Create document
-    orchestrator = IngestionOrchestrator(db)
-    document, is_new, doc_error = await orchestrator.create_document(
-        source_id=source.id,
-        title=title,
-        content=text,
-        author=metadata.get("author"),
-    )
-    
-    if not document:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=doc_error or "Failed to create document"
+        db.add(source)
+        await db.flush()
+        document = Document(
+            source_id=source.id,
+            user_id=user_id,
+            title=custom_title or file.filename,
+            status=DocumentStatus.PENDING,
         )
+        db.add(document)
+        try:
+            await db.commit()
+        except IntegrityError:
+            # Lost the race with a concurrent upload of the same file
+            await db.rollback()
+            source = await db.scalar(source_stmt)
+            if source is None:
+                raise
+            document = None
     
-    # Process in background
-    background_tasks.add_task(process_document_task, document.id)
+    if document is None:
+        # Re-uploads of the same file reuse the existing document
+        stmt = select(
+            Document.id,
+            Document.title,
+            Document.status,
+            Document.chunks_count,
+            func.length(Document.content),
+        ).where(Document.source_id == source.id).limit(1)
+        existing = (await db.execute(stmt)).one_or_none()
+        
+        if existing and existing.status != DocumentStatus.FAILED:
+            get_metrics().incr("pdf_upload_reused")
+            document_id, existing_title, existing_status, chunks_count, text_length = existing
+            return APIResponse(
+                success=True,
+                data=PDFUploadResponse(
+                    document_id=document_id,
+                    title=existing_title,
+                    status=existing_status.value,
+                    file_path=source.file_path,
+                    text_length=text_length or 0,
+                    chunks_created=chunks_count,
+                )
+            )
+        
+        if existing:
+            # A failed ingestion is retried with the re-uploaded file
+            get_metrics().incr("pdf_upload_retried")
+            document = await db.get(Document, existing.id)
+            document.status = DocumentStatus.PENDING
+            document.processing_error = None
+        else:
+            document = Document(
+                source_id=source.id,
+                user_id=user_id,
+                title=custom_title or file.filename,
+                status=DocumentStatus.PENDING,
+            )
+            db.add(document)
+        await db.commit()
+    
+    # Extraction, chunking and embedding all happen off the request path;
+    # progress is visible via GET /documents/{id}/status
+    background_tasks.add_task(ingest_pdf_task, document.id, source.file_path, custom_title is None)
     
     return APIResponse(
         success=True,
         data=PDFUploadResponse(
             document_id=document.id,
-            title=title,
+            title=document.title,
             status=document.status.value,
-            file_path=file_path,
-            text_length=len(text),
+            file_path=source.file_path,
+            text_length=0,  # Will be updated by background task
             chunks_created=0,  # Will be updated by background task
         )
     )
 
 
+async def ingest_pdf_task(document_id: UUID, file_key: str, use_metadata_title: bool):
+    """Background task to extract, chunk and embed an uploaded PDF."""
+    from app.db.session import async_session_maker
+    
+    async with async_session_maker() as db:
+        try:
+            orchestrator = IngestionOrchestrator(db)
+            await orchestrator.ingest_pdf(document_id, file_key, use_metadata_title)
+        except Exception as e:
+            logger.error("pdf_ingest_task_error", document_id=str(document_id), error=str(e))
+
+
 @router.post("/url", response_model=APIResponse[URLImportResponse])
 async def import_url(
     data: URLImportRequest,
@@ -329,48 +420,70 @@ async def import_url(
 ):
     """
     Import content from a URL.
-    Tries RSSHub first for supported sites, falls back to web scraping.
+    Returns the existing document if the URL is already in the library;
+    otherwise races RSSHub (preferred, for supported sites) against web scraping.
     """
-    # Try RSSHub first for supported sites
-    from app.services.rsshub_service import RSSHubService
+    orchestrator = IngestionOrchestrator(db)
     
-    rsshub_service = RSSHubService()
-    success, title, content, error = await rsshub_service.fetch_entry_for_url(str(data.url))
+    try:
+        canonical_url = canonicalize_url(str(data.url))
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid URL: {e}"
+        )
     
-    # Fallback to web scraping if RSSHub doesn't support this URL
-    if not success:
-        logger.info(
-            "url_import_fallback_to_scraping",
-            url=str(data.url),
-            rsshub_error=error
+    # Re-imports are answered from the library without fetching
+    stmt = select(
+        Document.id,
+        Document.title,
+        Document.status,
+        func.length(Document.content),
+        Document.chunks_count,
+    ).where(
+        Document.user_id == user_id,
+        Document.canonical_url == canonical_url,
+    )
+    existing = (await db.execute(stmt)).one_or_none()
+    if existing:
+        get_metrics().incr("url_import_reused")
+        document_id, existing_title, existing_status, text_length, chunks_count = existing
+        return APIResponse(
+            success=True,
+            data=URLImportResponse(
+                document_id=document_id,
+                title=existing_title,
+                url=str(data.url),
+                status=existing_status.value,
+                text_length=text_length or 0,
+                chunks_created=chunks_count or 0,
+            )
         )
-        url_service = URLService()
-        success, title, content, error = await url_service.fetch_and_extract(str(data.url))
     
-    if not success:
+    # RSSHub (for supported sites) and direct scraping run concurrently
+    page = await URLImportService().fetch(str(data.url))
+    title, content = page.title, page.content
+    
+    if not page.success:
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail=error or "Failed to extract URL content"
+            detail=page.error or "Failed to extract URL content"
         )
     
-    # Create URL source
-    source = Source(
-        user_id=user_id,
-        type=SourceType.URL,
-        name=data.custom_title or title or str(data.url),
-        url=str(data.url),
-    )
-    db.add(source)
-    await db.commit()
-    await db.refresh(source)
+    # Keep the fetched page so it can be re-extracted without refetching
+    raw_fetch_id = await RawArchive(db).store(page.html) if page.html else None
+    
+    # Ad-hoc imports share one source per user
+    source = await orchestrator.get_url_bucket(user_id)
     
     # Create document
-    orchestrator = IngestionOrchestrator(db)
     document, is_new, doc_error = await orchestrator.create_document(
         source_id=source.id,
+        user_id=user_id,
         title=data.custom_title or title or str(data.url),
         content=content,
         url=str(data.url),
+        raw_fetch_id=raw_fetch_id,
     )
     
     if not document:
@@ -379,8 +492,9 @@ async def import_url(
             detail=doc_error or "Failed to create document"
         )
     
-    # Process in background
-    background_tasks.add_task(process_document_task, document.id)
+    # Process in background (duplicates are already processed)
+    if is_new:
+        background_tasks.add_task(process_document_task, document.id)
     
     return APIResponse(
         success=True,
@@ -395,6 +509,128 @@ async def import_url(
     )
 
 
+def _to_job_response(job: ImportJob) -> ImportJobResponse:
+    """Convert an import job row to its API response."""
+    return ImportJobResponse(
+        id=job.id,
+        source_id=job.source_id,
+        status=job.status.value,
+        total=job.total,
+        processed=job.processed,
+        succeeded=job.succeeded,
+        duplicates=job.duplicates,
+        failed=job.failed,
+        failures=job.failures,
+        error=job.error,
+        created_at=job.created_at,
+        finished_at=job.finished_at,
+    )
+
+
+@router.post("/url/batch", response_model=APIResponse[ImportJobResponse])
+async def import_url_batch(
+    data: BatchURLImportRequest,
+    background_tasks: BackgroundTasks,
+    user_id: UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Import many URLs as a background job.
+    Returns the job immediately; poll GET /import/jobs/{job_id} for progress.
+    """
+    if len(data.urls) > settings.import_batch_max_urls:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.import_batch_max_urls} URLs per batch"
+        )
+    
+    # Deduplicate on canonical form, keeping the first spelling submitted;
+    # the submitted URL is what gets fetched
+    submitted: dict[str, str] = {}
+    for url in data.urls:
+        try:
+            canonical_url = canonicalize_url(str(url))
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid URL {url}: {e}"
+            )
+        submitted.setdefault(canonical_url, str(url))
+    total = len(submitted)
+    
+    # URLs already in the library count as duplicates without being fetched
+    result = await db.execute(
+        select(Document.canonical_url).where(
+            Document.user_id == user_id,
+            Document.canonical_url.in_(list(submitted)),
+        )
+    )
+    existing = set(result.scalars().all())
+    urls = [url for canonical, url in submitted.items() if canonical not in existing]
+    
+    # A named batch gets its own source; otherwise use the user's URL bucket
+    if data.source_name:
+        source = Source(
+            user_id=user_id,
+            type=SourceType.URL,
+            name=data.source_name,
+        )
+        db.add(source)
+        await db.flush()
+    else:
+        source = await IngestionOrchestrator(db).get_url_bucket(user_id)
+    
+    job = ImportJob(
+        user_id=user_id,
+        source_id=source.id,
+        status=ImportJobStatus.PENDING,
+        total=total,
+        processed=len(existing),
+        succeeded=0,
+        duplicates=len(existing),
+        failed=0,
+        failures=[],
+    )
+    db.add(job)
+    await db.commit()
+    await db.refresh(job)
+    
+    background_tasks.add_task(run_import_job, job.id, urls)
+    
+    return APIResponse(
+        success=True,
+        data=_to_job_response(job)
+    )
+
+
+@router.get("/jobs/{job_id}", response_model=APIResponse[ImportJobResponse])
+async def get_import_job(
+    job_id: UUID,
+    user_id: UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Get batch import job progress.
+    """
+    stmt = select(ImportJob).where(
+        ImportJob.id == job_id,
+        ImportJob.user_id == user_id
+    )
+    result = await db.execute(stmt)
+    job = result.scalar_one_or_none()
+    
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Import job not found"
+        )
+    
+    return APIResponse(
+        success=True,
+        data=_to_job_response(job)
+    )
+
+
 async def process_document_task(document_id: UUID):
     """Background task to process document (chunk + embed)."""
     from app.db.session import async_session_maker
@@ -410,8 +646,7 @@ async def process_document_task(document_id: UUID):
             logger.error("document_processing_error", document_id=str(document_id), error=str(e))
 
 
-# Need to import datetime and logger
-from datetime import datetime
+# Need to import logger
 import structlog
 
 logger = structlog.get_logger()
@@ -87,6 +87,52 @@ class Settings(BaseSettings):
         default="backend/data/uploads", description="Directory for uploaded files"
     )
     max_upload_mb: int = Field(default=50, description="Maximum file upload size in MB")
+    storage_backend: Literal["local", "s3"] = Field(
+        default="local", description="Where uploaded files are stored (local disk or S3)"
+    )
+    s3_bucket: str = Field(default="ankiflow-uploads", description="S3 bucket for uploads")
+    s3_endpoint_url: str = Field(
+        default="", description="S3 endpoint URL (empty for AWS; e.g. http://localhost:9000 for MinIO)"
+    )
+    s3_region: str = Field(default="", description="S3 region")
+    s3_access_key_id: str = Field(default="", description="S3 access key ID")
+    s3_secret_access_key: str = Field(default="", description="S3 secret access key")
+    storage_presign_expiry_seconds: int = Field(
+        default=3600, description="Lifetime of presigned download URLs in seconds"
+    )
+    pdf_extract_workers: int = Field(
+        default=0, description="Worker processes for PDF text extraction (0 = one per CPU)"
+    )
+    pdf_pages_per_task: int = Field(
+        default=16, description="PDF pages extracted per worker task"
+    )
+    url_max_download_mb: int = Field(
+        default=10, description="Maximum web page size fetched for URL import in MB"
+    )
+    import_batch_max_urls: int = Field(
+        default=1000, description="Maximum URLs accepted by one batch import"
+    )
+    import_max_concurrency: int = Field(
+        default=10, description="Maximum concurrent page fetches per batch import"
+    )
+    import_per_host_concurrency: int = Field(
+        default=2, description="Maximum concurrent page fetches per host in a batch import"
+    )
+    import_ingest_batch_size: int = Field(
+        default=20, description="Fetched pages ingested per bulk document insert"
+    )
+    import_job_heartbeat_seconds: float = Field(
+        default=30.0, description="How often a running import job records that it is alive"
+    )
+    import_job_stale_seconds: int = Field(
+        default=300, description="Silence after which an unfinished import job is marked failed"
+    )
+    raw_archive_dir: str = Field(
+        default="backend/data/raw", description="Directory for archived page bodies"
+    )
+    raw_archive_zstd_level: int = Field(
+        default=10, description="zstd compression level for archived page bodies"
+    )
 
     # Document Chunking
     chunk_size: int = Field(
@@ -99,6 +145,117 @@ class Settings(BaseSettings):
     # Search API
     serper_api_key: str = Field(default="", description="Serper API key for web search")
 
+    # Chat answer cache
+    chat_cache_enabled: bool = Field(
+        default=False, description="Replay cached answers for near-identical questions"
+    )
+    chat_cache_similarity_threshold: float = Field(
+        default=0.97, description="Minimum query embedding cosine similarity for a hit"
+    )
+    chat_cache_ttl_seconds: float = Field(
+        default=3600.0, description="Lifetime of a cached answer in seconds"
+    )
+    chat_cache_max_entries: int = Field(
+        default=1000, description="Maximum number of cached answers"
+    )
+    chat_disconnect_poll_interval: float = Field(
+        default=0.5, description="Seconds between client disconnect checks while streaming"
+    )
+
+    # Outbound HTTP
+    http_timeout: float = Field(
+        default=30.0, description="Default outbound HTTP timeout in seconds"
+    )
+    http_max_connections: int = Field(
+        default=100, description="Maximum pooled outbound HTTP connections"
+    )
+    http_max_keepalive_connections: int = Field(
+        default=20, description="Maximum idle keep-alive HTTP connections"
+    )
+
+    # Feed polling scheduler
+    feed_scheduler_enabled: bool = Field(
+        default=True, description="Poll active RSS sources in the background"
+    )
+    feed_scheduler_tick_seconds: float = Field(
+        default=30.0, description="Seconds between scans for due feeds"
+    )
+    feed_scheduler_batch_size: int = Field(
+        default=100, description="Maximum feeds in flight per worker"
+    )
+    feed_claim_lease_seconds: int = Field(
+        default=600, description="How long a claimed feed is reserved for its poll"
+    )
+    feed_default_interval_seconds: int = Field(
+        default=3600, description="Polling interval for feeds without history"
+    )
+    feed_min_interval_seconds: int = Field(
+        default=300, description="Shortest allowed polling interval"
+    )
+    feed_max_interval_seconds: int = Field(
+        default=86400, description="Longest allowed polling interval"
+    )
+    feed_unchanged_backoff: float = Field(
+        default=1.5, description="Interval multiplier when a feed has nothing new"
+    )
+    feed_interval_jitter: float = Field(
+        default=0.1, description="Random +/- fraction applied to each interval"
+    )
+    feed_max_concurrency: int = Field(
+        default=20, description="Maximum concurrent feed fetches per worker"
+    )
+    feed_per_host_concurrency: int = Field(
+        default=2, description="Maximum concurrent feed fetches per host"
+    )
+
+    # Full-text crawler (sources with fetch_full_text)
+    crawler_max_concurrency: int = Field(
+        default=10, description="Maximum concurrent article fetches per worker"
+    )
+    crawler_per_host_concurrency: int = Field(
+        default=2, description="Maximum concurrent article fetches per host"
+    )
+    crawler_politeness_delay: float = Field(
+        default=1.0, description="Minimum seconds between requests to one host"
+    )
+    crawler_max_retries: int = Field(
+        default=2, description="Retries for timeouts, 429 and 5xx responses"
+    )
+    crawler_retry_backoff: float = Field(
+        default=2.0, description="Base retry delay in seconds (doubles per attempt)"
+    )
+
+    # Feed parsing
+    rss_stream_parse_min_bytes: int = Field(
+        default=2 * 1024 * 1024,
+        description="Feed size above which entries are parsed incrementally",
+    )
+
+    # Seen-entry index
+    seen_entry_filter_min_capacity: int = Field(
+        default=1024, description="Minimum Bloom filter capacity per source"
+    )
+    seen_entry_filter_cache_size: int = Field(
+        default=5000, description="Maximum per-source Bloom filters kept in memory"
+    )
+
+    # Feed boilerplate stripping
+    boilerplate_enabled: bool = Field(
+        default=True, description="Strip lines repeated across a source's entries"
+    )
+    boilerplate_decay: float = Field(
+        default=0.9, description="Per-entry decay of line counts (0.9 ~ last 10 entries)"
+    )
+    boilerplate_min_occurrences: float = Field(
+        default=3.0, description="Decayed count at which a line is boilerplate"
+    )
+    boilerplate_min_entries: int = Field(
+        default=5, description="Entries a source must have before lines are stripped"
+    )
+    boilerplate_max_fingerprints: int = Field(
+        default=5000, description="Line fingerprints kept per source"
+    )
+
     # RSSHub
     rsshub_enabled: bool = Field(
         default=True, description="Enable RSSHub for URL to RSS conversion"
@@ -106,9 +263,35 @@ class Settings(BaseSettings):
     rsshub_base_url: str = Field(
         default="https://rsshub.app", description="RSSHub instance base URL"
     )
+    rsshub_instances: list[str] = Field(
+        default=[], description="RSSHub mirror base URLs (empty: rsshub_base_url only)"
+    )
     rsshub_timeout: float = Field(
         default=10.0, description="RSSHub request timeout in seconds"
     )
+    rsshub_hedge_delay: float = Field(
+        default=1.0,
+        description="Seconds before hedging to a second instance until p95 is known",
+    )
+    rsshub_failure_threshold: int = Field(
+        default=3, description="Consecutive failures before an instance is benched"
+    )
+    rsshub_unhealthy_cooldown_seconds: float = Field(
+        default=60.0, description="How long a failing instance is skipped"
+    )
+    rsshub_cache_ttl_seconds: float = Field(
+        default=300.0, description="Lifetime of a cached RSSHub feed in seconds"
+    )
+    rsshub_cache_max_entries: int = Field(
+        default=256, description="Maximum number of cached RSSHub feeds"
+    )
+    url_import_rsshub_grace_seconds: float = Field(
+        default=1.0,
+        description="How long a finished scrape waits for RSSHub during URL import",
+    )
+    rsshub_routes_file: str = Field(
+        default="", description="TOML route table path (empty: bundled routes)"
+    )
 
     # Logging
     log_level: str = Field(default="INFO", description="Logging level")
@@ -0,0 +1,56 @@
+"""
+In-process counters for operational metrics.
+"""
+from collections import defaultdict
+from functools import lru_cache
+from threading import Lock
+
+
+class MetricsRegistry:
+    """Thread-safe registry of labelled counters."""
+
+    def __init__(self):
+        self._counters: dict[str, dict[tuple, float]] = defaultdict(dict)
+        self._lock = Lock()
+
+    def incr(self, name: str, value: float = 1, **labels: str) -> None:
+        """
+        Increment a counter.
+
+        Args:
+            name: Counter name (e.g. "chat_stream_cancelled")
+            value: Amount to add
+            **labels: Label values distinguishing series of the same counter
+        """
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._counters[name]
+            series[key] = series.get(key, 0) + value
+
+    def get(self, name: str, **labels: str) -> float:
+        """Get the current value of a counter series."""
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            return self._counters.get(name, {}).get(key, 0)
+
+    def snapshot(self) -> dict[str, list[dict]]:
+        """
+        Get all counters.
+
+        Returns:
+            Mapping of counter name to a list of {"labels": ..., "value": ...}
+        """
+        with self._lock:
+            return {
+                name: [
+                    {"labels": dict(key), "value": value}
+                    for key, value in series.items()
+                ]
+                for name, series in self._counters.items()
+            }
+
+
+@lru_cache
+def get_metrics() -> MetricsRegistry:
+    """Get the process-wide metrics registry."""
+    return MetricsRegistry()
@@ -0,0 +1,66 @@
+"""
+Request body size limit for file uploads.
+
+Multipart bodies are received and spooled before an endpoint runs, so the
+limit is enforced on the raw ASGI stream: a declared Content-Length over the
+limit is refused before any of the body is read, and bodies without one
+(chunked) are cut off as soon as they pass it.
+"""
+from fastapi import status
+from fastapi.responses import JSONResponse
+
+from app.schemas.response import APIResponse
+
+
+class UploadSizeLimitMiddleware:
+    """Refuses oversized request bodies on upload routes with 413."""
+
+    def __init__(self, app, max_bytes: int, paths: tuple[str, ...]):
+        self.app = app
+        self.max_bytes = max_bytes
+        self.paths = paths
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        content_length = dict(scope["headers"]).get(b"content-length")
+        if content_length is not None and content_length.isdigit():
+            if int(content_length) > self.max_bytes:
+                await self._reject(scope, receive, send)
+                return
+
+        received = 0
+        responded = False
+
+        async def limited_receive():
+            nonlocal received, responded
+            message = await receive()
+            if message["type"] == "http.request" and not responded:
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    # Answer now and make the app see a disconnect, so it
+                    # stops reading; whatever it sends afterwards is dropped
+                    responded = True
+                    await self._reject(scope, receive, send)
+                    return {"type": "http.disconnect"}
+            return message
+
+        async def guarded_send(message):
+            if not responded:
+                await send(message)
+
+        await self.app(scope, limited_receive, guarded_send)
+
+    async def _reject(self, scope, receive, send) -> None:
+        response = JSONResponse(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            content=APIResponse.fail(
+                code="PAYLOAD_TOO_LARGE",
+                message=f"Request body exceeds limit ({self.max_bytes} bytes)",
+            ).model_dump(mode="json"),
+            # The unread body is abandoned
+            headers={"Connection": "close"},
+        )
+        await response(scope, receive, send)
@@ -3,6 +3,7 @@ AnkiFlow - Intelligent Reading Workbench API
 
 Main FastAPI application entry point.
 """
+import asyncio
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
@@ -12,7 +13,12 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.api.router import api_router
 from app.core.config import get_settings
 from app.core.exceptions import setup_exception_handlers
+from app.core.http import close_http_client
 from app.core.logging import configure_logging, get_logger
+from app.core.upload_limit import UploadSizeLimitMiddleware
+from app.services.feed_scheduler import FeedScheduler
+from app.services.import_job_service import sweep_stale_jobs
+from app.services.pdf_service import shutdown_pdf_executor
 
 settings = get_settings()
 
@@ -20,6 +26,9 @@ settings = get_settings()
 configure_logging(level=settings.log_level, log_format=settings.log_format)
 logger = get_logger(__name__)
 
+# Multipart framing and form fields allowed on top of max_upload_mb
+UPLOAD_FORM_OVERHEAD_BYTES = 64 * 1024
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator:
@@ -29,8 +38,18 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
         version=settings.app_version,
         environment=settings.environment,
     )
+    feed_scheduler = FeedScheduler()
+    if settings.feed_scheduler_enabled:
+        feed_scheduler.start()
+    # Import jobs orphaned by a dead worker are failed instead of hanging
+    job_sweeper = asyncio.create_task(sweep_stale_jobs())
     yield
     logger.info("Shutting down AnkiFlow API")
+    job_sweeper.cancel()
+    await asyncio.gather(job_sweeper, return_exceptions=True)
+    await feed_scheduler.stop()
+    shutdown_pdf_executor()
+    await close_http_client()
 
 
 def create_app() -> FastAPI:
@@ -54,6 +73,14 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
+    # Oversized uploads are refused before the body is spooled
+    app.add_middleware(
+        UploadSizeLimitMiddleware,
+        # Headroom for the multipart boundaries and form fields
+        max_bytes=settings.max_upload_mb * 1024 * 1024 + UPLOAD_FORM_OVERHEAD_BYTES,
+        paths=(f"{settings.api_prefix}/import/pdf",),
+    )
+
     # Exception handlers
     setup_exception_handlers(app)
 
@@ -5,6 +5,9 @@ Core tables:
 - users: User accounts
 - sources: RSS/URL/PDF sources
 - documents: Individual articles/documents
+- feed_seen_entries: Feed entries already processed per source
+- raw_fetches: Compressed archive of fetched page bodies
+- import_jobs: Batch URL import progress
 - document_chunks: Text chunks for embedding
 - embeddings: Vector embeddings (pgvector)
 - tags: Document tags
@@ -21,18 +24,21 @@ from uuid import uuid4
 
 from pgvector.sqlalchemy import Vector
 from sqlalchemy import (
+    BigInteger,
     Boolean,
     DateTime,
     Enum,
     Float,
     ForeignKey,
+    ForeignKeyConstraint,
     Index,
     Integer,
     String,
     Text,
     UniqueConstraint,
+    text,
 )
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.config import get_settings
@@ -57,6 +63,13 @@ class DocumentStatus(str, enum.Enum):
     FAILED = "failed"
 
 
+class ImportJobStatus(str, enum.Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
 class User(Base):
     """User account model."""
 
@@ -100,9 +113,32 @@ class Source(Base):
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     url: Mapped[Optional[str]] = mapped_column(String(2048), nullable=True)
     file_path: Mapped[Optional[str]] = mapped_column(String(512), nullable=True)
+    # SHA-256 of the uploaded file; re-uploads reuse the source's document
+    file_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
     icon_url: Mapped[Optional[str]] = mapped_column(String(512), nullable=True)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
+    # Per-user catch-all source for ad-hoc URL imports (one per user and type)
+    is_bucket: Mapped[bool] = mapped_column(
+        Boolean, default=False, server_default="false", nullable=False
+    )
+    # Crawl each entry's link instead of ingesting the feed's summary
+    fetch_full_text: Mapped[bool] = mapped_column(
+        Boolean, default=False, server_default="false", nullable=False
+    )
     last_fetched_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    # HTTP validators from the last feed response (conditional GET)
+    etag: Mapped[Optional[str]] = mapped_column(String(512), nullable=True)
+    last_modified: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    # Polling schedule (maintained by the feed scheduler)
+    fetch_interval_seconds: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    next_fetch_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    consecutive_failures: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+    # Rows in feed_seen_entries (validates cached seen-entry filters)
+    seen_entry_count: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow, nullable=False
     )
@@ -113,7 +149,31 @@ class Source(Base):
     # Relationships
     user: Mapped["User"] = relationship("User", back_populates="sources")
     documents: Mapped[list["Document"]] = relationship(
-        "Document", back_populates="source"
+        "Document",
+        back_populates="source",
+        primaryjoin="Source.id == Document.source_id",
+        foreign_keys="Document.source_id",
+    )
+
+    __table_args__ = (
+        # Target of documents' (source_id, user_id) owner foreign key
+        UniqueConstraint("id", "user_id", name="uq_sources_id_user_id"),
+        Index("ix_sources_next_fetch_at", "next_fetch_at"),
+        # One source per uploaded file content and user
+        Index(
+            "uq_sources_user_file_hash",
+            "user_id",
+            "file_hash",
+            unique=True,
+            postgresql_where=text("file_hash IS NOT NULL"),
+        ),
+        Index(
+            "uq_sources_user_bucket",
+            "user_id",
+            "type",
+            unique=True,
+            postgresql_where=text("is_bucket"),
+        ),
     )
 
 
@@ -128,19 +188,43 @@ class Document(Base):
     source_id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("sources.id", ondelete="CASCADE"), nullable=False
     )
+    # Denormalised owner, always equal to source.user_id (enforced by FK)
+    user_id: Mapped[UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
     title: Mapped[str] = mapped_column(String(512), nullable=False)
     url: Mapped[Optional[str]] = mapped_column(String(2048), nullable=True)
+    # canonicalize_url(url); unique per user so an article is stored once
+    canonical_url: Mapped[Optional[str]] = mapped_column(String(2048), nullable=True)
     author: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     summary: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
-    content: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    # Bodies can be megabytes; load explicitly with undefer(Document.content)
+    content: Mapped[Optional[str]] = mapped_column(Text, nullable=True, deferred=True)
+    # Sanitised HTML rendering of feed content, for display (content is its text)
+    content_html: Mapped[Optional[str]] = mapped_column(Text, nullable=True, deferred=True)
     content_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
     published_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     status: Mapped[DocumentStatus] = mapped_column(
         Enum(DocumentStatus), default=DocumentStatus.PENDING, nullable=False
     )
+    # Why the last ingestion attempt failed (status FAILED)
+    processing_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     is_read: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     is_starred: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     read_position: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    chunks_count: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+    # PDFs: character offset in content where each page starts
+    page_offsets: Mapped[Optional[list[int]]] = mapped_column(
+        JSONB, nullable=True, deferred=True
+    )
+    # Archived page the content was extracted from (URL imports, crawled entries)
+    raw_fetch_id: Mapped[Optional[UUID]] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("raw_fetches.id", ondelete="SET NULL"),
+        nullable=True,
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow, nullable=False
     )
@@ -149,7 +233,12 @@ class Document(Base):
     )
 
     # Relationships
-    source: Mapped["Source"] = relationship("Source", back_populates="documents")
+    source: Mapped["Source"] = relationship(
+        "Source",
+        back_populates="documents",
+        primaryjoin="Document.source_id == Source.id",
+        foreign_keys=[source_id],
+    )
     chunks: Mapped[list["DocumentChunk"]] = relationship(
         "DocumentChunk", back_populates="document"
     )
@@ -166,6 +255,141 @@ class Document(Base):
         Index("ix_documents_source_id", "source_id"),
         Index("ix_documents_status", "status"),
         Index("ix_documents_published_at", "published_at"),
+        Index("ix_documents_user_created_at", "user_id", "created_at", "id"),
+        Index("ix_documents_user_is_read", "user_id", "is_read"),
+        Index("ix_documents_user_is_starred", "user_id", "is_starred"),
+        Index(
+            "uq_documents_user_canonical_url",
+            "user_id",
+            "canonical_url",
+            unique=True,
+            postgresql_where=text("canonical_url IS NOT NULL"),
+        ),
+        Index(
+            "ix_documents_raw_fetch_id",
+            "raw_fetch_id",
+            postgresql_where=text("raw_fetch_id IS NOT NULL"),
+        ),
+        ForeignKeyConstraint(
+            ["source_id", "user_id"],
+            ["sources.id", "sources.user_id"],
+            name="fk_documents_source_owner",
+            ondelete="CASCADE",
+            onupdate="CASCADE",
+        ),
+    )
+
+
+class FeedSeenEntry(Base):
+    """Feed entry already processed for a source (GUID/link + updated time)."""
+
+    __tablename__ = "feed_seen_entries"
+
+    id: Mapped[UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid4
+    )
+    source_id: Mapped[UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("sources.id", ondelete="CASCADE"), nullable=False
+    )
+    entry_key: Mapped[str] = mapped_column(String(2048), nullable=False)
+    entry_updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    document_id: Mapped[Optional[UUID]] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("documents.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+    )
+
+    __table_args__ = (
+        UniqueConstraint("source_id", "entry_key", name="uq_feed_seen_entry"),
+    )
+
+
+class SourceBoilerplate(Base):
+    """Learned repeated lines (headers, footers, pitches) of a feed source."""
+
+    __tablename__ = "source_boilerplate"
+
+    source_id: Mapped[UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("sources.id", ondelete="CASCADE"), primary_key=True
+    )
+    # Line fingerprint -> decayed count of recent entries containing the line
+    fingerprints: Mapped[dict] = mapped_column(
+        JSONB, default=dict, server_default="{}", nullable=False
+    )
+    entries_seen: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+    documents_stripped: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+    lines_removed: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+    tokens_removed: Mapped[int] = mapped_column(
+        BigInteger, default=0, server_default="0", nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+    )
+
+
+class RawFetch(Base):
+    """Fetched page body, stored zstd-compressed and addressed by SHA-256."""
+
+    __tablename__ = "raw_fetches"
+
+    id: Mapped[UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid4
+    )
+    sha256: Mapped[str] = mapped_column(String(64), unique=True, nullable=False)
+    size_bytes: Mapped[int] = mapped_column(Integer, nullable=False)
+    stored_bytes: Mapped[int] = mapped_column(Integer, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False
+    )
+
+
+class ImportJob(Base):
+    """Batch URL import job and its progress counters."""
+
+    __tablename__ = "import_jobs"
+
+    id: Mapped[UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid4
+    )
+    user_id: Mapped[UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    source_id: Mapped[UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("sources.id", ondelete="CASCADE"), nullable=False
+    )
+    status: Mapped[ImportJobStatus] = mapped_column(
+        Enum(ImportJobStatus), default=ImportJobStatus.PENDING, nullable=False
+    )
+    total: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    processed: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    succeeded: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    duplicates: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    failed: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    # [{"url": ..., "error": ...}] for URLs that could not be imported
+    failures: Mapped[list] = mapped_column(JSONB, default=list, nullable=False)
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+    )
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("ix_import_jobs_user_id", "user_id"),
     )
 
 
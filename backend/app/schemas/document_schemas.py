@@ -36,7 +36,9 @@ class DocumentDetailResponse(BaseModel):
     author: Optional[str]
     summary: Optional[str]
     content: Optional[str]
+    content_html: Optional[str] = None
     status: str
+    processing_error: Optional[str] = None
     is_read: bool
     is_starred: bool
     read_position: Optional[float]
@@ -58,10 +60,11 @@ class DocumentListResponse(BaseModel):
     """Schema for paginated document list."""
     
     items: list[DocumentListItem]
-    total: int
+    total: Optional[int] = Field(None, description="Exact total, only when requested")
     page: int
     page_size: int
     has_more: bool
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page")
 
 
 class DocumentUpdateRequest(BaseModel):
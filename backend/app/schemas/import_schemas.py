@@ -19,6 +19,10 @@ class RSSSourceCreate(BaseModel):
         default=True,
         description="Whether to fetch articles immediately after creation"
     )
+    fetch_full_text: bool = Field(
+        default=False,
+        description="Crawl each entry's link for the full article text"
+    )
 
 
 class RSSSourceResponse(BaseModel):
@@ -29,6 +33,7 @@ class RSSSourceResponse(BaseModel):
     name: str
     url: str
     is_active: bool
+    fetch_full_text: bool
     last_fetched_at: Optional[datetime]
     created_at: datetime
     
@@ -46,6 +51,18 @@ class RSSFetchResponse(BaseModel):
     error: Optional[str]
 
 
+class BoilerplateStatsResponse(BaseModel):
+    """Response schema for a source's boilerplate stripping stats."""
+    
+    source_id: UUID
+    entries_seen: int
+    boilerplate_lines: int  # learned lines currently being stripped
+    documents_stripped: int
+    lines_removed: int
+    tokens_removed: int
+    updated_at: Optional[datetime]
+
+
 # PDF Schemas
 
 class PDFUploadResponse(BaseModel):
@@ -83,6 +100,41 @@ class URLImportResponse(BaseModel):
     chunks_created: int
 
 
+class BatchURLImportRequest(BaseModel):
+    """Request schema for batch URL import."""
+    
+    urls: list[HttpUrl] = Field(..., min_length=1, description="URLs to import")
+    source_name: Optional[str] = Field(
+        None,
+        max_length=255,
+        description="Name of the source grouping the imported documents"
+    )
+
+
+class ImportJobFailure(BaseModel):
+    """A URL that could not be imported."""
+    
+    url: str
+    error: str
+
+
+class ImportJobResponse(BaseModel):
+    """Response schema for batch import job progress."""
+    
+    id: UUID
+    source_id: UUID
+    status: str  # pending, running, completed, failed
+    total: int
+    processed: int
+    succeeded: int
+    duplicates: int
+    failed: int
+    failures: list[ImportJobFailure]
+    error: Optional[str]
+    created_at: datetime
+    finished_at: Optional[datetime]
+
+
 # Document Status
 
 class DocumentStatusResponse(BaseModel):
@@ -0,0 +1,181 @@
+"""
+Semantic answer cache for repeated chat questions.
+
+Cached answers are bucketed by the asking user's scope and the fingerprint
+of the retrieved citation set, then matched on query embedding similarity.
+
+The cache lives in each process, so with several API workers every worker
+warms its own copy and hit rates scale down with the worker count.
+"""
+import hashlib
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+from uuid import UUID
+
+from app.core.config import get_settings
+from app.schemas.chat_schemas import Citation
+
+settings = get_settings()
+
+
+@dataclass
+class CachedAnswer:
+    """A completed answer and the query vector it was generated for."""
+
+    query_vector: list[float]
+    text_chunks: list[str]
+    created_at: float
+
+
+def citation_fingerprint(citations: list[Citation]) -> str:
+    """
+    Fingerprint a retrieved citation set.
+
+    Local chunks are immutable per chunk ID, web results are identified by
+    URL and snippet, so the fingerprint changes whenever the context would.
+
+    Args:
+        citations: Retrieved citations in ranked order
+
+    Returns:
+        Hexadecimal SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    for citation in citations:
+        digest.update(citation.id.encode("utf-8"))
+        digest.update(b"\x00")
+        digest.update((citation.url or "").encode("utf-8"))
+        digest.update(b"\x00")
+        digest.update(citation.snippet.encode("utf-8"))
+        digest.update(b"\x01")
+    return digest.hexdigest()
+
+
+def _normalize(vector: list[float]) -> list[float]:
+    """Scale a vector to unit length."""
+    norm = math.sqrt(sum(v * v for v in vector))
+    if norm == 0:
+        return vector
+    return [v / norm for v in vector]
+
+
+class AnswerCache:
+    """In-process LRU cache of chat answers keyed by query embedding."""
+
+    def __init__(
+        self,
+        similarity_threshold: float,
+        ttl_seconds: float,
+        max_entries: int,
+    ):
+        self.similarity_threshold = similarity_threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._buckets: OrderedDict[
+            tuple[Optional[UUID], str], list[CachedAnswer]
+        ] = OrderedDict()
+        self._size = 0
+
+    def invalidate(self, user_id: Optional[UUID] = None) -> None:
+        """
+        Drop cached answers that may cite a user's documents.
+
+        Answers to unscoped questions (user_id None) search every user's
+        documents, so they are dropped on any change.
+
+        Args:
+            user_id: User whose documents changed; None drops every answer
+        """
+        if user_id is None:
+            self._buckets.clear()
+            self._size = 0
+            return
+
+        for key in [key for key in self._buckets if key[0] in (user_id, None)]:
+            self._size -= len(self._buckets.pop(key))
+
+    def lookup(
+        self,
+        query_vector: list[float],
+        citations: list[Citation],
+        user_id: Optional[UUID] = None,
+    ) -> Optional[list[str]]:
+        """
+        Find a cached answer for a similar query over the same context.
+
+        Args:
+            query_vector: Embedding of the incoming question
+            citations: Citations retrieved for the incoming question
+            user_id: User the question was scoped to
+
+        Returns:
+            Cached text chunks in stream order, or None on a miss
+        """
+        key = (user_id, citation_fingerprint(citations))
+        entries = self._buckets.get(key)
+        if not entries:
+            return None
+
+        now = time.monotonic()
+        live = [e for e in entries if now - e.created_at < self.ttl_seconds]
+        self._size -= len(entries) - len(live)
+        if not live:
+            del self._buckets[key]
+            return None
+        self._buckets[key] = live
+        self._buckets.move_to_end(key)
+
+        query_unit = _normalize(query_vector)
+        best: Optional[CachedAnswer] = None
+        best_score = self.similarity_threshold
+        for entry in live:
+            score = sum(a * b for a, b in zip(query_unit, entry.query_vector))
+            if score >= best_score:
+                best, best_score = entry, score
+
+        return best.text_chunks if best else None
+
+    def store(
+        self,
+        query_vector: list[float],
+        citations: list[Citation],
+        text_chunks: list[str],
+        user_id: Optional[UUID] = None,
+    ) -> None:
+        """
+        Cache a completed answer.
+
+        Args:
+            query_vector: Embedding of the question
+            citations: Citations the answer was generated from
+            text_chunks: Streamed text deltas in order
+            user_id: User the question was scoped to
+        """
+        key = (user_id, citation_fingerprint(citations))
+        entry = CachedAnswer(
+            query_vector=_normalize(query_vector),
+            text_chunks=list(text_chunks),
+            created_at=time.monotonic(),
+        )
+        self._buckets.setdefault(key, []).append(entry)
+        self._buckets.move_to_end(key)
+        self._size += 1
+
+        # Evict least recently used buckets
+        while self._size > self.max_entries and self._buckets:
+            _, evicted = self._buckets.popitem(last=False)
+            self._size -= len(evicted)
+
+
+@lru_cache
+def get_answer_cache() -> AnswerCache:
+    """Get the process-wide answer cache instance."""
+    return AnswerCache(
+        similarity_threshold=settings.chat_cache_similarity_threshold,
+        ttl_seconds=settings.chat_cache_ttl_seconds,
+        max_entries=settings.chat_cache_max_entries,
+    )
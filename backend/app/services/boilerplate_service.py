@@ -0,0 +1,216 @@
+"""
+Per-source boilerplate stripping for feed entries.
+
+Newsletter-style feeds repeat headers, footers, subscription pitches and
+legal text in every entry. Each source keeps decayed counts of line
+fingerprints over its recent entries; lines present in enough of them are
+removed before chunking, so they are neither embedded nor searched.
+"""
+import hashlib
+import re
+from typing import Callable, Optional
+from uuid import UUID
+
+import structlog
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.metrics import get_metrics
+from app.models.models import SourceBoilerplate
+
+settings = get_settings()
+logger = structlog.get_logger()
+
+# Decayed counts below this are forgotten (about 30 entries at decay 0.9)
+MIN_KEPT_COUNT = 0.05
+
+DIGITS = re.compile(r"\d+")
+EXTRA_BLANK_LINES = re.compile(r"\n{3,}")
+
+
+def line_fingerprint(line: str) -> Optional[str]:
+    """
+    Fingerprint a line so trivially different repeats match.
+
+    Case, spacing and numbers (dates, issue numbers, counts) are ignored.
+
+    Returns:
+        Short hex digest, or None for blank lines
+    """
+    normalized = DIGITS.sub("0", " ".join(line.lower().split()))
+    if not normalized:
+        return None
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=8).hexdigest()
+
+
+class BoilerplateModel:
+    """
+    Decayed line-fingerprint counts for one source, plus stripping stats
+    accumulated since it was last saved.
+    """
+
+    def __init__(
+        self,
+        fingerprints: dict[str, float],
+        entries_seen: int,
+        decay: float,
+        min_occurrences: float,
+        min_entries: int,
+        max_fingerprints: int,
+    ):
+        self.fingerprints = fingerprints
+        self.entries_seen = entries_seen
+        self.decay = decay
+        self.min_occurrences = min_occurrences
+        self.min_entries = min_entries
+        self.max_fingerprints = max_fingerprints
+        self.documents_stripped = 0
+        self.lines_removed = 0
+        self.tokens_removed = 0
+
+    def observe(self, content: str) -> None:
+        """Learn from one entry: decay every count, then count its distinct lines."""
+        self.fingerprints = {
+            fingerprint: count * self.decay
+            for fingerprint, count in self.fingerprints.items()
+            if count * self.decay >= MIN_KEPT_COUNT
+        }
+
+        for fingerprint in {line_fingerprint(line) for line in content.split("\n")}:
+            if fingerprint:
+                self.fingerprints[fingerprint] = self.fingerprints.get(fingerprint, 0.0) + 1.0
+        self.entries_seen += 1
+
+        if len(self.fingerprints) > self.max_fingerprints:
+            # Forget the rarest lines
+            kept = sorted(self.fingerprints.items(), key=lambda item: item[1], reverse=True)
+            self.fingerprints = dict(kept[: self.max_fingerprints])
+
+    def is_boilerplate(self, line: str) -> bool:
+        fingerprint = line_fingerprint(line)
+        return (
+            fingerprint is not None
+            and self.fingerprints.get(fingerprint, 0.0) >= self.min_occurrences
+        )
+
+    def strip(self, content: str) -> tuple[str, list[str]]:
+        """
+        Remove boilerplate lines from one entry.
+
+        Content that would be left empty is returned unchanged (the entry
+        is all template, e.g. a repeated announcement).
+
+        Returns:
+            Tuple of (stripped_content, removed_lines)
+        """
+        if self.entries_seen < self.min_entries:
+            return content, []
+
+        kept, removed = [], []
+        for line in content.split("\n"):
+            (removed if self.is_boilerplate(line) else kept).append(line)
+
+        stripped = EXTRA_BLANK_LINES.sub("\n\n", "\n".join(kept)).strip()
+        if not removed or not stripped:
+            return content, []
+        return stripped, removed
+
+    def strip_batch(self, contents: list[str], count_tokens: Callable[[str], int]) -> list[str]:
+        """
+        Learn from a batch of entries, then strip each of them.
+
+        Learning first lets a new source's first fetch already recognise
+        its repeated blocks.
+
+        Args:
+            contents: Entry texts
+            count_tokens: Tokenizer used to report tokens removed
+
+        Returns:
+            Stripped entry texts, in order
+        """
+        for content in contents:
+            if content:
+                self.observe(content)
+
+        results = []
+        for content in contents:
+            stripped, removed = self.strip(content) if content else (content, [])
+            if removed:
+                self.documents_stripped += 1
+                self.lines_removed += len(removed)
+                self.tokens_removed += count_tokens("\n".join(removed))
+            results.append(stripped)
+        return results
+
+
+class BoilerplateService:
+    """Loads and saves sources' boilerplate models."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.logger = logger.bind(service="boilerplate")
+
+    async def load(self, source_id: UUID) -> BoilerplateModel:
+        """
+        Get a source's boilerplate model (empty for a new source).
+
+        Args:
+            source_id: Feed source ID
+
+        Returns:
+            BoilerplateModel with zeroed stats counters
+        """
+        row = await self.db.get(SourceBoilerplate, source_id)
+        return BoilerplateModel(
+            fingerprints=dict(row.fingerprints) if row else {},
+            entries_seen=row.entries_seen if row else 0,
+            decay=settings.boilerplate_decay,
+            min_occurrences=settings.boilerplate_min_occurrences,
+            min_entries=settings.boilerplate_min_entries,
+            max_fingerprints=settings.boilerplate_max_fingerprints,
+        )
+
+    async def save(self, source_id: UUID, model: BoilerplateModel) -> None:
+        """
+        Persist a source's model and add its stats counters (flushed with
+        the caller's commit).
+
+        Args:
+            source_id: Feed source ID
+            model: Model returned by load and updated since
+        """
+        row = await self.db.get(SourceBoilerplate, source_id)
+        if row is None:
+            row = SourceBoilerplate(
+                source_id=source_id,
+                documents_stripped=0,
+                lines_removed=0,
+                tokens_removed=0,
+            )
+            self.db.add(row)
+
+        # Round so the JSONB column stays compact
+        row.fingerprints = {
+            fingerprint: round(count, 3)
+            for fingerprint, count in model.fingerprints.items()
+        }
+        row.entries_seen = model.entries_seen
+        row.documents_stripped += model.documents_stripped
+        row.lines_removed += model.lines_removed
+        row.tokens_removed += model.tokens_removed
+
+        if model.tokens_removed:
+            get_metrics().incr("boilerplate_tokens_removed", model.tokens_removed)
+            self.logger.info(
+                "boilerplate_stripped",
+                source_id=str(source_id),
+                documents=model.documents_stripped,
+                lines=model.lines_removed,
+                tokens=model.tokens_removed,
+            )
+
+        # Counters are deltas since the last save
+        model.documents_stripped = 0
+        model.lines_removed = 0
+        model.tokens_removed = 0
@@ -1,20 +1,28 @@
 """
 Chat service for AI-powered conversations with RAG.
 """
+import asyncio
+import contextlib
 import json
 import logging
-from typing import AsyncGenerator, Optional
+from typing import AsyncGenerator, Awaitable, Callable, Optional
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import get_settings
+from app.core.metrics import get_metrics
 from app.schemas.chat_schemas import Citation, StreamEvent
+from app.services.answer_cache import get_answer_cache
+from app.services.chunking_service import ChunkingService
 from app.services.search_service import SearchService
 
 settings = get_settings()
 logger = logging.getLogger(__name__)
 
+# Upper bound on generated tokens per answer
+MAX_COMPLETION_TOKENS = 1000
+
 
 class ChatService:
     """Service for AI chat with RAG context."""
@@ -29,6 +37,7 @@ class ChatService:
         scope: str = "global",
         include_web: bool = False,
         user_id: Optional[UUID] = None,
+        is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None,
     ) -> AsyncGenerator[str, None]:
         """
         Stream chat response with citations.
@@ -38,19 +47,36 @@ class ChatService:
             scope: Search scope (global/current_view/web)
             include_web: Include web search results
             user_id: User ID for context filtering
+            is_disconnected: Client disconnect probe (e.g. Request.is_disconnected);
+                on disconnect, retrieval is cancelled and the LLM stream closed
 
         Yields:
             Server-sent events as JSON strings
         """
+        disconnect_task = asyncio.create_task(
+            self._watch_disconnect(is_disconnected)
+        )
         try:
             # Step 1: Retrieve context via hybrid search
             logger.info(f"Retrieving context for message: {message[:50]}")
-            citations = await self.search_service.hybrid_search(
-                query=message,
-                top_k=5,
-                include_web=include_web or scope == "web",
-                user_id=user_id,
+            retrieval_task = asyncio.create_task(
+                self._retrieve(message, scope, include_web, user_id)
             )
+            if not await self._race_disconnect(retrieval_task, disconnect_task):
+                self._record_cancellation("retrieval", text_chunks=[])
+                return
+            query_vector, citations = retrieval_task.result()
+
+            # Replay a cached answer for a near-identical question
+            if query_vector is not None:
+                cached_chunks = get_answer_cache().lookup(
+                    query_vector, citations, user_id
+                )
+                if cached_chunks is not None:
+                    logger.info(f"Answer cache hit for message: {message[:50]}")
+                    for event in self._replay_events(cached_chunks, citations):
+                        yield event
+                    return
 
             # Step 2: Build RAG prompt
             context_text = self._build_context(citations)
@@ -67,7 +93,6 @@ class ChatService:
 
             # Import OpenAI client
             from openai import AsyncOpenAI
-            import asyncio
 
             client = AsyncOpenAI(api_key=settings.openai_api_key, base_url="http://127.0.0.1:8045/v1")
 
@@ -81,17 +106,37 @@ class ChatService:
                     ],
                     stream=True,
                     temperature=0.7,
-                    max_tokens=1000,
+                    max_tokens=MAX_COMPLETION_TOKENS,
                 )
 
-                # Yield text chunks
-                async for chunk in stream:
+                # Yield text chunks, racing each read against client disconnect
+                text_chunks = []
+                iterator = stream.__aiter__()
+                while True:
+                    next_chunk = asyncio.ensure_future(iterator.__anext__())
+                    if not await self._race_disconnect(next_chunk, disconnect_task):
+                        # Closing the HTTP stream stops upstream generation
+                        await stream.close()
+                        self._record_cancellation("generation", text_chunks)
+                        return
+                    try:
+                        chunk = next_chunk.result()
+                    except StopAsyncIteration:
+                        break
+
                     if chunk.choices[0].delta.content:
+                        text_chunks.append(chunk.choices[0].delta.content)
                         text_event = StreamEvent(
                             type="text", content=chunk.choices[0].delta.content
                         )
                         yield f"data: {text_event.model_dump_json()}\n\n"
 
+                # Only complete answers are cached
+                if query_vector is not None and text_chunks:
+                    get_answer_cache().store(
+                        query_vector, citations, text_chunks, user_id
+                    )
+
                 # Yield citations
                 for citation in citations:
                     citation_event = StreamEvent(type="citation", citation=citation)
@@ -116,6 +161,95 @@ class ChatService:
         except asyncio.CancelledError:
             logger.info("Chat request cancelled")
             raise
+        finally:
+            disconnect_task.cancel()
+
+    async def _retrieve(
+        self,
+        message: str,
+        scope: str,
+        include_web: bool,
+        user_id: Optional[UUID],
+    ) -> tuple[Optional[list[float]], list[Citation]]:
+        """Embed the message (when caching) and run hybrid search."""
+        query_vector = await self._embed_for_cache(message)
+        citations = await self.search_service.hybrid_search(
+            query=message,
+            top_k=5,
+            include_web=include_web or scope == "web",
+            user_id=user_id,
+            query_vector=query_vector,
+        )
+        return query_vector, citations
+
+    async def _watch_disconnect(
+        self, is_disconnected: Optional[Callable[[], Awaitable[bool]]]
+    ) -> None:
+        """Return once the client has disconnected (never, without a probe)."""
+        if is_disconnected is None:
+            await asyncio.Event().wait()
+        while not await is_disconnected():
+            await asyncio.sleep(settings.chat_disconnect_poll_interval)
+        logger.info("Chat client disconnected")
+
+    async def _race_disconnect(
+        self, task: asyncio.Future, disconnect_task: asyncio.Task
+    ) -> bool:
+        """
+        Wait for a task unless the client disconnects first.
+
+        Returns:
+            True if the task finished, False if it was cancelled on disconnect
+        """
+        done, _ = await asyncio.wait(
+            {task, disconnect_task}, return_when=asyncio.FIRST_COMPLETED
+        )
+        if task in done:
+            return True
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError, StopAsyncIteration):
+            await task
+        return False
+
+    def _record_cancellation(self, stage: str, text_chunks: list[str]) -> None:
+        """Record a disconnect-driven cancellation and the tokens it saved."""
+        # Stream deltas are not tokens; count what was generated so far
+        tokens_streamed = ChunkingService().count_tokens("".join(text_chunks))
+        tokens_saved = max(0, MAX_COMPLETION_TOKENS - tokens_streamed)
+        metrics = get_metrics()
+        metrics.incr("chat_stream_cancelled", stage=stage)
+        metrics.incr("chat_tokens_saved", tokens_saved)
+        logger.info(
+            f"Chat stream aborted on disconnect: stage={stage}, "
+            f"tokens_streamed={tokens_streamed}, tokens_saved<={tokens_saved}"
+        )
+
+    async def _embed_for_cache(self, message: str) -> Optional[list[float]]:
+        """Embed the message once for both retrieval and cache lookup."""
+        if not settings.chat_cache_enabled:
+            return None
+        try:
+            return await self.search_service.embedding_service.generate_embedding(
+                message
+            )
+        except Exception as e:
+            logger.warning(f"Answer cache embedding failed, bypassing cache: {e}")
+            return None
+
+    def _replay_events(
+        self, text_chunks: list[str], citations: list[Citation]
+    ) -> list[str]:
+        """Build the SSE events for a cached answer."""
+        events = []
+        for text in text_chunks:
+            text_event = StreamEvent(type="text", content=text)
+            events.append(f"data: {text_event.model_dump_json()}\n\n")
+        for citation in citations:
+            citation_event = StreamEvent(type="citation", citation=citation)
+            events.append(f"data: {citation_event.model_dump_json()}\n\n")
+        done_event = StreamEvent(type="done")
+        events.append(f"data: {done_event.model_dump_json()}\n\n")
+        return events
 
     def _build_context(self, citations: list[Citation]) -> str:
         """Build context string from citations."""
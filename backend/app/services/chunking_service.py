@@ -1,7 +1,7 @@
 """
 Document chunking service for text segmentation.
 """
-from typing import Generator
+from typing import Generator, Optional
 
 import tiktoken
 
@@ -63,6 +63,15 @@ class ChunkingService:
             advance = max(1, self.chunk_size - self.chunk_overlap)
             start_idx += advance
     
+    def stream(self) -> "StreamingChunker":
+        """
+        Start chunking text that arrives in pieces (e.g. PDF pages).
+        
+        Returns:
+            StreamingChunker with this service's chunk size and overlap
+        """
+        return StreamingChunker(self.encoding, self.chunk_size, self.chunk_overlap)
+    
     def _estimate_char_offset(self, text: str, all_tokens: list[int], token_idx: int) -> int:
         """
         Estimate character offset for a given token index.
@@ -91,3 +100,92 @@ class ChunkingService:
         if not text:
             return 0
         return len(self.encoding.encode(text))
+
+
+class StreamingChunker:
+    """
+    Chunks text fed piece by piece, using the same token windows as
+    ChunkingService.chunk_text.
+    
+    Each chunk is emitted once enough text follows it that later pieces
+    cannot change its tokens, and only the text from the next chunk's start
+    onwards is kept, so memory stays bounded for arbitrarily long input.
+    Offsets are exact character positions in the concatenated text.
+    """
+    
+    # Tokens required after a chunk's end before it is emitted, so a piece
+    # boundary cannot change how the chunk's text was tokenized
+    TAIL_MARGIN = 16
+    
+    def __init__(self, encoding, chunk_size: int, chunk_overlap: int):
+        self.encoding = encoding
+        self.chunk_size = chunk_size
+        self.advance = max(1, chunk_size - chunk_overlap)
+        self._buffer = ""
+        # Offset of the buffer's first character in the full text
+        self._buffer_offset = 0
+        self._chunk_index = 0
+    
+    def feed(self, text: str) -> list[tuple[int, str, int, int]]:
+        """
+        Add the next piece of text.
+        
+        Args:
+            text: Text continuing directly from the previous piece
+            
+        Returns:
+            Chunks completed by this piece, as
+            (chunk_index, chunk_text, start_offset, end_offset)
+        """
+        self._buffer += text
+        return self._drain(final=False)
+    
+    def finish(self) -> list[tuple[int, str, int, int]]:
+        """
+        Flush the remaining text after the last piece.
+        
+        Returns:
+            Remaining chunks, as (chunk_index, chunk_text, start_offset, end_offset)
+        """
+        chunks = self._drain(final=True) if self._buffer.strip() else []
+        self._buffer = ""
+        return chunks
+    
+    def _drain(self, final: bool) -> list[tuple[int, str, int, int]]:
+        tokens = self.encoding.encode(self._buffer)
+        total_tokens = len(tokens)
+        offsets: Optional[list[int]] = None
+        
+        def char_offset(token_idx: int) -> int:
+            nonlocal offsets
+            if token_idx >= total_tokens:
+                return len(self._buffer)
+            if offsets is None:
+                _, offsets = self.encoding.decode_with_offsets(tokens)
+            return offsets[token_idx]
+        
+        chunks = []
+        start_idx = 0
+        while start_idx < total_tokens:
+            end_idx = min(start_idx + self.chunk_size, total_tokens)
+            if not final and end_idx + self.TAIL_MARGIN > total_tokens:
+                break
+            
+            chunks.append(
+                (
+                    self._chunk_index,
+                    self.encoding.decode(tokens[start_idx:end_idx]),
+                    self._buffer_offset + char_offset(start_idx),
+                    self._buffer_offset + char_offset(end_idx),
+                )
+            )
+            self._chunk_index += 1
+            start_idx += self.advance
+        
+        if chunks and not final:
+            # Keep only the text from the next chunk's first token onwards
+            cut = char_offset(start_idx)
+            self._buffer = self._buffer[cut:]
+            self._buffer_offset += cut
+        
+        return chunks
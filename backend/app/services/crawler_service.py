@@ -0,0 +1,137 @@
+"""
+Polite concurrent crawler for fetching full article text.
+
+Requests are capped globally and per host, spaced by a per-host politeness
+delay, and retried with exponential backoff on transient failures.
+"""
+import asyncio
+import time
+from functools import lru_cache
+from typing import Optional
+
+import httpx
+import structlog
+
+from app.core.config import get_settings
+from app.core.metrics import get_metrics
+from app.services.host_limiter import HostConcurrencyLimiter
+from app.services.url_service import PageFetchResult, URLService
+
+settings = get_settings()
+logger = structlog.get_logger()
+
+# Status codes worth retrying: rate limiting and server errors
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+# Host slot reservations kept before expired ones are pruned
+NEXT_SLOT_PRUNE_SIZE = 1024
+
+
+class FullTextCrawler:
+    """Fetches and extracts article pages without hammering any one site."""
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        per_host_concurrency: int,
+        politeness_delay: float,
+        max_retries: int,
+        retry_backoff: float,
+    ):
+        self.limiter = HostConcurrencyLimiter(max_concurrency, per_host_concurrency)
+        self.politeness_delay = politeness_delay
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.url_service = URLService()
+        self.logger = logger.bind(service="crawler")
+        # Earliest monotonic time the next request to each host may start
+        self._next_slot: dict[str, float] = {}
+        self._prune_at = NEXT_SLOT_PRUNE_SIZE
+
+    async def _wait_for_host(self, host: str) -> None:
+        """Reserve the host's next request slot and sleep until it opens."""
+        now = time.monotonic()
+        if len(self._next_slot) >= self._prune_at:
+            # A slot in the past is the same as no reservation
+            self._next_slot = {h: t for h, t in self._next_slot.items() if t > now}
+            self._prune_at = max(NEXT_SLOT_PRUNE_SIZE, len(self._next_slot) * 2)
+        start = max(now, self._next_slot.get(host, now))
+        self._next_slot[host] = start + self.politeness_delay
+        if start > now:
+            await asyncio.sleep(start - now)
+
+    def _is_retryable(self, error: Exception) -> bool:
+        if isinstance(error, httpx.HTTPStatusError):
+            return error.response.status_code in RETRYABLE_STATUS
+        return isinstance(error, httpx.TransportError)
+
+    async def fetch(self, url: str) -> Optional[PageFetchResult]:
+        """
+        Fetch a page and extract its main text.
+
+        Args:
+            url: Article URL
+
+        Returns:
+            Extracted page (with its HTML), or None if the page could not be
+            fetched or parsed
+        """
+        if not self.url_service.validate_url(url):
+            return None
+
+        metrics = get_metrics()
+        host = self.limiter.host_of(url)
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                # Politeness delays are waited out before taking a global
+                # slot, so a slow host never holds up the others
+                async with self.limiter.host_slot(url):
+                    await self._wait_for_host(host)
+                    async with self.limiter.global_slot():
+                        html_content = await self.url_service.fetch_html(url)
+            except Exception as e:
+                if attempt < self.max_retries and self._is_retryable(e):
+                    metrics.incr("crawler_retries", host=host)
+                    # Back off outside the limiter so other hosts keep flowing
+                    await asyncio.sleep(self.retry_backoff * 2 ** attempt)
+                    continue
+                metrics.incr("crawler_fetches", outcome="error")
+                self.logger.warning("crawl_failed", url=url, attempts=attempt + 1, error=str(e))
+                return None
+            break
+
+        success, title, content, error = await self.url_service.extract_content(html_content, url)
+        if not success:
+            metrics.incr("crawler_fetches", outcome="empty")
+            self.logger.info("crawl_no_content", url=url, error=error)
+            return None
+
+        metrics.incr("crawler_fetches", outcome="ok")
+        return PageFetchResult(True, title, content, html=html_content)
+
+    async def fetch_many(self, urls: list[str]) -> dict[str, PageFetchResult]:
+        """
+        Crawl URLs concurrently within the crawler's limits.
+
+        Args:
+            urls: Article URLs
+
+        Returns:
+            Mapping of URL to extracted page (failed URLs are omitted)
+        """
+        unique = list(dict.fromkeys(urls))
+        results = await asyncio.gather(*(self.fetch(url) for url in unique))
+        return {url: page for url, page in zip(unique, results) if page}
+
+
+@lru_cache
+def get_crawler() -> FullTextCrawler:
+    """Get the process-wide crawler, so host limits span all feed refreshes."""
+    return FullTextCrawler(
+        max_concurrency=settings.crawler_max_concurrency,
+        per_host_concurrency=settings.crawler_per_host_concurrency,
+        politeness_delay=settings.crawler_politeness_delay,
+        max_retries=settings.crawler_max_retries,
+        retry_backoff=settings.crawler_retry_backoff,
+    )
@@ -0,0 +1,306 @@
+"""
+Feed refresh service: fetch one RSS source and ingest its new entries.
+"""
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import aclosing
+from datetime import datetime
+from typing import Optional
+
+import httpx
+import structlog
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.metrics import get_metrics
+from app.models.models import Source
+from app.services.boilerplate_service import BoilerplateModel, BoilerplateService
+from app.services.crawler_service import get_crawler
+from app.services.html_text import html_to_text, normalize_html
+from app.services.ingestion_orchestrator import IngestionOrchestrator
+from app.services.raw_archive import RawArchive
+from app.services.rss_service import FeedParseError, RSSEntry, RSSService
+from app.services.seen_entry_service import SeenEntryIndex
+from app.services.url_service import PageFetchResult
+
+settings = get_settings()
+logger = structlog.get_logger()
+
+# Entries checked against the seen index per query while streaming
+SEEN_LOOKUP_BATCH_SIZE = 20
+
+
+class FeedRefreshResult:
+    """Outcome of refreshing a single feed."""
+
+    def __init__(
+        self,
+        success: bool,
+        not_modified: bool = False,
+        articles_fetched: int = 0,
+        articles_created: int = 0,
+        articles_skipped: int = 0,
+        articles_updated: int = 0,
+        published_dates: Optional[list[datetime]] = None,
+        error: Optional[str] = None,
+    ):
+        self.success = success
+        self.not_modified = not_modified
+        self.articles_fetched = articles_fetched
+        self.articles_created = articles_created
+        self.articles_skipped = articles_skipped
+        self.articles_updated = articles_updated
+        self.published_dates = published_dates or []
+        self.error = error
+
+
+class FeedRefreshService:
+    """Fetches an RSS source and ingests new entries as documents."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.rss_service = RSSService()
+        self.orchestrator = IngestionOrchestrator(db)
+        self.seen_index = SeenEntryIndex(db)
+        self.raw_archive = RawArchive(db)
+        self.boilerplate = BoilerplateService(db)
+        self.logger = logger.bind(service="feed_refresh")
+
+    async def refresh(self, source: Source) -> FeedRefreshResult:
+        """
+        Fetch the source's feed and ingest new entries.
+
+        Args:
+            source: RSS source (attached to this service's session)
+
+        Returns:
+            FeedRefreshResult with ingestion counts and entry publish dates
+        """
+        source_id = source.id
+        user_id = source.user_id
+        fetch_full_text = source.fetch_full_text
+        boilerplate: Optional[BoilerplateModel] = None
+
+        entries_fetched = 0
+        articles_created = 0
+        articles_skipped = 0
+        articles_unchanged = 0
+        articles_updated = 0
+        published_dates: list[datetime] = []
+        date_ordered = True
+        previous_date: Optional[datetime] = None
+        stopped_early = False
+
+        try:
+            # Revalidate with the stored validators; entries stream in as parsed
+            async with self.rss_service.open_feed(
+                source.url,
+                etag=source.etag,
+                last_modified=source.last_modified,
+            ) as feed:
+                if feed.not_modified:
+                    # Unchanged since last poll: skip parsing and ingestion
+                    source.last_fetched_at = datetime.utcnow()
+                    await self.db.commit()
+                    return FeedRefreshResult(True, not_modified=True)
+
+                if settings.boilerplate_enabled:
+                    boilerplate = await self.boilerplate.load(source_id)
+
+                async with aclosing(self._batched(feed.entries())) as batches:
+                    async for batch in batches:
+                        # Known entries are dropped before any hashing or document lookup
+                        known = await self.seen_index.lookup(
+                            source_id, [entry.key for entry in batch if entry.key]
+                        )
+                        new_entries: list[RSSEntry] = []
+
+                        for entry in batch:
+                            entries_fetched += 1
+                            if entry.published_at:
+                                published_dates.append(entry.published_at)
+
+                            # Newest-first so far? Then a known entry ends the feed
+                            date_ordered = (
+                                date_ordered
+                                and entry.published_at is not None
+                                and (previous_date is None or entry.published_at <= previous_date)
+                            )
+                            previous_date = entry.published_at
+
+                            if entry.key in known and known[entry.key][0] == entry.updated_at:
+                                articles_unchanged += 1
+                                if date_ordered:
+                                    # Everything after this entry is older and already seen
+                                    stopped_early = True
+                                    break
+                                continue
+
+                            new_entries.append(entry)
+
+                        # Crawl the batch's article pages concurrently
+                        pages = {}
+                        if fetch_full_text:
+                            pages = await get_crawler().fetch_many(
+                                [entry.url for entry in new_entries if entry.url]
+                            )
+
+                        # Flatten feed HTML to text and strip the source's
+                        # boilerplate from it before hashing and chunking
+                        bodies = await asyncio.to_thread(
+                            self._entry_bodies, new_entries, pages, boilerplate
+                        )
+
+                        seen_rows = []
+                        for entry, (content, content_html, summary) in zip(new_entries, bodies):
+                            page = pages.get(entry.url)
+
+                            if not content:
+                                if entry.key:
+                                    seen_rows.append((entry.key, entry.updated_at, None))
+                                continue
+
+                            # Keep crawled pages for re-extraction
+                            raw_fetch_id = None
+                            if page and page.html:
+                                raw_fetch_id = await self.raw_archive.store(page.html)
+
+                            # Updated entry: refresh the document it produced
+                            seen_document_id = known[entry.key][1] if entry.key in known else None
+                            if seen_document_id:
+                                if await self.orchestrator.update_document(
+                                    seen_document_id,
+                                    content,
+                                    title=entry.title,
+                                    summary=summary,
+                                    content_html=content_html,
+                                    raw_fetch_id=raw_fetch_id,
+                                ):
+                                    articles_updated += 1
+                                else:
+                                    articles_skipped += 1
+                                seen_rows.append((entry.key, entry.updated_at, seen_document_id))
+                                continue
+
+                            # Create document
+                            document, is_new, error = await self.orchestrator.create_document(
+                                source_id=source_id,
+                                user_id=user_id,
+                                title=entry.title,
+                                content=content,
+                                url=entry.url,
+                                author=entry.author,
+                                summary=summary,
+                                published_at=entry.published_at,
+                                raw_fetch_id=raw_fetch_id,
+                                content_html=content_html,
+                            )
+
+                            if document and is_new:
+                                articles_created += 1
+                                await self.orchestrator.process_document(document.id)
+                            elif document:
+                                articles_skipped += 1
+
+                            if document and entry.key:
+                                seen_rows.append((entry.key, entry.updated_at, document.id))
+
+                        await self.seen_index.mark_seen(source_id, seen_rows)
+                        if boilerplate and new_entries:
+                            await self.boilerplate.save(source_id, boilerplate)
+                        if stopped_early:
+                            # Leaving the context closes the response mid-body
+                            break
+
+            etag, last_modified = feed.etag, feed.last_modified
+        except (httpx.HTTPError, FeedParseError, ValueError) as e:
+            self.logger.error("feed_refresh_error", source_id=str(source_id), error=str(e))
+            return FeedRefreshResult(False, error=f"Failed to fetch RSS feed: {str(e)}")
+
+        metrics = get_metrics()
+        metrics.incr("feed_entries_unchanged", articles_unchanged)
+        metrics.incr("feed_entries_updated", articles_updated)
+        if stopped_early:
+            metrics.incr("feed_refresh_early_stops")
+
+        # Store validators only once every entry has been ingested
+        source.etag = etag
+        source.last_modified = last_modified
+
+        # Update last_fetched_at
+        source.last_fetched_at = datetime.utcnow()
+        await self.db.commit()
+
+        self.logger.info(
+            "feed_refreshed",
+            source_id=str(source_id),
+            articles_fetched=entries_fetched,
+            articles_created=articles_created,
+            articles_skipped=articles_skipped,
+            articles_unchanged=articles_unchanged,
+            articles_updated=articles_updated,
+            stopped_early=stopped_early,
+        )
+
+        return FeedRefreshResult(
+            True,
+            articles_fetched=entries_fetched,
+            articles_created=articles_created,
+            articles_skipped=articles_skipped + articles_unchanged,
+            articles_updated=articles_updated,
+            published_dates=published_dates,
+        )
+
+    def _entry_bodies(
+        self,
+        entries: list[RSSEntry],
+        pages: dict[str, PageFetchResult],
+        boilerplate: Optional[BoilerplateModel],
+    ) -> list[tuple[str, Optional[str], Optional[str]]]:
+        """
+        Text to ingest for each entry (runs in a worker thread).
+
+        Crawled full text is already plain and free of page chrome; it is
+        stored exactly as extracted, so re-extracting the archived page
+        reproduces it. Feed content or summary HTML is sanitised and
+        flattened, then lines the source repeats across entries are
+        stripped from it (not from the display HTML).
+
+        Returns:
+            (content, content_html, summary) per entry; content_html is the
+            sanitised HTML when the content was markup
+        """
+        bodies = []
+        from_feed = []
+        for entry in entries:
+            page = pages.get(entry.url)
+            if page and page.content:
+                content, content_html = page.content, None
+            else:
+                content, content_html = normalize_html(entry.content or entry.summary or "")
+                from_feed.append(len(bodies))
+            summary = html_to_text(entry.summary) if entry.summary else None
+            bodies.append((content or "", content_html, summary or None))
+
+        if boilerplate and from_feed:
+            contents = boilerplate.strip_batch(
+                [bodies[i][0] for i in from_feed],
+                self.orchestrator.chunking_service.count_tokens,
+            )
+            for i, content in zip(from_feed, contents):
+                _, content_html, summary = bodies[i]
+                bodies[i] = (content, content_html, summary)
+        return bodies
+
+    async def _batched(
+        self, entries: AsyncIterator[RSSEntry]
+    ) -> AsyncIterator[list[RSSEntry]]:
+        """Group streamed entries so seen lookups are one query per batch."""
+        batch: list[RSSEntry] = []
+        async for entry in entries:
+            batch.append(entry)
+            if len(batch) >= SEEN_LOOKUP_BATCH_SIZE:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
@@ -0,0 +1,221 @@
+"""
+Adaptive feed polling scheduler.
+
+Active RSS sources are polled when their persisted next_fetch_at falls due.
+Each feed's interval is learned from its observed publish frequency, backed
+off when the feed is unchanged or failing, and jittered to avoid herds.
+"""
+import asyncio
+import random
+import statistics
+from datetime import datetime, timedelta
+from typing import Optional
+from uuid import UUID
+
+import structlog
+from sqlalchemy import or_, select, update
+
+from app.core.config import get_settings
+from app.core.metrics import get_metrics
+from app.db.session import async_session_maker
+from app.models.models import Source, SourceType
+from app.services.feed_refresh_service import FeedRefreshResult, FeedRefreshService
+from app.services.host_limiter import HostConcurrencyLimiter
+
+settings = get_settings()
+logger = structlog.get_logger()
+
+# Failure backoff stops growing here (the interval is clamped anyway)
+MAX_BACKOFF_DOUBLINGS = 16
+
+
+def compute_next_interval(
+    current_interval: Optional[int],
+    result: FeedRefreshResult,
+    consecutive_failures: int = 0,
+) -> int:
+    """
+    Compute a feed's next polling interval in seconds (before jitter).
+
+    Args:
+        current_interval: Interval used for the poll that just finished
+        result: Outcome of the poll
+        consecutive_failures: Failed polls in a row, including this one
+
+    Returns:
+        Interval in seconds, clamped to the configured bounds
+    """
+    base = current_interval or settings.feed_default_interval_seconds
+
+    if not result.success:
+        # Exponential backoff on errors: double per consecutive failure
+        interval = base * 2 ** min(max(consecutive_failures, 1), MAX_BACKOFF_DOUBLINGS)
+    elif result.not_modified or result.articles_created == 0:
+        # Nothing new: back off gently
+        interval = base * settings.feed_unchanged_backoff
+    else:
+        # Learn from publish frequency: median gap between recent entries
+        dates = sorted(result.published_dates, reverse=True)[:20]
+        gaps = [
+            (newer - older).total_seconds()
+            for newer, older in zip(dates, dates[1:])
+            if newer > older
+        ]
+        if gaps:
+            interval = statistics.median(gaps)
+        else:
+            interval = base / settings.feed_unchanged_backoff
+
+    return int(
+        min(
+            max(interval, settings.feed_min_interval_seconds),
+            settings.feed_max_interval_seconds,
+        )
+    )
+
+
+def apply_jitter(interval: int) -> int:
+    """Spread an interval by +/- the configured jitter ratio."""
+    spread = interval * settings.feed_interval_jitter
+    return max(1, int(interval + random.uniform(-spread, spread)))
+
+
+class FeedScheduler:
+    """Background loop that keeps active RSS sources fresh."""
+
+    def __init__(self):
+        self.limiter = HostConcurrencyLimiter(
+            max_concurrency=settings.feed_max_concurrency,
+            per_host_concurrency=settings.feed_per_host_concurrency,
+        )
+        self.logger = logger.bind(service="feed_scheduler")
+        self._task: Optional[asyncio.Task] = None
+        self._in_flight: dict[UUID, asyncio.Task] = {}
+
+    def start(self) -> None:
+        """Start the polling loop on the running event loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            self.logger.info("feed_scheduler_started")
+
+    async def stop(self) -> None:
+        """Stop the polling loop and cancel in-flight polls."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        tasks = [self._task, *self._in_flight.values()]
+        for task in self._in_flight.values():
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+        self._in_flight.clear()
+        self.logger.info("feed_scheduler_stopped")
+
+    async def _run(self) -> None:
+        """Claim due sources every tick and poll them concurrently."""
+        while True:
+            try:
+                for source_id, url in await self._claim_due_sources():
+                    task = asyncio.create_task(self._poll(source_id, url))
+                    self._in_flight[source_id] = task
+                    task.add_done_callback(
+                        lambda _, sid=source_id: self._in_flight.pop(sid, None)
+                    )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.error("feed_scheduler_tick_error", error=str(e))
+
+            await asyncio.sleep(settings.feed_scheduler_tick_seconds)
+
+    async def _claim_due_sources(self) -> list[tuple[UUID, str]]:
+        """
+        Claim a batch of due sources.
+
+        Claimed rows get next_fetch_at pushed out by a lease, so other
+        workers (SKIP LOCKED) and later ticks do not poll them twice.
+
+        Returns:
+            List of (source_id, feed_url)
+        """
+        capacity = settings.feed_scheduler_batch_size - len(self._in_flight)
+        if capacity <= 0:
+            return []
+
+        now = datetime.utcnow()
+        async with async_session_maker() as db:
+            stmt = (
+                select(Source.id, Source.url)
+                .where(
+                    Source.type == SourceType.RSS,
+                    Source.is_active.is_(True),
+                    Source.url.is_not(None),
+                    or_(Source.next_fetch_at.is_(None), Source.next_fetch_at <= now),
+                )
+                .order_by(Source.next_fetch_at.asc().nulls_first())
+                .limit(capacity)
+                .with_for_update(skip_locked=True)
+            )
+            rows = [
+                (source_id, url)
+                for source_id, url in (await db.execute(stmt)).all()
+                if source_id not in self._in_flight
+            ]
+            if rows:
+                lease_until = now + timedelta(seconds=settings.feed_claim_lease_seconds)
+                await db.execute(
+                    update(Source)
+                    .where(Source.id.in_([source_id for source_id, _ in rows]))
+                    .values(next_fetch_at=lease_until)
+                )
+            await db.commit()
+
+        return rows
+
+    async def _poll(self, source_id: UUID, url: str) -> None:
+        """Refresh one source and persist its next due time."""
+        metrics = get_metrics()
+        async with self.limiter.limit(url):
+            async with async_session_maker() as db:
+                source = await db.get(Source, source_id)
+                if source is None or not source.is_active:
+                    return
+
+                try:
+                    result = await FeedRefreshService(db).refresh(source)
+                except Exception as e:
+                    await db.rollback()
+                    result = FeedRefreshResult(False, error=str(e))
+
+                # Ingestion commits or rolls back; reload before scheduling
+                await db.refresh(source)
+                if result.success:
+                    source.consecutive_failures = 0
+                else:
+                    source.consecutive_failures = (source.consecutive_failures or 0) + 1
+
+                interval = compute_next_interval(
+                    source.fetch_interval_seconds, result, source.consecutive_failures
+                )
+                if result.success:
+                    # Failure backoff is not learned; recovery resumes the old interval
+                    source.fetch_interval_seconds = interval
+                source.next_fetch_at = datetime.utcnow() + timedelta(
+                    seconds=apply_jitter(interval)
+                )
+                await db.commit()
+
+        outcome = (
+            "error" if not result.success
+            else "not_modified" if result.not_modified
+            else "ok"
+        )
+        metrics.incr("feed_scheduler_polls", outcome=outcome)
+        self.logger.info(
+            "feed_polled",
+            source_id=str(source_id),
+            outcome=outcome,
+            articles_created=result.articles_created,
+            next_interval=interval,
+            error=result.error,
+        )
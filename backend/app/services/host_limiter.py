@@ -0,0 +1,67 @@
+"""
+Global and per-host concurrency limiting for outbound fetches.
+"""
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from urllib.parse import urlparse
+
+
+class HostConcurrencyLimiter:
+    """Caps concurrent requests overall and per hostname."""
+
+    def __init__(self, max_concurrency: int, per_host_concurrency: int):
+        self.per_host_concurrency = per_host_concurrency
+        self._global = asyncio.Semaphore(max_concurrency)
+        # Host -> (semaphore, tasks holding or waiting for it); idle hosts are dropped
+        self._hosts: dict[str, tuple[asyncio.Semaphore, int]] = {}
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        """Get the lowercase hostname of a URL ("" if it has none)."""
+        return (urlparse(url).hostname or "").lower()
+
+    def _acquire_host(self, host: str) -> asyncio.Semaphore:
+        semaphore, users = self._hosts.get(host) or (
+            asyncio.Semaphore(self.per_host_concurrency), 0
+        )
+        self._hosts[host] = (semaphore, users + 1)
+        return semaphore
+
+    def _release_host(self, host: str) -> None:
+        semaphore, users = self._hosts[host]
+        if users <= 1:
+            del self._hosts[host]
+        else:
+            self._hosts[host] = (semaphore, users - 1)
+
+    @asynccontextmanager
+    async def host_slot(self, url: str) -> AsyncIterator[None]:
+        """Hold a slot for the URL's host only (take global_slot inside it)."""
+        host = self.host_of(url)
+        try:
+            async with self._acquire_host(host):
+                yield
+        finally:
+            self._release_host(host)
+
+    @asynccontextmanager
+    async def global_slot(self) -> AsyncIterator[None]:
+        """Hold one of the global slots."""
+        async with self._global:
+            yield
+
+    @asynccontextmanager
+    async def limit(self, url: str) -> AsyncIterator[None]:
+        """
+        Hold a global slot and a slot for the URL's host.
+
+        The host slot is taken first so a busy host never pins global slots
+        while it waits.
+
+        Args:
+            url: URL about to be fetched
+        """
+        async with self.host_slot(url):
+            async with self.global_slot():
+                yield
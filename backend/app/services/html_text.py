@@ -0,0 +1,160 @@
+"""
+HTML feed content normalisation: sanitise for display, flatten to text
+for hashing, chunking and embedding.
+
+Feed entries carry raw HTML (inline styles, scripts, tracking pixels,
+share widgets). One lxml parse produces both a whitelisted HTML rendering
+and plain text with paragraph breaks, so markup never reaches the
+tokenizer.
+"""
+import re
+from typing import Optional
+
+from lxml import etree, html as lxml_html
+
+# Cheap pre-check so plain-text entries skip the parser
+HTML_PATTERN = re.compile(r"<\s*(?:[a-zA-Z][a-zA-Z0-9]*|!--)[^>]*>")
+
+# Elements dropped together with everything inside them
+DROP_TAGS = {
+    "script", "style", "noscript", "template", "iframe", "object", "embed",
+    "form", "button", "input", "select", "textarea", "svg", "math", "canvas",
+    "head", "title", "meta", "link", "base",
+}
+
+# Elements kept in the sanitised rendering; others are unwrapped (text kept)
+ALLOWED_TAGS = {
+    "a", "abbr", "b", "blockquote", "br", "caption", "cite", "code", "dd", "del",
+    "div", "dl", "dt", "em", "figcaption", "figure", "h1", "h2", "h3", "h4", "h5",
+    "h6", "hr", "i", "img", "ins", "kbd", "li", "mark", "ol", "p", "pre", "q", "s",
+    "small", "span", "strong", "sub", "sup", "table", "tbody", "td", "tfoot", "th",
+    "thead", "tr", "u", "ul",
+}
+
+ALLOWED_ATTRIBUTES = {
+    "a": {"href", "title"},
+    "img": {"src", "alt", "title", "width", "height"},
+    "td": {"colspan", "rowspan"},
+    "th": {"colspan", "rowspan"},
+}
+
+SAFE_URL_SCHEMES = ("http://", "https://", "mailto:")
+
+# Elements that are separate paragraphs / separate lines in the text rendering
+BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "div", "dl", "figcaption",
+    "figure", "footer", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr",
+    "main", "nav", "ol", "p", "pre", "section", "table", "ul",
+}
+LINE_TAGS = {"dd", "dt", "li", "tr"}
+
+WHITESPACE = re.compile(r"[ \t\r\f\v ]+")
+BLANK_LINES = re.compile(r"\n\s*\n+")
+
+
+def looks_like_html(content: str) -> bool:
+    """Whether content contains markup worth parsing."""
+    return bool(HTML_PATTERN.search(content))
+
+
+def _is_tracking_pixel(element) -> bool:
+    width, height = element.get("width", ""), element.get("height", "")
+    return width.strip() in ("0", "1") or height.strip() in ("0", "1")
+
+
+def _safe_url(url: Optional[str]) -> bool:
+    return bool(url) and url.strip().lower().startswith(SAFE_URL_SCHEMES)
+
+
+def _sanitize(root) -> None:
+    """Clean a parsed fragment in place."""
+    for element in list(root.iter()):
+        if element is root:
+            continue
+        if not isinstance(element.tag, str):
+            # Comments and processing instructions
+            element.drop_tree()
+            continue
+
+        tag = element.tag.lower()
+        if tag in DROP_TAGS or (
+            tag == "img" and (_is_tracking_pixel(element) or not _safe_url(element.get("src")))
+        ):
+            element.drop_tree()
+            continue
+
+        if tag not in ALLOWED_TAGS:
+            element.drop_tag()
+            continue
+
+        allowed = ALLOWED_ATTRIBUTES.get(tag, set())
+        for name in list(element.attrib):
+            if name not in allowed:
+                del element.attrib[name]
+        if tag == "a" and not _safe_url(element.get("href")):
+            element.attrib.pop("href", None)
+
+
+def _to_text(root) -> str:
+    """Flatten a sanitised fragment to text with paragraph and line breaks."""
+    parts: list[str] = []
+
+    def walk(element) -> None:
+        tag = element.tag if isinstance(element.tag, str) else ""
+        block = tag in BLOCK_TAGS
+        if block:
+            parts.append("\n\n")
+        elif tag in LINE_TAGS:
+            parts.append("\n")
+        if tag == "br":
+            parts.append("\n")
+        elif tag == "li":
+            parts.append("- ")
+        elif tag == "img" and element.get("alt"):
+            parts.append(element.get("alt"))
+
+        if element.text:
+            parts.append(element.text)
+        for child in element:
+            walk(child)
+            if child.tail:
+                parts.append(child.tail)
+
+        if block:
+            parts.append("\n\n")
+        elif tag in ("td", "th"):
+            parts.append(" ")
+
+    walk(root)
+
+    lines = (WHITESPACE.sub(" ", line).strip() for line in "".join(parts).split("\n"))
+    return BLANK_LINES.sub("\n\n", "\n".join(lines)).strip()
+
+
+def normalize_html(content: str) -> tuple[str, Optional[str]]:
+    """
+    Convert feed content to plain text, keeping sanitised HTML for display.
+
+    Args:
+        content: Entry content, HTML or plain text
+
+    Returns:
+        Tuple of (text, sanitised_html); sanitised_html is None for
+        plain-text content, which is returned unchanged
+    """
+    if not content or not looks_like_html(content):
+        return content, None
+
+    try:
+        root = lxml_html.fragment_fromstring(content, create_parent="div")
+    except (etree.ParserError, ValueError):
+        return content, None
+
+    _sanitize(root)
+    sanitized = lxml_html.tostring(root, encoding="unicode")
+    return _to_text(root), sanitized
+
+
+def html_to_text(content: str) -> str:
+    """Plain text of feed content (HTML or not)."""
+    return normalize_html(content)[0]
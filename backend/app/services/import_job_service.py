@@ -0,0 +1,216 @@
+"""
+Batch URL import jobs.
+
+URLs are fetched concurrently under global and per-host limits, ingested
+in bulk as pages arrive, and progress is persisted on the import_jobs row
+for clients to poll. Running jobs send a heartbeat; jobs whose worker died
+go silent and are marked failed by sweep_stale_jobs.
+"""
+import asyncio
+from datetime import datetime, timedelta
+from typing import Optional
+from uuid import UUID
+
+import structlog
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.models.models import ImportJob, ImportJobStatus
+from app.services.host_limiter import HostConcurrencyLimiter
+from app.services.ingestion_orchestrator import IngestionOrchestrator
+from app.services.raw_archive import RawArchive
+from app.services.url_import_service import URLImportService
+from app.services.url_service import PageFetchResult
+
+settings = get_settings()
+logger = structlog.get_logger()
+
+# Failed URLs kept on the job row for the client
+MAX_RECORDED_FAILURES = 100
+
+
+class ImportJobService:
+    """Runs a batch URL import job to completion."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.orchestrator = IngestionOrchestrator(db)
+        self.raw_archive = RawArchive(db)
+        self.url_import = URLImportService()
+        self.limiter = HostConcurrencyLimiter(
+            max_concurrency=settings.import_max_concurrency,
+            per_host_concurrency=settings.import_per_host_concurrency,
+        )
+        self.logger = logger.bind(service="import_job")
+
+    async def run(self, job_id: UUID, urls: list[str]) -> None:
+        """
+        Fetch and ingest a job's URLs.
+
+        Args:
+            job_id: Import job ID
+            urls: Deduplicated URLs to import, as submitted
+        """
+        job = await self.db.get(ImportJob, job_id)
+        if job is None:
+            return
+
+        job.status = ImportJobStatus.RUNNING
+        await self.db.commit()
+
+        heartbeat = asyncio.create_task(_heartbeat(job_id))
+        try:
+            pending: list[tuple[str, PageFetchResult]] = []
+            fetches = [asyncio.ensure_future(self._fetch(url)) for url in urls]
+            try:
+                for next_page in asyncio.as_completed(fetches):
+                    url, page = await next_page
+                    if page.success:
+                        pending.append((url, page))
+                    else:
+                        self._record_failure(job, url, page.error)
+                        await self.db.commit()
+
+                    if len(pending) >= settings.import_ingest_batch_size:
+                        await self._ingest(job, pending)
+                        pending = []
+            finally:
+                for fetch in fetches:
+                    fetch.cancel()
+
+            if pending:
+                await self._ingest(job, pending)
+
+            job.status = ImportJobStatus.COMPLETED
+        except Exception as e:
+            await self.db.rollback()
+            await self.db.refresh(job)
+            job.status = ImportJobStatus.FAILED
+            job.error = str(e)
+            self.logger.error("import_job_error", job_id=str(job_id), error=str(e))
+        finally:
+            heartbeat.cancel()
+
+        job.finished_at = datetime.utcnow()
+        await self.db.commit()
+
+        self.logger.info(
+            "import_job_finished",
+            job_id=str(job_id),
+            status=job.status.value,
+            succeeded=job.succeeded,
+            duplicates=job.duplicates,
+            failed=job.failed,
+        )
+
+    async def _fetch(self, url: str) -> tuple[str, PageFetchResult]:
+        async with self.limiter.limit(url):
+            return url, await self.url_import.fetch(url)
+
+    def _record_failure(self, job: ImportJob, url: str, error: Optional[str]) -> None:
+        job.processed += 1
+        job.failed += 1
+        if len(job.failures) < MAX_RECORDED_FAILURES:
+            # Reassign so the JSONB change is detected
+            job.failures = [*job.failures, {"url": url, "error": error or "Import failed"}]
+
+    async def _ingest(self, job: ImportJob, pages: list[tuple[str, PageFetchResult]]) -> None:
+        """Create documents for fetched pages in one batch, then chunk + embed them."""
+        items = []
+        for url, page in pages:
+            raw_fetch_id = await self.raw_archive.store(page.html) if page.html else None
+            items.append(
+                {
+                    "title": page.title or url,
+                    "content": page.content,
+                    "url": url,
+                    "raw_fetch_id": raw_fetch_id,
+                }
+            )
+
+        documents, duplicates = await self.orchestrator.create_documents(
+            source_id=job.source_id,
+            user_id=job.user_id,
+            items=items,
+        )
+
+        job.processed += len(pages)
+        job.succeeded += len(documents)
+        job.duplicates += duplicates
+        job.failed += len(pages) - len(documents) - duplicates
+        await self.db.commit()
+
+        for document in documents:
+            await self.orchestrator.process_document(document.id)
+
+
+async def run_import_job(job_id: UUID, urls: list[str]) -> None:
+    """Background task entry point for a batch URL import."""
+    from app.db.session import async_session_maker
+
+    async with async_session_maker() as db:
+        try:
+            await ImportJobService(db).run(job_id, urls)
+        except Exception as e:
+            logger.error("import_job_task_error", job_id=str(job_id), error=str(e))
+
+
+async def _heartbeat(job_id: UUID) -> None:
+    """Touch a running job's updated_at so sweeps know its worker is alive."""
+    from app.db.session import async_session_maker
+
+    while True:
+        await asyncio.sleep(settings.import_job_heartbeat_seconds)
+        try:
+            async with async_session_maker() as db:
+                await db.execute(
+                    update(ImportJob)
+                    .where(ImportJob.id == job_id)
+                    .values(updated_at=datetime.utcnow())
+                )
+                await db.commit()
+        except Exception as e:
+            logger.warning("import_job_heartbeat_error", job_id=str(job_id), error=str(e))
+
+
+async def fail_stale_jobs(db: AsyncSession) -> int:
+    """
+    Mark unfinished jobs failed once their heartbeat has stopped.
+
+    A job stays PENDING or RUNNING forever if the process running it dies;
+    after import_job_stale_seconds without a heartbeat it is given up.
+
+    Returns:
+        Number of jobs marked failed
+    """
+    now = datetime.utcnow()
+    result = await db.execute(
+        update(ImportJob)
+        .where(
+            ImportJob.status.in_([ImportJobStatus.PENDING, ImportJobStatus.RUNNING]),
+            ImportJob.updated_at < now - timedelta(seconds=settings.import_job_stale_seconds),
+        )
+        .values(
+            status=ImportJobStatus.FAILED,
+            error="Import interrupted: the server running it stopped",
+            finished_at=now,
+        )
+    )
+    await db.commit()
+    return result.rowcount
+
+
+async def sweep_stale_jobs() -> None:
+    """Background loop that fails interrupted jobs (started with the app)."""
+    from app.db.session import async_session_maker
+
+    while True:
+        try:
+            async with async_session_maker() as db:
+                failed = await fail_stale_jobs(db)
+            if failed:
+                logger.warning("import_jobs_interrupted", failed=failed)
+        except Exception as e:
+            logger.error("import_job_sweep_error", error=str(e))
+        await asyncio.sleep(settings.import_job_stale_seconds / 2)
@@ -2,13 +2,17 @@
 Document ingestion orchestrator service.
 Coordinates the full pipeline: source → document → chunks → embeddings.
 """
+from contextlib import aclosing
 from datetime import datetime
-from typing import Optional
-from uuid import UUID
+from typing import AsyncIterator, Optional
+from uuid import UUID, uuid4
 
 import structlog
-from sqlalchemy import select
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer
 
 from app.models.models import (
     Document,
@@ -18,12 +22,32 @@ from app.models.models import (
     Source,
     SourceType,
 )
+from app.services.answer_cache import get_answer_cache
 from app.services.chunking_service import ChunkingService
 from app.services.embedding_service import EmbeddingService
 from app.services.hashing import compute_content_hash
+from app.services.pdf_service import PDFExtractionError, PDFService
+from app.services.storage_service import get_storage_backend
+from app.services.url_canonical import canonicalize_url
 
 logger = structlog.get_logger()
 
+# Joins page texts in documents ingested page by page
+PAGE_SEPARATOR = "\n\n"
+
+# Name of the per-user source that ad-hoc URL imports are filed under
+URL_BUCKET_NAME = "Saved URLs"
+
+
+def _canonical_url(url: Optional[str]) -> Optional[str]:
+    """Canonical form of a document URL, or None if it has none (or a malformed one)."""
+    if not url:
+        return None
+    try:
+        return canonicalize_url(url)
+    except ValueError:
+        return None
+
 
 class IngestionOrchestrator:
     """Orchestrates document ingestion,chunking, and embedding."""
@@ -34,27 +58,90 @@ class IngestionOrchestrator:
         self.embedding_service = None  # Lazy init to avoid API key requirement
         self.logger = logger.bind(service="ingestion")
     
+    async def get_url_bucket(self, user_id: UUID) -> Source:
+        """
+        Get (creating on first use) the user's source for ad-hoc URL imports.
+        
+        Args:
+            user_id: Owner of the bucket
+            
+        Returns:
+            The user's URL bucket source
+        """
+        stmt = select(Source).where(
+            Source.user_id == user_id,
+            Source.type == SourceType.URL,
+            Source.is_bucket.is_(True),
+        )
+        bucket = await self.db.scalar(stmt)
+        if bucket is not None:
+            return bucket
+        
+        await self.db.execute(
+            insert(Source)
+            .values(
+                id=uuid4(),
+                user_id=user_id,
+                type=SourceType.URL,
+                name=URL_BUCKET_NAME,
+                is_active=True,
+                is_bucket=True,
+            )
+            .on_conflict_do_nothing(
+                index_elements=[Source.user_id, Source.type],
+                index_where=Source.is_bucket,
+            )
+        )
+        await self.db.commit()
+        
+        # Re-select: a concurrent import may have created the bucket first
+        return await self.db.scalar(stmt)
+    
+    async def find_by_url(self, user_id: UUID, url: str) -> Optional[Document]:
+        """
+        Find the user's document for a URL, ignoring tracking parameters,
+        fragments and other non-canonical differences.
+        
+        Args:
+            user_id: Owner of the library to search
+            url: Document URL (any spelling)
+            
+        Returns:
+            Existing document, or None
+        """
+        stmt = select(Document).where(
+            Document.user_id == user_id,
+            Document.canonical_url == canonicalize_url(url),
+        )
+        return await self.db.scalar(stmt)
+    
     async def create_document(
         self,
         source_id: UUID,
+        user_id: UUID,
         title: str,
         content: str,
         url: Optional[str] = None,
         author: Optional[str] = None,
         summary: Optional[str] = None,
         published_at: Optional[datetime] = None,
+        raw_fetch_id: Optional[UUID] = None,
+        content_html: Optional[str] = None,
     ) -> tuple[Optional[Document], bool, Optional[str]]:
         """
         Create a document with deduplication check.
         
         Args:
             source_id: Source ID
+            user_id: Owner of the source (denormalised onto the document)
             title: Document title
             content: Document content
             url: Optional URL
             author: Optional author
             summary: Optional summary
             published_at: Optional publication date
+            raw_fetch_id: Optional archived page the content was extracted from
+            content_html: Optional sanitised HTML the content was flattened from
             
         Returns:
             Tuple of (document, is_new, error_message)
@@ -69,6 +156,18 @@ class IngestionOrchestrator:
             if not content_hash:
                 return None, False, "Empty content cannot be ingested"
             
+            # The same article is stored once per user, whichever source found it
+            canonical_url = _canonical_url(url)
+            if canonical_url:
+                existing_doc = await self.find_by_url(user_id, canonical_url)
+                if existing_doc:
+                    self.logger.info(
+                        "document_duplicate_url_skipped",
+                        canonical_url=canonical_url,
+                        existing_id=str(existing_doc.id)
+                    )
+                    return existing_doc, False, None
+            
             # Check for duplicate within THIS source (user isolation)
             stmt = select(Document).where(
                 Document.source_id == source_id,
@@ -88,18 +187,30 @@ class IngestionOrchestrator:
             # Create new document
             document = Document(
                 source_id=source_id,
+                user_id=user_id,
                 title=title,
                 url=url,
+                canonical_url=canonical_url,
                 author=author,
                 summary=summary,
                 content=content,
+                content_html=content_html,
                 content_hash=content_hash,
                 published_at=published_at,
+                raw_fetch_id=raw_fetch_id,
                 status=DocumentStatus.PENDING,
             )
             
             self.db.add(document)
-            await self.db.commit()
+            try:
+                await self.db.commit()
+            except IntegrityError:
+                # Lost a race with a concurrent import of the same URL
+                await self.db.rollback()
+                existing_doc = await self.find_by_url(user_id, canonical_url) if canonical_url else None
+                if existing_doc is None:
+                    raise
+                return existing_doc, False, None
             await self.db.refresh(document)
             
             self.logger.info(
@@ -116,6 +227,273 @@ class IngestionOrchestrator:
             self.logger.error("document_creation_error", error=str(e))
             return None, False, error_msg
     
+    async def update_document(self, document_id: UUID, content: str, **fields) -> bool:
+        """
+        Replace a document's content, re-chunking and re-embedding it if
+        the text changed.
+        
+        Args:
+            document_id: Document to update
+            content: New content
+            **fields: Other columns updated with the content (title,
+                summary, content_html, raw_fetch_id, ...)
+            
+        Returns:
+            True if the content changed, False if it was identical (or the
+            document no longer exists)
+        """
+        content_hash = compute_content_hash(content)
+        current_hash = await self.db.scalar(
+            select(Document.content_hash).where(Document.id == document_id)
+        )
+        if not content_hash or current_hash is None or content_hash == current_hash:
+            return False
+        
+        # Embeddings cascade with their chunks
+        await self.db.execute(delete(DocumentChunk).where(DocumentChunk.document_id == document_id))
+        await self.db.execute(
+            update(Document)
+            .where(Document.id == document_id)
+            .values(
+                content=content,
+                content_hash=content_hash,
+                chunks_count=0,
+                status=DocumentStatus.PENDING,
+                processing_error=None,
+                **fields,
+            )
+        )
+        await self.db.commit()
+        
+        self.logger.info("document_content_replaced", document_id=str(document_id))
+        await self.process_document(document_id)
+        return True
+    
+    async def ingest_pdf(
+        self,
+        document_id: UUID,
+        file_key: str,
+        use_metadata_title: bool = True,
+    ) -> tuple[bool, int, Optional[str]]:
+        """
+        Extract, chunk and embed an uploaded PDF into its placeholder document.
+        
+        The document moves PENDING -> PROCESSING -> READY, or to FAILED with
+        processing_error set.
+        
+        Args:
+            document_id: Placeholder document created at upload
+            file_key: Storage key of the uploaded PDF
+            use_metadata_title: Replace the title with the PDF's own, if it has one
+            
+        Returns:
+            Tuple of (success, chunks_created, error_message)
+        """
+        document = await self.db.get(Document, document_id)
+        if not document:
+            return False, 0, "Document not found"
+        
+        # A retry after a failure starts again from the first page
+        if document.chunks_count:
+            await self.db.execute(
+                delete(DocumentChunk).where(DocumentChunk.document_id == document_id)
+            )
+            document.chunks_count = 0
+        
+        document.status = DocumentStatus.PROCESSING
+        document.processing_error = None
+        await self.db.commit()
+        
+        pdf_service = PDFService()
+        try:
+            # Object stores are copied to local scratch for PyMuPDF
+            async with get_storage_backend().local_copy(file_key) as file_path:
+                metadata = await pdf_service.read_info(file_path)
+                if use_metadata_title and metadata.get("title"):
+                    document.title = metadata["title"][:512]
+                document.author = (metadata.get("author") or "")[:255] or None
+                
+                pages = pdf_service.iter_pages(file_path, metadata["page_count"])
+                chunks_count = await self.ingest_pages(document, pages)
+        except Exception as e:
+            # Anything else (a dead worker pool, a database error) must not
+            # leave the document PROCESSING either
+            await self.db.rollback()
+            if not isinstance(e, (FileNotFoundError, PDFExtractionError)):
+                self.logger.error("pdf_ingest_error", document_id=str(document_id), error=str(e))
+            return await self._mark_failed(document, str(e))
+        
+        if not chunks_count:
+            return await self._mark_failed(document, "PDF contains no extractable text")
+        
+        return await self.process_document(document_id)
+    
+    async def ingest_pages(self, document: Document, pages: AsyncIterator[str]) -> int:
+        """
+        Fill a document's content from pages that arrive one at a time,
+        chunking each page as it arrives instead of after the last one.
+        
+        Pages are joined with blank lines; the chunks are stored with the
+        document, so process_document only has to embed them.
+        
+        Args:
+            document: Document to fill (content is replaced)
+            pages: Page texts in order
+            
+        Returns:
+            Number of chunks stored
+        """
+        chunker = self.chunking_service.stream()
+        chunks = []
+        parts: list[str] = []
+        page_offsets: list[int] = []
+        length = 0
+        
+        async with aclosing(pages):
+            async for page_text in pages:
+                if not page_text.strip():
+                    page_offsets.append(length)
+                    continue
+                
+                piece = PAGE_SEPARATOR + page_text if parts else page_text
+                page_offsets.append(length + len(piece) - len(page_text))
+                chunks.extend(chunker.feed(piece))
+                parts.append(piece)
+                length += len(piece)
+        
+        chunks.extend(chunker.finish())
+        
+        content = "".join(parts)
+        document.content = content
+        document.content_hash = compute_content_hash(content)
+        document.page_offsets = page_offsets
+        
+        self.db.add_all(
+            DocumentChunk(
+                document_id=document.id,
+                chunk_index=chunk_idx,
+                content=chunk_text,
+                start_offset=start_offset,
+                end_offset=end_offset,
+                token_count=self.chunking_service.count_tokens(chunk_text),
+            )
+            for chunk_idx, chunk_text, start_offset, end_offset in chunks
+        )
+        document.chunks_count = len(chunks)
+        await self.db.commit()
+        
+        self.logger.info(
+            "document_pages_ingested",
+            document_id=str(document.id),
+            page_count=len(page_offsets),
+            chunks_count=len(chunks),
+        )
+        
+        return len(chunks)
+    
+    async def create_documents(
+        self,
+        source_id: UUID,
+        user_id: UUID,
+        items: list[dict],
+    ) -> tuple[list[Document], int]:
+        """
+        Create many documents with one duplicate check and one commit.
+        
+        Items are duplicates if their content already exists in the source
+        or their canonical URL already exists in the user's library.
+        
+        Args:
+            source_id: Source ID
+            user_id: Owner of the source (denormalised onto the documents)
+            items: Keyword arguments for each document (title, content and
+                optionally url, author, summary, published_at, raw_fetch_id)
+            
+        Returns:
+            Tuple of (created_documents, duplicates_skipped)
+        """
+        # Hash once; later items with the same content or URL are duplicates too
+        hashed: dict[str, dict] = {}
+        canonical_urls: dict[str, str] = {}
+        duplicates = 0
+        for item in items:
+            content_hash = compute_content_hash(item.get("content") or "")
+            if not content_hash:
+                continue
+            canonical_url = _canonical_url(item.get("url"))
+            if content_hash in hashed or canonical_url in canonical_urls:
+                duplicates += 1
+                continue
+            hashed[content_hash] = item
+            if canonical_url:
+                canonical_urls[canonical_url] = content_hash
+        
+        if not hashed:
+            return [], duplicates
+        
+        # Check for duplicates within THIS source (user isolation)
+        result = await self.db.execute(
+            select(Document.content_hash).where(
+                Document.source_id == source_id,
+                Document.content_hash.in_(list(hashed)),
+            )
+        )
+        existing = set(result.scalars().all())
+        
+        # ... and for URLs already anywhere in the user's library
+        if canonical_urls:
+            result = await self.db.execute(
+                select(Document.canonical_url).where(
+                    Document.user_id == user_id,
+                    Document.canonical_url.in_(list(canonical_urls)),
+                )
+            )
+            existing.update(canonical_urls[url] for url in result.scalars().all())
+        
+        url_of = {content_hash: url for url, content_hash in canonical_urls.items()}
+        while True:
+            documents = [
+                Document(
+                    source_id=source_id,
+                    user_id=user_id,
+                    content_hash=content_hash,
+                    canonical_url=url_of.get(content_hash),
+                    status=DocumentStatus.PENDING,
+                    **item,
+                )
+                for content_hash, item in hashed.items()
+                if content_hash not in existing
+            ]
+            try:
+                # Savepoint, so a conflict keeps the caller's pending rows
+                async with self.db.begin_nested():
+                    self.db.add_all(documents)
+                break
+            except IntegrityError:
+                # A concurrent import stored some of these URLs first: skip them
+                result = await self.db.execute(
+                    select(Document.canonical_url).where(
+                        Document.user_id == user_id,
+                        Document.canonical_url.in_(list(canonical_urls)),
+                    )
+                )
+                conflicts = {canonical_urls[url] for url in result.scalars().all()} - existing
+                if not conflicts:
+                    raise
+                existing.update(conflicts)
+        
+        duplicates += len(existing)
+        await self.db.commit()
+        
+        self.logger.info(
+            "documents_created",
+            source_id=str(source_id),
+            created=len(documents),
+            duplicates=duplicates,
+        )
+        
+        return documents, duplicates
+    
     async def process_document(
         self,
         document_id: UUID
@@ -131,7 +509,11 @@ class IngestionOrchestrator:
         """
         try:
             # Fetch document
-            stmt = select(Document).where(Document.id == document_id)
+            stmt = (
+                select(Document)
+                .where(Document.id == document_id)
+                .options(undefer(Document.content))
+            )
             result = await self.db.execute(stmt)
             document = result.scalar_one_or_none()
             
@@ -139,47 +521,30 @@ class IngestionOrchestrator:
                 return False, 0, "Document not found"
             
             if not document.content:
-                document.status = DocumentStatus.FAILED
-                await self.db.commit()
-                return False, 0, "Document has no content"
+                return await self._mark_failed(document, "Document has no content")
             
             # Update status to processing
             document.status = DocumentStatus.PROCESSING
+            document.processing_error = None
             await self.db.commit()
             
-            # Chunk the document
-            chunks = list(self.chunking_service.chunk_text(document.content))
-            
-            if not chunks:
-                document.status = DocumentStatus.FAILED
-                await self.db.commit()
-                return False, 0, "No chunks generated (content may be too short)"
-            
-            # Create chunk records
-            chunk_objects = []
-            chunk_texts = []
-            
-            for chunk_idx, chunk_text, start_offset, end_offset in chunks:
-                token_count = self.chunking_service.count_tokens(chunk_text)
-                
-                chunk_obj = DocumentChunk(
-                    document_id=document_id,
-                    chunk_index=chunk_idx,
-                    content=chunk_text,
-                    start_offset=start_offset,
-                    end_offset=end_offset,
-                    token_count=token_count,
+            if document.chunks_count:
+                # Chunked while the document was ingested; only embed
+                result = await self.db.execute(
+                    select(DocumentChunk)
+                    .where(DocumentChunk.document_id == document_id)
+                    .order_by(DocumentChunk.chunk_index)
                 )
-                chunk_objects.append(chunk_obj)
-                chunk_texts.append(chunk_text)
+                chunk_objects = list(result.scalars().all())
+            else:
+                chunk_objects = await self._create_chunks(document)
             
-            # Save chunks
-            self.db.add_all(chunk_objects)
-            await self.db.commit()
+            if not chunk_objects:
+                return await self._mark_failed(
+                    document, "No chunks generated (content may be too short)"
+                )
             
-            # Refresh to get IDs
-            for chunk_obj in chunk_objects:
-                await self.db.refresh(chunk_obj)
+            chunk_texts = [chunk_obj.content for chunk_obj in chunk_objects]
             
             # Generate embeddings (lazy init)
             try:
@@ -205,30 +570,32 @@ class IngestionOrchestrator:
                 document.status = DocumentStatus.READY
                 await self.db.commit()
                 
+                # New searchable chunks invalidate the owner's cached chat answers
+                get_answer_cache().invalidate(document.user_id)
+                
                 self.logger.info(
                     "document_processed",
                     document_id=str(document_id),
-                    chunks_count=len(chunks),
+                    chunks_count=len(chunk_objects),
                     embeddings_count=len(embeddings)
                 )
                 
-                return True, len(chunks), None
+                return True, len(chunk_objects), None
             
             except Exception as e:
                 # Embedding failed, but keep chunks
-                document.status = DocumentStatus.FAILED
-                await self.db.commit()
-                
-                error_msg = f"Embedding generation failed: {str(e)}"
                 self.logger.error(
                     "embedding_error",
                     document_id=str(document_id),
                     error=str(e)
                 )
-                return False, len(chunks), error_msg
+                return await self._mark_failed(
+                    document, f"Embedding generation failed: {str(e)}", len(chunk_objects)
+                )
         
         except Exception as e:
             await self.db.rollback()
+            error_msg = f"Document processing failed: {str(e)}"
             
             # Try to update status
             try:
@@ -237,10 +604,50 @@ class IngestionOrchestrator:
                 document = result.scalar_one_or_none()
                 if document:
                     document.status = DocumentStatus.FAILED
+                    document.processing_error = error_msg
                     await self.db.commit()
             except:
                 pass
             
-            error_msg = f"Document processing failed: {str(e)}"
             self.logger.error("processing_error", document_id=str(document_id), error=str(e))
             return False, 0, error_msg
+    
+    async def _create_chunks(self, document: Document) -> list[DocumentChunk]:
+        """Chunk a document's content and store the chunks."""
+        chunk_objects = [
+            DocumentChunk(
+                document_id=document.id,
+                chunk_index=chunk_idx,
+                content=chunk_text,
+                start_offset=start_offset,
+                end_offset=end_offset,
+                token_count=self.chunking_service.count_tokens(chunk_text),
+            )
+            for chunk_idx, chunk_text, start_offset, end_offset
+            in self.chunking_service.chunk_text(document.content)
+        ]
+        if not chunk_objects:
+            return []
+        
+        # Save chunks
+        self.db.add_all(chunk_objects)
+        document.chunks_count = len(chunk_objects)
+        await self.db.commit()
+        
+        # Refresh to get IDs
+        for chunk_obj in chunk_objects:
+            await self.db.refresh(chunk_obj)
+        
+        return chunk_objects
+    
+    async def _mark_failed(
+        self,
+        document: Document,
+        error: str,
+        chunks_count: int = 0,
+    ) -> tuple[bool, int, Optional[str]]:
+        """Mark a document FAILED with the reason shown to clients."""
+        document.status = DocumentStatus.FAILED
+        document.processing_error = error
+        await self.db.commit()
+        return False, chunks_count, error
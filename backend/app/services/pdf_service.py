@@ -1,93 +1,118 @@
 """
 PDF text extraction service using PyMuPDF.
+
+Pages are extracted in parallel worker processes, a range of pages per
+task, and streamed back in page order so they can be chunked while later
+pages are still being extracted. PyMuPDF documents cannot be shared
+between processes, so each worker opens a file once and keeps it open for
+the further ranges it gets from that file.
 """
+import asyncio
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import AsyncIterator
 
 import fitz  # PyMuPDF
 import structlog
 
+from app.core.config import get_settings
+
+settings = get_settings()
 logger = structlog.get_logger()
 
 
+class PDFExtractionError(Exception):
+    """Raised when a PDF cannot be opened or its pages cannot be read."""
+
+
+# Documents kept open per worker process, so concurrent extractions of a
+# few files do not keep reopening each other's
+WORKER_OPEN_DOCUMENTS = 4
+
+# (path, mtime, size) -> open document, least recently used first
+_worker_documents: "OrderedDict[tuple[str, int, int], fitz.Document]" = OrderedDict()
+
+
+def _open_in_worker(file_path: str) -> "fitz.Document":
+    """Open a PDF in this worker, reusing the open document for the same file."""
+    stat = os.stat(file_path)
+    # mtime and size tell a reused temporary file name from the same file
+    identity = (file_path, stat.st_mtime_ns, stat.st_size)
+    doc = _worker_documents.get(identity)
+    if doc is not None:
+        _worker_documents.move_to_end(identity)
+        return doc
+
+    doc = fitz.open(file_path)
+    _worker_documents[identity] = doc
+    while len(_worker_documents) > WORKER_OPEN_DOCUMENTS:
+        _worker_documents.popitem(last=False)[1].close()
+    return doc
+
+
+def _extract_page_range(file_path: str, start: int, stop: int) -> list[str]:
+    """
+    Extract the text of pages [start, stop) (runs in a worker process).
+
+    Returns:
+        One string per page, empty for pages without text
+    """
+    doc = _open_in_worker(file_path)
+    return [doc[page_num].get_text() for page_num in range(start, stop)]
+
+
+@lru_cache
+def get_pdf_executor() -> ProcessPoolExecutor:
+    """Get the process pool shared by all PDF extractions."""
+    return ProcessPoolExecutor(max_workers=settings.pdf_extract_workers or None)
+
+
+def shutdown_pdf_executor() -> None:
+    """Stop the PDF worker processes, if any were started (app shutdown)."""
+    if get_pdf_executor.cache_info().currsize:
+        get_pdf_executor().shutdown(wait=False, cancel_futures=True)
+        get_pdf_executor.cache_clear()
+
+
 class PDFService:
     """Handles PDF text extraction."""
-    
+
     def __init__(self):
         self.logger = logger.bind(service="pdf")
-    
-    def extract_text(self, file_path: Path) -> tuple[bool, Optional[str], Optional[str]]:
+
+    async def read_info(self, file_path: Path) -> dict:
         """
-        Extract text content from PDF file.
-        
+        Open a PDF once and read its metadata and page count.
+
         Args:
             file_path: Path to PDF file
-            
+
         Returns:
-            Tuple of (success, extracted_text, error_message)
+            Dictionary with metadata (title, author, etc.) and page_count
+
+        Raises:
+            PDFExtractionError: If the file is missing or not a readable PDF
         """
         if not file_path.exists():
-            return False, None, f"PDF file not found: {file_path}"
-        
+            raise PDFExtractionError(f"PDF file not found: {file_path}")
+
         if file_path.suffix.lower() != ".pdf":
-            return False, None, f"File is not a PDF: {file_path}"
-        
+            raise PDFExtractionError(f"File is not a PDF: {file_path}")
+
         try:
-            doc = fitz.open(str(file_path))
-            
-            text_content = []
-            page_count = doc.page_count
-            
-            for page_num in range(page_count):
-                page = doc[page_num]
-                page_text = page.get_text()
-                if page_text.strip():
-                    text_content.append(page_text)
-            
-            doc.close()
-            
-            if not text_content:
-                self.logger.warning("pdf_empty", file_path=str(file_path))
-                return False, None, "PDF contains no extractable text"
-            
-            full_text = "\n\n".join(text_content)
-            
-            self.logger.info(
-                "pdf_extracted",
-                file_path=str(file_path),
-                page_count=page_count,
-                text_length=len(full_text)
-            )
-            
-            return True, full_text, None
-        
+            return await asyncio.to_thread(self._read_info_sync, file_path)
         except fitz.FileDataError as e:
-            error_msg = f"Corrupted or invalid PDF file: {str(e)}"
             self.logger.error("pdf_corrupt", file_path=str(file_path), error=str(e))
-            return False, None, error_msg
-        
-        except Exception as e:
-            error_msg = f"Failed to extract PDF text: {str(e)}"
-            self.logger.error("pdf_extraction_error", file_path=str(file_path), error=str(e))
-            return False, None, error_msg
-    
-    def get_metadata(self, file_path: Path) -> dict:
-        """
-        Extract PDF metadata.
-        
-        Args:
-            file_path: Path to PDF file
-            
-        Returns:
-            Dictionary with metadata (title, author, etc.)
-        """
-        metadata = {}
-        
-        try:
-            doc = fitz.open(str(file_path))
-            meta = doc.metadata
-            
-            metadata = {
+            raise PDFExtractionError(f"Corrupted or invalid PDF file: {str(e)}") from e
+
+    def _read_info_sync(self, file_path: Path) -> dict:
+        with fitz.open(str(file_path)) as doc:
+            meta = doc.metadata or {}
+            return {
                 "title": meta.get("title", ""),
                 "author": meta.get("author", ""),
                 "subject": meta.get("subject", ""),
@@ -96,10 +121,60 @@ class PDFService:
                 "producer": meta.get("producer", ""),
                 "page_count": doc.page_count,
             }
-            
-            doc.close()
-        
-        except Exception as e:
-            self.logger.warning("pdf_metadata_error", file_path=str(file_path), error=str(e))
-        
-        return metadata
+
+    async def iter_pages(self, file_path: Path, page_count: int) -> AsyncIterator[str]:
+        """
+        Extract page text in parallel, yielding pages in order.
+
+        All page ranges are submitted up front; each page is yielded as soon
+        as it and every page before it are done. Closing the iterator early
+        cancels ranges that have not started.
+
+        Args:
+            file_path: Path to PDF file
+            page_count: Number of pages (from read_info)
+
+        Yields:
+            Text of each page, empty for pages without text
+
+        Raises:
+            PDFExtractionError: If a page range cannot be extracted
+        """
+        loop = asyncio.get_running_loop()
+        executor = get_pdf_executor()
+        step = max(1, settings.pdf_pages_per_task)
+
+        ranges = [
+            loop.run_in_executor(
+                executor,
+                _extract_page_range,
+                str(file_path),
+                start,
+                min(start + step, page_count),
+            )
+            for start in range(0, page_count, step)
+        ]
+
+        try:
+            for pending in ranges:
+                try:
+                    pages = await pending
+                except BrokenProcessPool:
+                    # A worker died; start a fresh pool for later extractions
+                    get_pdf_executor.cache_clear()
+                    raise
+                except Exception as e:
+                    self.logger.error("pdf_extraction_error", file_path=str(file_path), error=str(e))
+                    raise PDFExtractionError(f"Failed to extract PDF text: {str(e)}") from e
+                for page_text in pages:
+                    yield page_text
+        finally:
+            for pending in ranges:
+                pending.cancel()
+
+        self.logger.info(
+            "pdf_extracted",
+            file_path=str(file_path),
+            page_count=page_count,
+            tasks=len(ranges),
+        )
@@ -0,0 +1,99 @@
+"""
+Raw fetch archive: fetched page bodies kept for re-extraction.
+
+Bodies are zstd-compressed and stored once per SHA-256 under
+raw_archive_dir/<aa>/<bb>/<sha256>.zst; raw_fetches rows index them and
+documents link to the body they were extracted from.
+"""
+import asyncio
+import hashlib
+import os
+from pathlib import Path
+from uuid import UUID, uuid4
+
+import structlog
+import zstandard
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.models.models import RawFetch
+
+settings = get_settings()
+logger = structlog.get_logger()
+
+
+def archive_path(sha256: str) -> Path:
+    """Get the file path of an archived body."""
+    return Path(settings.raw_archive_dir) / sha256[:2] / sha256[2:4] / f"{sha256}.zst"
+
+
+def read_archived(sha256: str) -> bytes:
+    """Read and decompress an archived body (blocking)."""
+    return zstandard.ZstdDecompressor().decompress(archive_path(sha256).read_bytes())
+
+
+def _write_archived(sha256: str, body: bytes) -> int:
+    """Compress and write a body unless it is already stored (blocking)."""
+    path = archive_path(sha256)
+    if path.exists():
+        return path.stat().st_size
+
+    compressed = zstandard.ZstdCompressor(level=settings.raw_archive_zstd_level).compress(body)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Write then rename so readers never see a partial file
+    tmp_path = path.with_suffix(f".{uuid4().hex}.tmp")
+    tmp_path.write_bytes(compressed)
+    os.replace(tmp_path, path)
+    return len(compressed)
+
+
+class RawArchive:
+    """Stores fetched bodies and their raw_fetches index rows."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.logger = logger.bind(service="raw_archive")
+
+    async def store(self, html: str) -> UUID:
+        """
+        Archive a fetched page body (deduplicated by content).
+
+        The row is flushed with the caller's commit.
+
+        Args:
+            html: Decoded page HTML (stored as UTF-8)
+
+        Returns:
+            raw_fetches ID to link from documents
+        """
+        body = html.encode("utf-8")
+        sha256 = hashlib.sha256(body).hexdigest()
+
+        existing = await self.db.scalar(select(RawFetch.id).where(RawFetch.sha256 == sha256))
+        if existing is not None:
+            return existing
+
+        stored_bytes = await asyncio.to_thread(_write_archived, sha256, body)
+
+        stmt = (
+            insert(RawFetch)
+            .values(
+                id=uuid4(),
+                sha256=sha256,
+                size_bytes=len(body),
+                stored_bytes=stored_bytes,
+            )
+            .on_conflict_do_nothing(index_elements=[RawFetch.sha256])
+        )
+        await self.db.execute(stmt)
+
+        self.logger.info(
+            "raw_fetch_archived",
+            sha256=sha256,
+            size_bytes=len(body),
+            stored_bytes=stored_bytes,
+        )
+        # Re-select: a concurrent writer may have inserted the row first
+        return await self.db.scalar(select(RawFetch.id).where(RawFetch.sha256 == sha256))
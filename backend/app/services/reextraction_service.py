@@ -0,0 +1,150 @@
+"""
+Batch re-extraction of archived pages.
+
+Re-runs content extraction over the raw fetch archive (no network), in
+parallel worker processes, and re-chunks only documents whose extracted
+text changed. Run after upgrading trafilatura or tuning extraction:
+
+    cd backend && python -m app.services.reextraction_service
+"""
+import argparse
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+from uuid import UUID
+
+import structlog
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.models.models import Document, RawFetch
+from app.services.hashing import compute_content_hash
+from app.services.ingestion_orchestrator import IngestionOrchestrator
+from app.services.raw_archive import read_archived
+from app.services.url_service import URLService
+
+settings = get_settings()
+logger = structlog.get_logger()
+
+
+def _reextract(sha256: str, url: Optional[str]) -> tuple[bool, Optional[str], Optional[str]]:
+    """
+    Decompress an archived page and extract its text (runs in a worker process).
+
+    Returns:
+        Tuple of (success, content, error_message)
+    """
+    html = read_archived(sha256).decode("utf-8")
+    success, _, content, error = URLService().extract_content_sync(html, url or "")
+    return success, content, error
+
+
+class ReextractionResult:
+    """Counts from a re-extraction run."""
+
+    def __init__(self):
+        self.scanned = 0
+        self.changed = 0
+        self.unchanged = 0
+        self.failed = 0
+
+
+class ReextractionService:
+    """Re-extracts archived documents and re-chunks the ones that changed."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.orchestrator = IngestionOrchestrator(db)
+        self.logger = logger.bind(service="reextraction")
+
+    async def run(
+        self,
+        batch_size: int = 50,
+        workers: Optional[int] = None,
+    ) -> ReextractionResult:
+        """
+        Re-extract every document linked to an archived page.
+
+        Args:
+            batch_size: Documents extracted in parallel per round
+            workers: Worker processes (default: one per CPU)
+
+        Returns:
+            ReextractionResult
+        """
+        result = ReextractionResult()
+        loop = asyncio.get_running_loop()
+        last_id: Optional[UUID] = None
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            while True:
+                stmt = (
+                    select(Document.id, Document.url, Document.content_hash, RawFetch.sha256)
+                    .join(RawFetch, Document.raw_fetch_id == RawFetch.id)
+                    .order_by(Document.id)
+                    .limit(batch_size)
+                )
+                if last_id is not None:
+                    stmt = stmt.where(Document.id > last_id)
+                rows = (await self.db.execute(stmt)).all()
+                if not rows:
+                    break
+                last_id = rows[-1].id
+
+                outcomes = await asyncio.gather(
+                    *(loop.run_in_executor(pool, _reextract, row.sha256, row.url) for row in rows),
+                    return_exceptions=True,
+                )
+
+                for row, outcome in zip(rows, outcomes):
+                    result.scanned += 1
+                    if isinstance(outcome, BaseException) or not outcome[0]:
+                        result.failed += 1
+                        self.logger.warning(
+                            "reextraction_failed",
+                            document_id=str(row.id),
+                            error=str(outcome if isinstance(outcome, BaseException) else outcome[2]),
+                        )
+                        continue
+
+                    content = outcome[1]
+                    content_hash = compute_content_hash(content)
+                    if content_hash == row.content_hash:
+                        result.unchanged += 1
+                        continue
+
+                    await self.orchestrator.update_document(row.id, content)
+                    result.changed += 1
+
+                self.logger.info(
+                    "reextraction_progress",
+                    scanned=result.scanned,
+                    changed=result.changed,
+                    failed=result.failed,
+                )
+
+        return result
+
+
+async def main(batch_size: int, workers: Optional[int]) -> None:
+    from app.db.session import async_session_maker
+
+    async with async_session_maker() as db:
+        result = await ReextractionService(db).run(batch_size=batch_size, workers=workers)
+
+    logger.info(
+        "reextraction_finished",
+        scanned=result.scanned,
+        changed=result.changed,
+        unchanged=result.unchanged,
+        failed=result.failed,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-extract archived documents")
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+    asyncio.run(main(args.batch_size, args.workers))
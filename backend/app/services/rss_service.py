@@ -1,15 +1,35 @@
 """
 RSS feed parsing and article extraction service.
 """
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from datetime import datetime
 from typing import Optional
 from urllib.parse import urlparse
 
 import feedparser
+import httpx
 import structlog
+from lxml import etree
 
+from app.core.config import get_settings
+from app.core.http import get_http_client
+from app.core.metrics import get_metrics
+
+settings = get_settings()
 logger = structlog.get_logger()
 
+ATOM_NAMESPACE = "http://www.w3.org/2005/Atom"
+
+# Envelopes for feeding one streamed entry to feedparser; the serialised
+# entry carries its own namespace declarations
+RSS_ENVELOPE = '<rss version="2.0"><channel>{}</channel></rss>'
+ATOM_ENVELOPE = '<feed xmlns="http://www.w3.org/2005/Atom">{}</feed>'
+
+# Root elements of RSS 2.0, Atom and RSS 1.0 (RDF) documents
+FEED_ROOT_TAGS = ("rss", "feed", "RDF")
+
 
 class RSSEntry:
     """Parsed RSS feed entry."""
@@ -22,6 +42,8 @@ class RSSEntry:
         summary: Optional[str],
         author: Optional[str],
         published_at: Optional[datetime],
+        guid: Optional[str] = None,
+        updated_at: Optional[datetime] = None,
     ):
         self.title = title
         self.url = url
@@ -29,6 +51,88 @@ class RSSEntry:
         self.summary = summary
         self.author = author
         self.published_at = published_at
+        self.guid = guid
+        self.updated_at = updated_at
+    
+    @property
+    def key(self) -> Optional[str]:
+        """Stable identity of the entry within its feed (GUID, else link)."""
+        return self.guid or self.url
+
+
+class FeedFetchResult:
+    """Outcome of a (conditional) feed fetch."""
+    
+    def __init__(
+        self,
+        success: bool,
+        entries: list[RSSEntry],
+        error: Optional[str] = None,
+        not_modified: bool = False,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ):
+        self.success = success
+        self.entries = entries
+        self.error = error
+        self.not_modified = not_modified
+        self.etag = etag
+        self.last_modified = last_modified
+
+
+class FeedParseError(Exception):
+    """Raised when a feed body cannot be parsed."""
+
+
+class FeedStream:
+    """An open feed response whose entries are parsed on demand."""
+    
+    def __init__(
+        self,
+        service: "RSSService",
+        response: httpx.Response,
+        not_modified: bool = False,
+    ):
+        self.not_modified = not_modified
+        self.etag = response.headers.get("etag")
+        self.last_modified = response.headers.get("last-modified")
+        self.bytes_received = 0
+        self._service = service
+        self._response = response
+    
+    async def _chunks(self, head: bytes, rest: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        yield head
+        async for chunk in rest:
+            self.bytes_received += len(chunk)
+            yield chunk
+    
+    async def entries(self) -> AsyncIterator[RSSEntry]:
+        """
+        Iterate the feed's entries in document order.
+        
+        Small feeds are buffered and parsed with feedparser. Once the body
+        passes rss_stream_parse_min_bytes, parsing switches to an incremental
+        XML parser that yields entries while the rest is still downloading.
+        """
+        if self.not_modified:
+            return
+        
+        threshold = settings.rss_stream_parse_min_bytes
+        body = bytearray()
+        chunks = self._response.aiter_bytes()
+        async for chunk in chunks:
+            body += chunk
+            self.bytes_received += len(chunk)
+            if len(body) >= threshold:
+                get_metrics().incr("rss_stream_parses")
+                async for entry in self._service._parse_streaming(
+                    self._chunks(bytes(body), chunks), self._response
+                ):
+                    yield entry
+                return
+        
+        for entry in await self._service._parse_buffered(bytes(body), self._response):
+            yield entry
 
 
 class RSSService:
@@ -63,74 +167,271 @@ class RSSService:
         Returns:
             Tuple of (success, entries, error_message)
         """
+        result = await self.fetch_feed_conditional(feed_url)
+        return result.success, result.entries, result.error
+    
+    async def fetch_feed_conditional(
+        self,
+        feed_url: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> FeedFetchResult:
+        """
+        Fetch and parse RSS feed, revalidating against stored HTTP validators.
+        
+        Args:
+            feed_url: URL of the RSS feed
+            etag: ETag from the previous response (sent as If-None-Match)
+            last_modified: Last-Modified from the previous response
+                (sent as If-Modified-Since)
+            
+        Returns:
+            FeedFetchResult; on 304 Not Modified no parsing is done
+        """
         if not self.validate_rss_url(feed_url):
-            return False, [], "Invalid RSS feed URL format"
+            return FeedFetchResult(False, [], "Invalid RSS feed URL format")
         
         try:
-            # feedparser is synchronous, but it's fast enough for MVP
-            feed = feedparser.parse(feed_url)
-            
-            # Check for feed errors
-            if hasattr(feed, "bozo") and feed.bozo:
-                error_msg = getattr(feed, "bozo_exception", "Unknown parsing error")
-                self.logger.warning(
-                    "rss_feed_parse_warning",
-                    url=feed_url,
-                    error=str(error_msg)
-                )
-                # Continue anyway if we got some entries
-                if not feed.entries:
-                    return False, [], f"Failed to parse feed: {error_msg}"
-            
-            entries = []
-            for entry in feed.entries:
-                # Extract title (required)
-                title = entry.get("title", "Untitled")
-                
-                # Extract URL
-                url = entry.get("link")
-                
-                # Extract content (try multiple fields)
-                content = None
-                if hasattr(entry, "content") and entry.content:
-                    content = entry.content[0].value
-                elif hasattr(entry, "description"):
-                    content = entry.description
-                elif hasattr(entry, "summary"):
-                    content = entry.summary
-                
-                # Extract summary
-                summary = entry.get("summary")
-                
-                # Extract author
-                author = entry.get("author")
-                
-                # Extract published date
-                published_at = None
-                if hasattr(entry, "published_parsed") and entry.published_parsed:
-                    try:
-                        published_at = datetime(*entry.published_parsed[:6])
-                    except (TypeError, ValueError):
-                        pass
-                
-                entries.append(RSSEntry(
-                    title=title,
-                    url=url,
-                    content=content,
-                    summary=summary,
-                    author=author,
-                    published_at=published_at,
-                ))
+            async with self.open_feed(feed_url, etag, last_modified) as feed:
+                if feed.not_modified:
+                    return FeedFetchResult(
+                        True,
+                        [],
+                        not_modified=True,
+                        etag=etag,
+                        last_modified=last_modified,
+                    )
+                entries = [entry async for entry in feed.entries()]
             
             self.logger.info(
                 "rss_feed_fetched",
                 url=feed_url,
-                entry_count=len(entries)
+                entry_count=len(entries),
+                bytes=feed.bytes_received
             )
             
-            return True, entries, None
+            return FeedFetchResult(
+                True,
+                entries,
+                etag=feed.etag,
+                last_modified=feed.last_modified,
+            )
         
         except Exception as e:
             error_msg = f"Failed to fetch RSS feed: {str(e)}"
             self.logger.error("rss_fetch_error", url=feed_url, error=str(e))
-            return False, [], error_msg
+            return FeedFetchResult(False, [], error_msg)
+    
+    @asynccontextmanager
+    async def open_feed(
+        self,
+        feed_url: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> AsyncIterator["FeedStream"]:
+        """
+        Open a feed response for incremental consumption.
+        
+        Entries are parsed as they are iterated; leaving the context early
+        closes the response without downloading the rest of the body.
+        
+        Args:
+            feed_url: URL of the RSS feed
+            etag: ETag from the previous response (sent as If-None-Match)
+            last_modified: Last-Modified from the previous response
+                (sent as If-Modified-Since)
+            
+        Yields:
+            FeedStream (with not_modified set on 304)
+            
+        Raises:
+            ValueError: If the URL is invalid
+            httpx.HTTPError: On transport errors or non-2xx responses
+            FeedParseError: If the body cannot be parsed as a feed
+        """
+        if not self.validate_rss_url(feed_url):
+            raise ValueError("Invalid RSS feed URL format")
+        
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        
+        metrics = get_metrics()
+        feed = None
+        consuming = False
+        failed = False
+        
+        try:
+            async with get_http_client().stream("GET", feed_url, headers=headers) as response:
+                if response.status_code == 304:
+                    metrics.incr("rss_fetch_total", outcome="not_modified")
+                    self.logger.info("rss_feed_not_modified", url=feed_url)
+                    consuming = True
+                    yield FeedStream(self, response, not_modified=True)
+                    return
+                
+                response.raise_for_status()
+                feed = FeedStream(self, response)
+                consuming = True
+                yield feed
+        except Exception as e:
+            # Errors raised while the caller consumes entries are only ours
+            # if they come from the download or the parser
+            failed = not consuming or isinstance(e, (httpx.HTTPError, FeedParseError))
+            if failed:
+                metrics.incr("rss_fetch_total", outcome="error")
+            raise
+        finally:
+            if feed is not None and not failed:
+                metrics.incr("rss_fetch_total", outcome="ok")
+            if feed is not None:
+                metrics.incr("rss_bytes_downloaded", feed.bytes_received)
+    
+    async def _parse_buffered(
+        self, body: bytes, response: httpx.Response
+    ) -> list[RSSEntry]:
+        """Parse a complete feed body with feedparser."""
+        # Parsing is CPU-bound, keep it off the event loop
+        feed = await asyncio.to_thread(
+            feedparser.parse, body, response_headers=self._feedparser_headers(response)
+        )
+        
+        # Check for feed errors
+        if hasattr(feed, "bozo") and feed.bozo:
+            error_msg = getattr(feed, "bozo_exception", "Unknown parsing error")
+            self.logger.warning(
+                "rss_feed_parse_warning",
+                url=str(response.url),
+                error=str(error_msg)
+            )
+            # Continue anyway if we got some entries
+            if not feed.entries:
+                raise FeedParseError(f"Failed to parse feed: {error_msg}")
+        
+        return [self._parse_entry(entry) for entry in feed.entries]
+    
+    async def _parse_streaming(
+        self, chunks: AsyncIterator[bytes], response: httpx.Response
+    ) -> AsyncIterator[RSSEntry]:
+        """
+        Parse a feed incrementally, yielding entries as their elements close.
+        
+        Processed elements are cleared so memory stays bounded by one entry.
+        Each chunk is parsed in a worker thread, and every closed entry goes
+        through feedparser, so entries (keys, titles, sanitised content) are
+        identical to the buffered path's.
+        
+        Like feedparser, the parser tolerates malformed XML (stray "&",
+        undefined entities): it recovers and keeps the entries it can read.
+        """
+        parser = etree.XMLPullParser(
+            events=("end",),
+            resolve_entities=False,
+            no_network=True,
+            huge_tree=True,
+            recover=True,
+        )
+        headers = self._feedparser_headers(response)
+        try:
+            async for chunk in chunks:
+                for entry in await asyncio.to_thread(self._feed_chunk, parser, chunk, headers):
+                    yield entry
+            root = await asyncio.to_thread(parser.close)
+        except etree.XMLSyntaxError as e:
+            raise FeedParseError(f"Failed to parse feed: {e}") from e
+        
+        # A recovering parser may close the last entry only at the end
+        for entry in await asyncio.to_thread(self._read_entries, parser, headers):
+            yield entry
+        
+        # Recovery parses anything; only feed documents are accepted
+        if root is None or etree.QName(root).localname not in FEED_ROOT_TAGS:
+            raise FeedParseError("Failed to parse feed: not an RSS or Atom document")
+    
+    def _feed_chunk(
+        self, parser: etree.XMLPullParser, chunk: bytes, headers: dict[str, str]
+    ) -> list[RSSEntry]:
+        """Feed one chunk to the pull parser and convert the entries it closed."""
+        parser.feed(chunk)
+        return self._read_entries(parser, headers)
+    
+    def _read_entries(
+        self, parser: etree.XMLPullParser, headers: dict[str, str]
+    ) -> list[RSSEntry]:
+        """Convert the entries the pull parser closed since the last read."""
+        entries = []
+        for _, element in parser.read_events():
+            if not isinstance(element.tag, str):
+                continue
+            qname = etree.QName(element)
+            if qname.localname not in ("item", "entry"):
+                continue
+            
+            # Re-parse the lone entry in a minimal envelope of its feed type
+            item = etree.tostring(element, encoding="unicode", with_tail=False)
+            envelope = ATOM_ENVELOPE if qname.namespace == ATOM_NAMESPACE else RSS_ENVELOPE
+            feed = feedparser.parse(envelope.format(item), response_headers=headers)
+            entries.extend(self._parse_entry(entry) for entry in feed.entries)
+            
+            element.clear(keep_tail=False)
+            parent = element.getparent()
+            if parent is not None:
+                while element.getprevious() is not None:
+                    del parent[0]
+        return entries
+    
+    def _feedparser_headers(self, response: httpx.Response) -> dict[str, str]:
+        """Response headers feedparser uses for encoding and relative links."""
+        return {
+            "content-type": response.headers.get("content-type", ""),
+            "content-location": str(response.url),
+        }
+    
+    def _parse_entry(self, entry) -> RSSEntry:
+        """Convert a feedparser entry into an RSSEntry."""
+        # Extract title (required)
+        title = entry.get("title", "Untitled")
+        
+        # Extract URL
+        url = entry.get("link")
+        
+        # Extract content (try multiple fields)
+        content = None
+        if hasattr(entry, "content") and entry.content:
+            content = entry.content[0].value
+        elif hasattr(entry, "description"):
+            content = entry.description
+        elif hasattr(entry, "summary"):
+            content = entry.summary
+        
+        # Extract summary
+        summary = entry.get("summary")
+        
+        # Extract author
+        author = entry.get("author")
+        
+        # Extract published and updated dates
+        published_at = self._parse_time(entry.get("published_parsed"))
+        updated_at = self._parse_time(entry.get("updated_parsed"))
+        
+        return RSSEntry(
+            title=title,
+            url=url,
+            content=content,
+            summary=summary,
+            author=author,
+            published_at=published_at,
+            guid=entry.get("id"),
+            updated_at=updated_at,
+        )
+    
+    def _parse_time(self, parsed) -> Optional[datetime]:
+        """Convert a feedparser time tuple into a datetime."""
+        if not parsed:
+            return None
+        try:
+            return datetime(*parsed[:6])
+        except (TypeError, ValueError):
+            return None
@@ -0,0 +1,116 @@
+"""
+Short-lived cache of parsed RSSHub feeds.
+
+Feeds are keyed by RSSHub route, so importing several URLs that map to the
+same channel costs one upstream fetch. Concurrent misses for a route share a
+single in-flight fetch.
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Optional
+
+from app.core.config import get_settings
+from app.core.metrics import get_metrics
+from app.services.rss_service import FeedFetchResult, RSSEntry
+
+settings = get_settings()
+
+
+@dataclass
+class CachedFeed:
+    """A parsed feed and an index of its entries by link."""
+
+    entries: list[RSSEntry]
+    fetched_at: float
+    by_url: dict[str, RSSEntry] = field(default_factory=dict)
+
+    def __post_init__(self):
+        # First occurrence wins, matching the old linear scan
+        for entry in self.entries:
+            if entry.url:
+                self.by_url.setdefault(entry.url.strip(), entry)
+
+    def find(self, url: str) -> Optional[RSSEntry]:
+        """Get the entry linking to a URL, if any."""
+        return self.by_url.get(url.strip())
+
+
+class RSSHubFeedCache:
+    """In-process LRU of parsed RSSHub feeds with single-flight loading."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._feeds: OrderedDict[str, CachedFeed] = OrderedDict()
+        self._loading: dict[str, asyncio.Task] = {}
+
+    async def get(
+        self,
+        route: str,
+        load: Callable[[], Awaitable[FeedFetchResult]],
+    ) -> tuple[Optional[CachedFeed], Optional[str]]:
+        """
+        Get a route's parsed feed, loading it on a miss.
+
+        Only successful, non-empty fetches are cached; failures are shared
+        with concurrent waiters but not remembered.
+
+        Args:
+            route: RSSHub route (cache key)
+            load: Fetches the route's feed
+
+        Returns:
+            Tuple of (cached_feed, error_message)
+        """
+        metrics = get_metrics()
+
+        feed = self._feeds.get(route)
+        if feed is not None:
+            if time.monotonic() - feed.fetched_at <= self.ttl_seconds:
+                self._feeds.move_to_end(route)
+                metrics.incr("rsshub_cache", outcome="hit")
+                return feed, None
+            del self._feeds[route]
+
+        task = self._loading.get(route)
+        if task is None:
+            metrics.incr("rsshub_cache", outcome="miss")
+            task = asyncio.ensure_future(self._load(route, load))
+            self._loading[route] = task
+            task.add_done_callback(lambda _: self._loading.pop(route, None))
+            # Retrieve failures even if every waiter was cancelled
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        else:
+            metrics.incr("rsshub_cache", outcome="coalesced")
+
+        # Shielded: one cancelled caller must not abort the shared fetch
+        return await asyncio.shield(task)
+
+    async def _load(
+        self,
+        route: str,
+        load: Callable[[], Awaitable[FeedFetchResult]],
+    ) -> tuple[Optional[CachedFeed], Optional[str]]:
+        result = await load()
+        if not result.success or not result.entries:
+            return None, result.error or "Failed to fetch RSSHub feed"
+
+        feed = CachedFeed(entries=result.entries, fetched_at=time.monotonic())
+        self._feeds[route] = feed
+        self._feeds.move_to_end(route)
+        while len(self._feeds) > self.max_entries:
+            self._feeds.popitem(last=False)
+        return feed, None
+
+
+@lru_cache
+def get_feed_cache() -> RSSHubFeedCache:
+    """Get the process-wide RSSHub feed cache."""
+    return RSSHubFeedCache(
+        ttl_seconds=settings.rsshub_cache_ttl_seconds,
+        max_entries=settings.rsshub_cache_max_entries,
+    )
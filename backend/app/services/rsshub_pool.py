@@ -0,0 +1,235 @@
+"""
+RSSHub instance pool: health tracking, latency-weighted selection and
+hedged requests across mirrors.
+
+Each request goes to an instance picked with probability inversely
+proportional to its smoothed latency. If it has not answered by that
+instance's p95 latency, a hedge request goes to a second instance and the
+first successful response wins. Instances that keep failing sit out a
+cooldown.
+"""
+import asyncio
+import random
+import statistics
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from functools import lru_cache
+from typing import Optional, TypeVar
+
+import httpx
+import structlog
+
+from app.core.config import get_settings
+from app.core.metrics import get_metrics
+
+settings = get_settings()
+logger = structlog.get_logger()
+
+T = TypeVar("T")
+
+# Latency samples kept per instance for the p95 hedge delay
+LATENCY_WINDOW = 50
+# Samples needed before an instance's own p95 is trusted
+MIN_LATENCY_SAMPLES = 5
+# Weight of the newest sample in the smoothed latency
+EWMA_ALPHA = 0.3
+
+
+class RSSHubInstance:
+    """Health and latency state for one RSSHub base URL."""
+
+    def __init__(self, base_url: str):
+        self.base_url = base_url.rstrip("/")
+        self.ewma_latency: Optional[float] = None
+        self.latencies: deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self.consecutive_failures = 0
+        self.unhealthy_until = 0.0
+
+    def is_healthy(self, now: float) -> bool:
+        return now >= self.unhealthy_until
+
+    def p95_latency(self) -> Optional[float]:
+        if len(self.latencies) < MIN_LATENCY_SAMPLES:
+            return None
+        return statistics.quantiles(self.latencies, n=20)[-1]
+
+
+class RSSHubInstancePool:
+    """Routes RSSHub requests across instances."""
+
+    def __init__(
+        self,
+        base_urls: list[str],
+        timeout: float,
+        hedge_delay: float,
+        failure_threshold: int,
+        cooldown_seconds: float,
+    ):
+        self.instances = [RSSHubInstance(url) for url in dict.fromkeys(base_urls)]
+        self.timeout = timeout
+        self.hedge_delay = hedge_delay
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.logger = logger.bind(service="rsshub_pool")
+
+    def choose(self, exclude: set[str]) -> Optional[RSSHubInstance]:
+        """
+        Pick an instance, weighted towards low latency.
+
+        Unhealthy instances are only used when no healthy one is left.
+        Instances without samples are weighted like the fastest known one,
+        so new mirrors get tried.
+
+        Args:
+            exclude: Base URLs already used for this request
+
+        Returns:
+            An instance, or None if all are excluded
+        """
+        candidates = [i for i in self.instances if i.base_url not in exclude]
+        if not candidates:
+            return None
+
+        now = time.monotonic()
+        healthy = [i for i in candidates if i.is_healthy(now)]
+        candidates = healthy or candidates
+
+        known = [i.ewma_latency for i in candidates if i.ewma_latency is not None]
+        optimistic = min(known) if known else 1.0
+        weights = [
+            1.0 / max(i.ewma_latency if i.ewma_latency is not None else optimistic, 1e-3)
+            for i in candidates
+        ]
+        return random.choices(candidates, weights=weights)[0]
+
+    def record_success(self, instance: RSSHubInstance, latency: float) -> None:
+        instance.latencies.append(latency)
+        if instance.ewma_latency is None:
+            instance.ewma_latency = latency
+        else:
+            instance.ewma_latency += EWMA_ALPHA * (latency - instance.ewma_latency)
+        instance.consecutive_failures = 0
+        instance.unhealthy_until = 0.0
+
+    def record_failure(self, instance: RSSHubInstance) -> None:
+        instance.consecutive_failures += 1
+        # A timeout is a latency sample too: it steers selection away
+        instance.ewma_latency = max(instance.ewma_latency or 0.0, self.timeout)
+        if instance.consecutive_failures >= self.failure_threshold:
+            instance.unhealthy_until = time.monotonic() + self.cooldown_seconds
+            get_metrics().incr("rsshub_instance_unhealthy", instance=instance.base_url)
+            self.logger.warning(
+                "rsshub_instance_unhealthy",
+                instance=instance.base_url,
+                failures=instance.consecutive_failures,
+            )
+
+    def _is_instance_fault(self, error: Exception) -> bool:
+        """Whether an error says something about the instance, not the route."""
+        if isinstance(error, httpx.HTTPStatusError):
+            status = error.response.status_code
+            return status == 429 or status >= 500
+        return True
+
+    async def _attempt(
+        self,
+        instance: RSSHubInstance,
+        request: Callable[[str], Awaitable[T]],
+    ) -> T:
+        started = time.monotonic()
+        try:
+            result = await asyncio.wait_for(request(instance.base_url), self.timeout)
+        except asyncio.CancelledError:
+            # Lost a hedge race: it was at least this slow
+            elapsed = time.monotonic() - started
+            instance.ewma_latency = max(instance.ewma_latency or 0.0, elapsed)
+            raise
+        except Exception as e:
+            if self._is_instance_fault(e):
+                self.record_failure(instance)
+            raise
+        self.record_success(instance, time.monotonic() - started)
+        return result
+
+    async def request(self, request: Callable[[str], Awaitable[T]]) -> T:
+        """
+        Run a request against the pool.
+
+        Args:
+            request: Performs the request given an instance base URL and
+                raises on failure
+
+        Returns:
+            The first successful result
+
+        Raises:
+            Exception: The last error if every attempted instance failed,
+                or the first route-level (4xx) error
+        """
+        metrics = get_metrics()
+        used: set[str] = set()
+        tasks: dict[asyncio.Task, RSSHubInstance] = {}
+        last_error: Optional[Exception] = None
+
+        def launch() -> bool:
+            instance = self.choose(used)
+            if instance is None:
+                return False
+            used.add(instance.base_url)
+            tasks[asyncio.create_task(self._attempt(instance, request))] = instance
+            return True
+
+        launch()
+        primary = next(iter(tasks.values()))
+        hedge_delay = primary.p95_latency() or self.hedge_delay
+        hedged = False
+
+        try:
+            while tasks:
+                done, _ = await asyncio.wait(
+                    tasks,
+                    timeout=None if hedged else hedge_delay,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+
+                if not done:
+                    # Primary is slower than its p95: hedge on another instance
+                    hedged = True
+                    if launch():
+                        metrics.incr("rsshub_hedged_requests")
+                    continue
+
+                for task in done:
+                    instance = tasks.pop(task)
+                    error = task.exception()
+                    if error is None:
+                        metrics.incr("rsshub_requests", outcome="ok", instance=instance.base_url)
+                        return task.result()
+
+                    last_error = error
+                    metrics.incr("rsshub_requests", outcome="error", instance=instance.base_url)
+                    if not self._is_instance_fault(error):
+                        raise error
+
+                if not tasks:
+                    # Everything in flight failed: fail over to a fresh instance
+                    hedged = True
+                    launch()
+
+            raise last_error or RuntimeError("No RSSHub instance available")
+        finally:
+            for task in tasks:
+                task.cancel()
+
+
+@lru_cache
+def get_instance_pool() -> RSSHubInstancePool:
+    """Get the process-wide RSSHub instance pool."""
+    return RSSHubInstancePool(
+        base_urls=settings.rsshub_instances or [settings.rsshub_base_url],
+        timeout=settings.rsshub_timeout,
+        hedge_delay=settings.rsshub_hedge_delay,
+        failure_threshold=settings.rsshub_failure_threshold,
+        cooldown_seconds=settings.rsshub_unhealthy_cooldown_seconds,
+    )
@@ -0,0 +1,95 @@
+"""
+RSSHub route table: compiled URL-to-route rules indexed by host.
+
+Rules are declared in rsshub_routes.toml (or the file named by the
+rsshub_routes_file setting), compiled once, and bucketed by hostname so a
+lookup only tries the rules for the URL's host and its parent domains.
+"""
+import re
+import string
+import tomllib
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlparse
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+DEFAULT_ROUTES_FILE = Path(__file__).with_name("rsshub_routes.toml")
+
+
+class RSSHubRoute:
+    """A single compiled route rule."""
+
+    __slots__ = ("path", "template")
+
+    def __init__(self, path: str, template: str):
+        self.path = re.compile(path)
+        self.template = template
+
+        # Fail at load time, not on the first matching URL
+        fields = {name for _, name, _, _ in string.Formatter().parse(template) if name}
+        missing = fields - set(self.path.groupindex)
+        if missing:
+            raise ValueError(
+                f"Template {template!r} uses groups missing from {path!r}: {sorted(missing)}"
+            )
+
+    def build(self, path: str) -> Optional[str]:
+        """Build the RSSHub route for a URL path, or None if it does not match."""
+        match = self.path.match(path)
+        if match is None:
+            return None
+        return self.template.format_map(match.groupdict())
+
+
+class RSSHubRouteTable:
+    """Host-indexed collection of route rules."""
+
+    def __init__(self, rules: list[dict]):
+        self._by_host: dict[str, list[RSSHubRoute]] = {}
+        for rule in rules:
+            route = RSSHubRoute(rule.get("path", ""), rule["template"])
+            for host in rule["hosts"]:
+                self._by_host.setdefault(host.lower(), []).append(route)
+
+    @classmethod
+    def from_file(cls, path: Path) -> "RSSHubRouteTable":
+        """Load and compile rules from a TOML file with [[route]] tables."""
+        with open(path, "rb") as f:
+            return cls(tomllib.load(f).get("route", []))
+
+    def __len__(self) -> int:
+        return sum(len(routes) for routes in self._by_host.values())
+
+    def match(self, url: str) -> Optional[str]:
+        """
+        Find the RSSHub route for a URL.
+
+        Args:
+            url: Original URL
+
+        Returns:
+            RSSHub route path (e.g., "/zhihu/question/123") or None
+        """
+        parsed = urlparse(url)
+        hostname = (parsed.hostname or "").lower()
+        path = parsed.path or "/"
+
+        # Most specific host first: a.b.com, then b.com, then com
+        labels = hostname.split(".")
+        for i in range(len(labels)):
+            for route in self._by_host.get(".".join(labels[i:]), ()):
+                built = route.build(path)
+                if built is not None:
+                    return built
+        return None
+
+
+@lru_cache
+def get_route_table() -> RSSHubRouteTable:
+    """Get the process-wide route table, compiled on first use."""
+    path = Path(settings.rsshub_routes_file) if settings.rsshub_routes_file else DEFAULT_ROUTES_FILE
+    return RSSHubRouteTable.from_file(path)
@@ -26,7 +26,11 @@ class SearchService:
         self.embedding_service = EmbeddingService()
 
     async def search_local(
-        self, query: str, top_k: int = 5, user_id: Optional[UUID] = None
+        self,
+        query: str,
+        top_k: int = 5,
+        user_id: Optional[UUID] = None,
+        query_vector: Optional[list[float]] = None,
     ) -> list[Citation]:
         """
         Search local documents using vector similarity.
@@ -35,13 +39,15 @@ class SearchService:
             query: Search query
             top_k: Number of results to return
             user_id: Optional user ID for filtering (future use)
+            query_vector: Precomputed query embedding (generated if omitted)
 
         Returns:
             List of citations from local documents
         """
         try:
             # Generate query embedding
-            query_vector = await self.embedding_service.generate_embedding(query)
+            if query_vector is None:
+                query_vector = await self.embedding_service.generate_embedding(query)
 
             # Query pgvector for similar chunks
             # Using cosine distance: <=> operator
@@ -59,10 +65,7 @@ class SearchService:
 
             # Apply user filtering if user_id provided
             if user_id is not None:
-                from app.models.models import Source
-                stmt = stmt.join(Source, Document.source_id == Source.id).where(
-                    Source.user_id == user_id
-                )
+                stmt = stmt.where(Document.user_id == user_id)
 
             stmt = stmt.order_by("distance").limit(top_k)
 
@@ -151,6 +154,7 @@ class SearchService:
         top_k: int = 5,
         include_web: bool = False,
         user_id: Optional[UUID] = None,
+        query_vector: Optional[list[float]] = None,
     ) -> list[Citation]:
         """
         Perform hybrid search (local + optional web).
@@ -160,11 +164,12 @@ class SearchService:
             top_k: Total number of results to return
             include_web: Whether to include web search
             user_id: Optional user ID for filtering
+            query_vector: Precomputed query embedding for local search
 
         Returns:
             Combined list of citations
         """
-        tasks = [self.search_local(query, top_k, user_id)]
+        tasks = [self.search_local(query, top_k, user_id, query_vector)]
 
         if include_web:
             # Allocate half of top_k to web results
@@ -0,0 +1,220 @@
+"""
+Seen-entry index: skip feed entries that were already processed.
+
+A per-source Bloom filter answers "definitely new" without touching the
+database; only filter hits are confirmed against feed_seen_entries.
+
+Filters are cached per process but several workers write the table, so
+sources.seen_entry_count counts each source's rows and a cached filter is
+reused only while that count matches the rows it reflects. The count is read
+once per index (one feed refresh); after that the filter is kept current by
+this index's own inserts, since a source is refreshed by one worker at a time.
+"""
+import hashlib
+import math
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional
+from uuid import UUID, uuid4
+
+from sqlalchemy import Boolean, func, literal_column, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.models.models import FeedSeenEntry, Source
+
+settings = get_settings()
+
+# Longest key stored as is (entry_key is String(2048)); longer keys are hashed
+MAX_ENTRY_KEY_LENGTH = 2048
+
+
+def storage_key(key: str) -> str:
+    """Key as stored in feed_seen_entries (overlong GUIDs/links are hashed)."""
+    if len(key) <= MAX_ENTRY_KEY_LENGTH:
+        return key
+    return "sha256:" + hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        capacity = max(capacity, 1)
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.capacity = capacity
+        self.count = 0
+        # Table rows for the source this filter reflects (see SeenEntryIndex)
+        self.rows = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str) -> list[int]:
+        # Double hashing over one 128-bit digest
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, key: str) -> None:
+        for pos in self._positions(key):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+# Process-wide filters, most recently used last
+_filters: "OrderedDict[UUID, BloomFilter]" = OrderedDict()
+
+
+class SeenEntryIndex:
+    """Per-source index of processed feed entries."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        # Sources whose cached filter was checked against the table count
+        self._validated: set[UUID] = set()
+
+    async def _get_filter(self, source_id: UUID) -> BloomFilter:
+        """
+        Get the source's Bloom filter, building it from the table if needed.
+
+        A cached filter is rebuilt when it is full or when the source has rows
+        it has not seen (entries another worker recorded). The count is only
+        checked on this index's first use of the source.
+        """
+        bloom = _filters.get(source_id)
+        if bloom is not None and bloom.count < bloom.capacity:
+            if source_id not in self._validated:
+                rows = await self._seen_count(source_id)
+                if rows == bloom.rows:
+                    self._validated.add(source_id)
+            if source_id in self._validated:
+                _filters.move_to_end(source_id)
+                return bloom
+
+        # Counted before the keys are read: rows committed in between only
+        # make the filter look stale, never miss keys
+        rows = await self._seen_count(source_id)
+        result = await self.db.execute(
+            select(FeedSeenEntry.entry_key).where(FeedSeenEntry.source_id == source_id)
+        )
+        keys = result.scalars().all()
+
+        # Leave headroom so the filter is not rebuilt on every poll
+        bloom = BloomFilter(max(settings.seen_entry_filter_min_capacity, len(keys) * 2))
+        for key in keys:
+            bloom.add(key)
+        bloom.rows = rows
+        self._validated.add(source_id)
+
+        _filters[source_id] = bloom
+        _filters.move_to_end(source_id)
+        while len(_filters) > settings.seen_entry_filter_cache_size:
+            _filters.popitem(last=False)
+        return bloom
+
+    async def _seen_count(self, source_id: UUID) -> int:
+        return await self.db.scalar(
+            select(Source.seen_entry_count).where(Source.id == source_id)
+        ) or 0
+
+    async def lookup(
+        self, source_id: UUID, keys: list[str]
+    ) -> dict[str, tuple[Optional[datetime], Optional[UUID]]]:
+        """
+        Find which entry keys were already processed.
+
+        Args:
+            source_id: Source ID
+            keys: Entry keys (GUID or link) from the current poll
+
+        Returns:
+            Mapping of seen key to its stored (updated timestamp, document ID)
+        """
+        bloom = await self._get_filter(source_id)
+        candidates = {storage_key(key): key for key in keys}
+        candidates = {stored: key for stored, key in candidates.items() if stored in bloom}
+        if not candidates:
+            return {}
+
+        result = await self.db.execute(
+            select(
+                FeedSeenEntry.entry_key,
+                FeedSeenEntry.entry_updated_at,
+                FeedSeenEntry.document_id,
+            ).where(
+                FeedSeenEntry.source_id == source_id,
+                FeedSeenEntry.entry_key.in_(list(candidates)),
+            )
+        )
+        return {
+            candidates[stored]: (updated_at, document_id)
+            for stored, updated_at, document_id in result.all()
+        }
+
+    async def mark_seen(
+        self,
+        source_id: UUID,
+        entries: list[tuple[str, Optional[datetime], Optional[UUID]]],
+    ) -> None:
+        """
+        Record processed entries (flushed with the caller's commit).
+
+        Args:
+            source_id: Source ID
+            entries: (entry_key, entry_updated_at, document_id) tuples
+        """
+        if not entries:
+            return
+
+        # Taken before the upsert, whose rows this transaction would count
+        bloom = await self._get_filter(source_id)
+
+        # Last occurrence wins when a feed repeats a key
+        now = datetime.utcnow()
+        rows = {
+            storage_key(key): {
+                "id": uuid4(),
+                "source_id": source_id,
+                "entry_key": storage_key(key),
+                "entry_updated_at": updated_at,
+                "document_id": document_id,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for key, updated_at, document_id in entries
+        }
+        stmt = insert(FeedSeenEntry).values(list(rows.values()))
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_feed_seen_entry",
+            set_={
+                "entry_updated_at": stmt.excluded.entry_updated_at,
+                "document_id": func.coalesce(
+                    stmt.excluded.document_id, FeedSeenEntry.document_id
+                ),
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+        # xmax is zero only on row versions this statement inserted
+        stmt = stmt.returning(literal_column("xmax = 0", Boolean))
+        inserted = sum((await self.db.execute(stmt)).scalars())
+
+        for key in rows:
+            bloom.add(key)
+        if not inserted:
+            return
+
+        bloom.rows += inserted
+        seen_count = await self.db.scalar(
+            update(Source)
+            .where(Source.id == source_id)
+            .values(seen_entry_count=Source.seen_entry_count + inserted)
+            .returning(Source.seen_entry_count)
+        )
+        if seen_count != bloom.rows:
+            # Another worker recorded entries: recheck before the next use
+            self._validated.discard(source_id)
@@ -5,7 +5,7 @@ import logging
 from typing import Optional
 from uuid import UUID
 
-from sqlalchemy import select, func
+from sqlalchemy import Row, select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -20,6 +20,13 @@ from app.schemas.staging_schemas import (
 
 logger = logging.getLogger(__name__)
 
+# Document columns needed for staging responses (bodies are never loaded)
+DOCUMENT_COLUMNS = (
+    Document.title.label("document_title"),
+    Document.url.label("document_url"),
+    Document.author.label("document_author"),
+)
+
 
 class StagingService:
     """Service for staging area operations."""
@@ -43,15 +50,12 @@ class StagingService:
         Raises:
             NotFoundError: If document doesn't exist
         """
-        # Check if document exists and belongs to user (via source)
-        from app.models.models import Source
-        doc_stmt = (
-            select(Document)
-            .join(Source, Document.source_id == Source.id)
-            .where(Document.id == create_data.document_id, Source.user_id == user_id)
+        # Check if document exists and belongs to user
+        doc_stmt = select(*DOCUMENT_COLUMNS).where(
+            Document.id == create_data.document_id, Document.user_id == user_id
         )
         doc_result = await self.db.execute(doc_stmt)
-        document = doc_result.scalar_one_or_none()
+        document = doc_result.one_or_none()
 
         if not document:
             raise NotFoundError(
@@ -100,7 +104,7 @@ class StagingService:
             List of staging items with metadata
         """
         stmt = (
-            select(StagingItem, Document)
+            select(StagingItem, *DOCUMENT_COLUMNS)
             .join(Document, StagingItem.document_id == Document.id)
             .where(StagingItem.user_id == user_id)
             .order_by(StagingItem.created_at.desc())
@@ -109,7 +113,7 @@ class StagingService:
         result = await self.db.execute(stmt)
         rows = result.all()
 
-        items = [self._to_response(staging_item, document) for staging_item, document in rows]
+        items = [self._to_response(row.StagingItem, row) for row in rows]
 
         selected_count = sum(1 for item in items if item.is_selected)
 
@@ -137,7 +141,7 @@ class StagingService:
             NotFoundError: If item doesn't exist or doesn't belong to user
         """
         stmt = (
-            select(StagingItem, Document)
+            select(StagingItem, *DOCUMENT_COLUMNS)
             .join(Document, StagingItem.document_id == Document.id)
             .where(StagingItem.id == item_id, StagingItem.user_id == user_id)
         )
@@ -148,7 +152,7 @@ class StagingService:
         if not row:
             raise NotFoundError(f"Staging item {item_id} not found")
 
-        staging_item, document = row
+        staging_item, document = row.StagingItem, row
 
         # Update fields
         if update_data.is_selected is not None:
@@ -212,9 +216,9 @@ class StagingService:
         return count
 
     def _to_response(
-        self, staging_item: StagingItem, document: Document
+        self, staging_item: StagingItem, document: Row
     ) -> StagingItemResponse:
-        """Convert staging item to response model."""
+        """Convert staging item and selected document columns to response model."""
         return StagingItemResponse(
             id=staging_item.id,
             user_id=staging_item.user_id,
@@ -223,7 +227,7 @@ class StagingService:
             notes=staging_item.notes,
             created_at=staging_item.created_at,
             updated_at=staging_item.updated_at,
-            document_title=document.title,
-            document_url=document.url,
-            document_author=document.author,
+            document_title=document.document_title,
+            document_url=document.document_url,
+            document_author=document.document_author,
         )
@@ -1,91 +1,351 @@
 """
 File storage service for uploaded documents (PDFs).
+
+Files are stored through a StorageBackend: the local disk (single node)
+or an S3-compatible object store shared by every API and worker node.
 """
+import asyncio
+import hashlib
 import os
 import shutil
+import tempfile
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from functools import lru_cache
 from pathlib import Path
-from uuid import UUID, uuid4
+from typing import AsyncContextManager, AsyncIterator, BinaryIO, Optional
+from uuid import uuid4
+
+from fastapi import UploadFile
 
 from app.core.config import get_settings
 
 settings = get_settings()
 
 
-class FileStorage:
-    """Handles file storage operations for uploaded documents."""
-    
-    def __init__(self):
-        self.base_dir = Path(settings.upload_dir)
+# Bytes read from an upload per write, and per chunk of a streamed read
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+class StorageBackend(ABC):
+    """
+    Where uploaded files live.
+
+    Keys are "/"-separated paths such as blobs/ab/<sha256>.pdf. Reads of a
+    missing key raise FileNotFoundError.
+    """
+
+    @abstractmethod
+    async def exists(self, key: str) -> bool:
+        """Whether a file is stored under key."""
+
+    @abstractmethod
+    async def put_fileobj(self, key: str, fileobj: BinaryIO) -> None:
+        """Store the rest of a readable binary file object under key."""
+
+    @abstractmethod
+    def open_read(self, key: str) -> AsyncIterator[bytes]:
+        """Stream a stored file in chunks."""
+
+    @abstractmethod
+    async def read_range(self, key: str, start: int, end: int) -> bytes:
+        """Read bytes start..end of a stored file (inclusive, as in HTTP ranges)."""
+
+    @abstractmethod
+    async def size(self, key: str) -> int:
+        """Size of a stored file in bytes."""
+
+    @abstractmethod
+    async def delete(self, key: str) -> bool:
+        """Delete a stored file; False if it did not exist."""
+
+    @abstractmethod
+    def local_copy(self, key: str) -> AsyncContextManager[Path]:
+        """Make a stored file available as a local path for the duration of the block."""
+
+    async def presigned_url(self, key: str, expires_in: int) -> Optional[str]:
+        """
+        URL clients can download the file from directly, bypassing the API.
+
+        Returns:
+            Time-limited URL, or None if the backend cannot issue one
+        """
+        return None
+
+
+class LocalStorageBackend(StorageBackend):
+    """Stores files under a directory on the local disk."""
+
+    def __init__(self, base_dir: Path):
+        self.base_dir = base_dir
         self.base_dir.mkdir(parents=True, exist_ok=True)
-    
-    def save_uploaded_file(
+
+    def _path(self, key: str) -> Path:
+        return self.base_dir / key
+
+    async def exists(self, key: str) -> bool:
+        return await asyncio.to_thread(self._path(key).exists)
+
+    async def put_fileobj(self, key: str, fileobj: BinaryIO) -> None:
+        await asyncio.to_thread(self._write, fileobj, self._path(key))
+
+    @staticmethod
+    def _write(fileobj: BinaryIO, dest: Path) -> None:
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        # Written beside the destination and renamed, so readers never see a partial file
+        tmp_path = dest.with_name(f"{dest.name}.{uuid4()}.part")
+        try:
+            with open(tmp_path, "wb") as handle:
+                shutil.copyfileobj(fileobj, handle, UPLOAD_CHUNK_SIZE)
+            os.replace(tmp_path, dest)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+    async def open_read(self, key: str) -> AsyncIterator[bytes]:
+        handle = await asyncio.to_thread(open, self._path(key), "rb")
+        try:
+            while chunk := await asyncio.to_thread(handle.read, UPLOAD_CHUNK_SIZE):
+                yield chunk
+        finally:
+            await asyncio.to_thread(handle.close)
+
+    async def read_range(self, key: str, start: int, end: int) -> bytes:
+        return await asyncio.to_thread(self._read_range, self._path(key), start, end)
+
+    @staticmethod
+    def _read_range(path: Path, start: int, end: int) -> bytes:
+        with open(path, "rb") as handle:
+            handle.seek(start)
+            return handle.read(end - start + 1)
+
+    async def size(self, key: str) -> int:
+        stat = await asyncio.to_thread(self._path(key).stat)
+        return stat.st_size
+
+    async def delete(self, key: str) -> bool:
+        try:
+            await asyncio.to_thread(self._path(key).unlink)
+        except FileNotFoundError:
+            return False
+        return True
+
+    @asynccontextmanager
+    async def local_copy(self, key: str) -> AsyncIterator[Path]:
+        path = self._path(key)
+        if not await asyncio.to_thread(path.exists):
+            raise FileNotFoundError(f"Stored file not found: {key}")
+        yield path
+
+
+class S3StorageBackend(StorageBackend):
+    """
+    Stores files in an S3-compatible bucket (AWS S3, MinIO, ...).
+
+    boto3 is only imported when this backend is configured. Its blocking
+    calls run in threads.
+    """
+
+    def __init__(
         self,
-        user_id: UUID,
-        file_content: bytes,
-        original_filename: str
-    ) -> tuple[str, str]:
+        bucket: str,
+        endpoint_url: Optional[str] = None,
+        region: Optional[str] = None,
+        access_key_id: Optional[str] = None,
+        secret_access_key: Optional[str] = None,
+    ):
+        import boto3
+        from botocore.config import Config
+        from botocore.exceptions import ClientError
+
+        self.bucket = bucket
+        self._client_error = ClientError
+        self.client = boto3.client(
+            "s3",
+            endpoint_url=endpoint_url or None,
+            region_name=region or None,
+            aws_access_key_id=access_key_id or None,
+            aws_secret_access_key=secret_access_key or None,
+            # Custom endpoints (MinIO) are usually addressed by path, not subdomain
+            config=Config(
+                signature_version="s3v4",
+                s3={"addressing_style": "path" if endpoint_url else "auto"},
+            ),
+        )
+
+    def _is_not_found(self, error: Exception) -> bool:
+        return isinstance(error, self._client_error) and error.response.get("Error", {}).get(
+            "Code"
+        ) in ("404", "NoSuchKey", "NotFound")
+
+    async def _call(self, method: str, **kwargs):
+        """Run a client call in a thread, mapping missing keys to FileNotFoundError."""
+        try:
+            return await asyncio.to_thread(getattr(self.client, method), **kwargs)
+        except Exception as e:
+            if self._is_not_found(e):
+                raise FileNotFoundError(f"Stored file not found: {kwargs.get('Key')}") from e
+            raise
+
+    async def exists(self, key: str) -> bool:
+        try:
+            await self._call("head_object", Bucket=self.bucket, Key=key)
+        except FileNotFoundError:
+            return False
+        return True
+
+    async def put_fileobj(self, key: str, fileobj: BinaryIO) -> None:
+        # upload_fileobj streams the file, switching to multipart for large files
+        await asyncio.to_thread(self.client.upload_fileobj, fileobj, self.bucket, key)
+
+    async def open_read(self, key: str) -> AsyncIterator[bytes]:
+        response = await self._call("get_object", Bucket=self.bucket, Key=key)
+        body = response["Body"]
+        try:
+            while chunk := await asyncio.to_thread(body.read, UPLOAD_CHUNK_SIZE):
+                yield chunk
+        finally:
+            body.close()
+
+    async def read_range(self, key: str, start: int, end: int) -> bytes:
+        response = await self._call(
+            "get_object", Bucket=self.bucket, Key=key, Range=f"bytes={start}-{end}"
+        )
+        body = response["Body"]
+        try:
+            return await asyncio.to_thread(body.read)
+        finally:
+            body.close()
+
+    async def size(self, key: str) -> int:
+        response = await self._call("head_object", Bucket=self.bucket, Key=key)
+        return response["ContentLength"]
+
+    async def delete(self, key: str) -> bool:
+        if not await self.exists(key):
+            return False
+        await self._call("delete_object", Bucket=self.bucket, Key=key)
+        return True
+
+    @asynccontextmanager
+    async def local_copy(self, key: str) -> AsyncIterator[Path]:
+        fd, name = tempfile.mkstemp(suffix=Path(key).suffix)
+        os.close(fd)
+        path = Path(name)
+        try:
+            # download_file fetches large objects as parallel ranged GETs
+            try:
+                await asyncio.to_thread(self.client.download_file, self.bucket, key, name)
+            except Exception as e:
+                if self._is_not_found(e):
+                    raise FileNotFoundError(f"Stored file not found: {key}") from e
+                raise
+            yield path
+        finally:
+            await asyncio.to_thread(path.unlink, missing_ok=True)
+
+    async def presigned_url(self, key: str, expires_in: int) -> Optional[str]:
+        return await asyncio.to_thread(
+            self.client.generate_presigned_url,
+            "get_object",
+            Params={"Bucket": self.bucket, "Key": key},
+            ExpiresIn=expires_in,
+        )
+
+
+@lru_cache
+def get_storage_backend() -> StorageBackend:
+    """Get the configured storage backend."""
+    if settings.storage_backend == "local":
+        return LocalStorageBackend(Path(settings.upload_dir))
+    if settings.storage_backend == "s3":
+        return S3StorageBackend(
+            bucket=settings.s3_bucket,
+            endpoint_url=settings.s3_endpoint_url,
+            region=settings.s3_region,
+            access_key_id=settings.s3_access_key_id,
+            secret_access_key=settings.s3_secret_access_key,
+        )
+    raise ValueError(f"Unknown storage backend: {settings.storage_backend}")
+
+
+class StoredFile:
+    """An upload saved to content-addressed storage."""
+
+    def __init__(self, key: str, sha256: str, size: int, created: bool):
+        self.key = key
+        self.sha256 = sha256
+        self.size = size
+        # False if identical content was already stored
+        self.created = created
+
+
+class FileStorage:
+    """
+    Handles file storage operations for uploaded documents.
+
+    Files are stored once per content, under their SHA-256, so blobs may
+    be shared by several sources.
+    """
+
+    def __init__(self, backend: Optional[StorageBackend] = None):
+        self.backend = backend or get_storage_backend()
+
+    async def save_upload(self, upload: UploadFile, original_filename: str) -> StoredFile:
         """
-        Save an uploaded file to user-specific directory.
-        
+        Hash an upload and store it under its content-addressed key.
+
+        The request body has already been received and spooled by the
+        framework (UploadSizeLimitMiddleware bounds it), so the spool is
+        read once to hash it and, unless that content is already stored,
+        once more straight into the backend. Nothing else is copied.
+
         Args:
-            user_id: User ID for directory organization
-            file_content: Binary file content
+            upload: Uploaded file
             original_filename: Original filename (for extension extraction)
-            
+
         Returns:
-            Tuple of (file_path, file_id) where file_path is relative to backend/
-            
+            StoredFile with the storage key and the SHA-256
+
         Raises:
-            ValueError: If file is too large
+            ValueError: If the file exceeds max_upload_mb
         """
-        # Check size limit
         max_bytes = settings.max_upload_mb * 1024 * 1024
-        if len(file_content) > max_bytes:
-            raise ValueError(
-                f"File size ({len(file_content)} bytes) exceeds limit ({max_bytes} bytes)"
-            )
-        
-        # Create user directory
-        user_dir = self.base_dir / str(user_id)
-        user_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Generate unique file ID and preserve extension
-        file_id = str(uuid4())
+        sha256, size = await asyncio.to_thread(self._hash, upload.file, max_bytes)
+
         ext = Path(original_filename).suffix.lower()
-        filename = f"{file_id}{ext}"
-        file_path = user_dir / filename
-        
-        # Write file
-        file_path.write_bytes(file_content)
-        
-        # Return relative path from backend/
-        relative_path = file_path.relative_to(Path.cwd())
-        return str(relative_path), file_id
-    
-    def get_file_path(self, relative_path: str) -> Path:
-        """
-        Get absolute path for a stored file.
-        
-        Args:
-            relative_path: Relative path from backend/
-            
-        Returns:
-            Absolute Path object
-        """
-        return Path.cwd() / relative_path
-    
-    def delete_file(self, relative_path: str) -> bool:
+        key = f"blobs/{sha256[:2]}/{sha256}{ext}"
+
+        created = not await self.backend.exists(key)
+        if created:
+            await asyncio.to_thread(upload.file.seek, 0)
+            await self.backend.put_fileobj(key, upload.file)
+
+        return StoredFile(key, sha256, size, created)
+
+    @staticmethod
+    def _hash(fileobj: BinaryIO, max_bytes: int) -> tuple[str, int]:
+        """SHA-256 and size of a file object, read from the start in chunks."""
+        fileobj.seek(0)
+        digest = hashlib.sha256()
+        size = 0
+        while chunk := fileobj.read(UPLOAD_CHUNK_SIZE):
+            size += len(chunk)
+            if size > max_bytes:
+                raise ValueError(f"File size exceeds limit ({max_bytes} bytes)")
+            digest.update(chunk)
+        return digest.hexdigest(), size
+
+    async def delete_file(self, key: str) -> bool:
         """
         Delete a stored file.
-        
+
+        Blobs are shared by every source with the same content; only delete
+        one that no source references.
+
         Args:
-            relative_path: Relative path from backend/
-            
+            key: Storage key
+
         Returns:
             True if deleted, False if file doesn't exist
         """
-        file_path = self.get_file_path(relative_path)
-        if file_path.exists():
-            file_path.unlink()
-            return True
-        return False
+        return await self.backend.delete(key)
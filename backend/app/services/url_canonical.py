@@ -0,0 +1,78 @@
+"""
+URL canonicalisation for deduplicating imports.
+"""
+from urllib.parse import unquote_plus, urlsplit, urlunsplit
+
+# Query parameters that only track the referrer and never change the page
+TRACKING_PARAMS = {
+    "fbclid",
+    "gclid",
+    "dclid",
+    "msclkid",
+    "mc_cid",
+    "mc_eid",
+    "igshid",
+    "spm",
+    "ref_src",
+}
+TRACKING_PREFIXES = ("utm_",)
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# Longest canonical URL stored (documents.canonical_url is String(2048))
+MAX_CANONICAL_URL_LENGTH = 2048
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Normalise a URL so trivially different spellings compare equal.
+
+    Lowercases the scheme and host, drops default ports, fragments and
+    tracking parameters and trailing slashes, and sorts the remaining
+    query parameters by name. Parameters are kept exactly as written
+    (encoding, blank values, order of repeated names).
+
+    Args:
+        url: Absolute http(s) URL
+
+    Returns:
+        Canonical URL string
+
+    Raises:
+        ValueError: If the URL is malformed (e.g. a bad port) or its
+            canonical form is longer than MAX_CANONICAL_URL_LENGTH
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if ":" in host:
+        # IPv6 literal
+        host = f"[{host}]"
+
+    port = parts.port
+    if port is not None and port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{port}"
+    if parts.username:
+        credentials = parts.username
+        if parts.password:
+            credentials = f"{credentials}:{parts.password}"
+        host = f"{credentials}@{host}"
+
+    # Filter and sort the raw "name=value" pairs; the sort is stable, so
+    # repeated names keep their relative order
+    params = []
+    for param in parts.query.split("&"):
+        if not param:
+            continue
+        name = unquote_plus(param.split("=", 1)[0])
+        if name.lower() in TRACKING_PARAMS or name.lower().startswith(TRACKING_PREFIXES):
+            continue
+        params.append((name, param))
+    query = "&".join(param for _, param in sorted(params, key=lambda item: item[0]))
+
+    path = parts.path.rstrip("/") or "/"
+
+    canonical_url = urlunsplit((scheme, host, path, query, ""))
+    if len(canonical_url) > MAX_CANONICAL_URL_LENGTH:
+        raise ValueError(f"URL longer than {MAX_CANONICAL_URL_LENGTH} characters")
+    return canonical_url
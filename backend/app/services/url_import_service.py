@@ -0,0 +1,79 @@
+"""
+URL import content fetching: RSSHub and direct scraping raced together.
+"""
+import asyncio
+
+import structlog
+
+from app.core.config import get_settings
+from app.core.metrics import get_metrics
+from app.services.rsshub_service import RSSHubService
+from app.services.url_service import PageFetchResult, URLService
+
+settings = get_settings()
+logger = structlog.get_logger()
+
+
+class URLImportService:
+    """Fetches a URL's title and content for import."""
+
+    def __init__(self):
+        self.rsshub_service = RSSHubService()
+        self.url_service = URLService()
+        self.logger = logger.bind(service="url_import")
+
+    async def fetch(self, url: str) -> PageFetchResult:
+        """
+        Fetch content for a URL, preferring RSSHub when a route matches.
+
+        Both strategies start at once. RSSHub's result is taken as soon as
+        it succeeds. A successful scrape is used if RSSHub fails, or if
+        RSSHub has not answered within the grace period after the scrape
+        finished. The losing request is cancelled.
+
+        Args:
+            url: URL to import
+
+        Returns:
+            PageFetchResult (html is set only for scraped pages)
+        """
+        metrics = get_metrics()
+
+        if not (self.rsshub_service.enabled and self.rsshub_service.match_rsshub_route(url)):
+            result = await self.url_service.fetch_page(url)
+            metrics.incr(
+                "url_import_winner", path="scrape" if result.success else "none", raced="false"
+            )
+            return result
+
+        rsshub_task = asyncio.create_task(self.rsshub_service.fetch_entry_for_url(url))
+        scrape_task = asyncio.create_task(self.url_service.fetch_page(url))
+
+        try:
+            await asyncio.wait({rsshub_task, scrape_task}, return_when=asyncio.FIRST_COMPLETED)
+            if not rsshub_task.done():
+                # Scrape finished first; give the preferred path a short grace
+                # if the scrape is usable, otherwise RSSHub is all that is left
+                grace = settings.url_import_rsshub_grace_seconds if scrape_task.result().success else None
+                await asyncio.wait({rsshub_task}, timeout=grace)
+
+            if rsshub_task.done() and rsshub_task.result()[0]:
+                winner, result = "rsshub", PageFetchResult(*rsshub_task.result())
+            else:
+                if rsshub_task.done():
+                    self.logger.info(
+                        "url_import_fallback_to_scraping",
+                        url=url,
+                        rsshub_error=rsshub_task.result()[3],
+                    )
+                result = await scrape_task
+                winner = "scrape" if result.success else "none"
+        finally:
+            for path, task in (("rsshub", rsshub_task), ("scrape", scrape_task)):
+                if not task.done():
+                    task.cancel()
+                    metrics.incr("url_import_cancelled", path=path)
+
+        metrics.incr("url_import_winner", path=winner, raced="true")
+        self.logger.info("url_import_race_finished", url=url, winner=winner)
+        return result
@@ -1,16 +1,68 @@
 """
-URL content extraction service using trafilatura and BeautifulSoup.
+URL content extraction service using trafilatura and lxml.
 """
+import asyncio
+import codecs
+import re
 from typing import Optional
 from urllib.parse import urlparse
 
 import httpx
 import structlog
 import trafilatura
-from bs4 import BeautifulSoup
+from trafilatura.utils import load_html
 
+from app.core.config import get_settings
+from app.core.http import get_http_client
+from app.core.metrics import get_metrics
+
+settings = get_settings()
 logger = structlog.get_logger()
 
+# Content types worth extracting text from (a missing header is allowed)
+HTML_CONTENT_TYPES = {
+    "text/html",
+    "application/xhtml+xml",
+    "text/plain",
+    "text/xml",
+    "application/xml",
+}
+
+# Bytes buffered before choosing a charset; <meta charset> must appear here
+CHARSET_SNIFF_BYTES = 2048
+META_CHARSET_RE = re.compile(rb"""<meta[^>]+charset=["']?([A-Za-z0-9_.:-]+)""", re.IGNORECASE)
+BOMS = [
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+]
+
+
+class UnsupportedContentTypeError(Exception):
+    """Raised when a URL does not serve a web page."""
+
+
+class ContentTooLargeError(Exception):
+    """Raised when a page exceeds the download size cap."""
+
+
+class PageFetchResult:
+    """Outcome of fetching and extracting a web page."""
+    
+    def __init__(
+        self,
+        success: bool,
+        title: Optional[str] = None,
+        content: Optional[str] = None,
+        error: Optional[str] = None,
+        html: Optional[str] = None,
+    ):
+        self.success = success
+        self.title = title
+        self.content = content
+        self.error = error
+        self.html = html
+
 
 class URLService:
     """Handles web page content extraction."""
@@ -48,72 +100,150 @@ class URLService:
         Returns:
             Tuple of (success, title, content, error_message)
         """
+        result = await self.fetch_page(url)
+        return result.success, result.title, result.content, result.error
+    
+    async def fetch_page(self, url: str) -> PageFetchResult:
+        """
+        Fetch URL and extract main content, keeping the fetched HTML.
+        
+        Args:
+            url: URL to fetch
+            
+        Returns:
+            PageFetchResult (html is set whenever the download succeeded)
+        """
         if not self.validate_url(url):
-            return False, None, None, "Invalid URL format"
+            return PageFetchResult(False, error="Invalid URL format")
         
         try:
-            # Fetch HTML content
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(url, follow_redirects=True)
-                response.raise_for_status()
-                html_content = response.text
-            
-            # Extract using trafilatura (best for article content)
-            extracted_text = trafilatura.extract(
-                html_content,
-                include_links=False,
-                include_images=False,
-                include_tables=True,
-            )
-            
-            if not extracted_text or len(extracted_text.strip()) < 100:
-                # Fallback to BeautifulSoup if trafilatura fails
-                self.logger.info("url_fallback_bs4", url=url)
-                return await self._extract_with_bs4(html_content, url)
-            
-            # Extract title using trafilatura metadata
-            metadata = trafilatura.extract_metadata(html_content)
-            title = None
-            if metadata:
-                title = metadata.title or metadata.sitename
-            
-            # Fallback: extract title from HTML
-            if not title:
-                soup = BeautifulSoup(html_content, "lxml")
-                title_tag = soup.find("title")
-                if title_tag:
-                    title = title_tag.get_text().strip()
-            
-            self.logger.info(
-                "url_extracted",
-                url=url,
-                text_length=len(extracted_text)
-            )
-            
-            return True, title, extracted_text, None
+            html_content = await self.fetch_html(url)
         
         except httpx.HTTPStatusError as e:
             error_msg = f"HTTP error {e.response.status_code}: {url}"
             self.logger.error("url_http_error", url=url, status=e.response.status_code)
-            return False, None, None, error_msg
+            return PageFetchResult(False, error=error_msg)
+        
+        except (UnsupportedContentTypeError, ContentTooLargeError) as e:
+            self.logger.warning("url_rejected", url=url, reason=str(e))
+            return PageFetchResult(False, error=f"{str(e)}: {url}")
         
         except httpx.TimeoutException:
             error_msg = f"Request timeout ({self.timeout}s): {url}"
             self.logger.error("url_timeout", url=url)
-            return False, None, None, error_msg
+            return PageFetchResult(False, error=error_msg)
         
         except Exception as e:
             error_msg = f"Failed to fetch URL: {str(e)}"
             self.logger.error("url_fetch_error", url=url, error=str(e))
-            return False, None, None, error_msg
+            return PageFetchResult(False, error=error_msg)
+        
+        try:
+            success, title, content, error = await self.extract_content(html_content, url)
+        except Exception as e:
+            self.logger.error("url_extract_error", url=url, error=str(e))
+            success, title, content, error = False, None, None, f"Failed to extract URL: {str(e)}"
+        return PageFetchResult(success, title, content, error, html=html_content)
     
-    async def _extract_with_bs4(
+    async def fetch_html(self, url: str) -> str:
+        """
+        Fetch a page's HTML, streaming it under the configured size cap.
+        
+        The content type and declared length are checked before any body
+        is read, and the download stops as soon as the cap is exceeded.
+        
+        Args:
+            url: URL to fetch
+            
+        Returns:
+            Decoded response body
+            
+        Raises:
+            httpx.HTTPError: On transport errors or non-2xx responses
+            UnsupportedContentTypeError: If the response is not a web page
+            ContentTooLargeError: If the body exceeds url_max_download_mb
+        """
+        max_bytes = settings.url_max_download_mb * 1024 * 1024
+        host = (urlparse(url).hostname or "").lower()
+        received = 0
+        
+        # Shared pooled client: crawls of one site reuse connections
+        async with get_http_client().stream("GET", url, timeout=self.timeout) as response:
+            response.raise_for_status()
+            
+            mime_type = response.headers.get("content-type", "").split(";")[0].strip().lower()
+            if mime_type and mime_type not in HTML_CONTENT_TYPES:
+                raise UnsupportedContentTypeError(f"Unsupported content type: {mime_type}")
+            
+            declared = response.headers.get("content-length", "")
+            if declared.isdigit() and int(declared) > max_bytes:
+                raise ContentTooLargeError(
+                    f"Page exceeds {settings.url_max_download_mb}MB download limit"
+                )
+            
+            decoder = None
+            head = b""
+            parts: list[str] = []
+            try:
+                async for chunk in response.aiter_bytes():
+                    received += len(chunk)
+                    if received > max_bytes:
+                        raise ContentTooLargeError(
+                            f"Page exceeds {settings.url_max_download_mb}MB download limit"
+                        )
+                    
+                    if decoder is None:
+                        # Hold back the start of the page until the charset is known
+                        head += chunk
+                        if len(head) < CHARSET_SNIFF_BYTES:
+                            continue
+                        decoder = self._make_decoder(response, head)
+                        chunk, head = head, b""
+                    parts.append(decoder.decode(chunk))
+            finally:
+                get_metrics().incr("url_bytes_downloaded", received, host=host)
+            
+            if decoder is None:
+                decoder = self._make_decoder(response, head)
+                parts.append(decoder.decode(head))
+            parts.append(decoder.decode(b"", final=True))
+        
+        return "".join(parts)
+    
+    def _make_decoder(self, response: httpx.Response, head: bytes) -> codecs.IncrementalDecoder:
+        """
+        Build an incremental decoder for the page's charset.
+        
+        Precedence: byte order mark, Content-Type charset, <meta> declaration
+        in the first bytes, then UTF-8.
+        """
+        candidates = []
+        for bom, encoding in BOMS:
+            if head.startswith(bom):
+                candidates.append(encoding)
+        candidates.append(response.charset_encoding)
+        match = META_CHARSET_RE.search(head)
+        if match:
+            candidates.append(match.group(1).decode("ascii", "ignore"))
+        
+        for encoding in candidates:
+            if not encoding:
+                continue
+            try:
+                return codecs.getincrementaldecoder(encoding)(errors="replace")
+            except LookupError:
+                continue
+        return codecs.getincrementaldecoder("utf-8")(errors="replace")
+    
+    async def extract_content(
         self,
         html_content: str,
         url: str
     ) -> tuple[bool, Optional[str], Optional[str], Optional[str]]:
         """
-        Fallback content extraction using BeautifulSoup.
+        Extract title and main content from fetched HTML.
+        
+        Parsing is CPU-bound, so it runs in a worker thread.
         
         Args:
             html_content: Raw HTML content
@@ -122,32 +252,104 @@ class URLService:
         Returns:
             Tuple of (success, title, content, error_message)
         """
-        try:
-            soup = BeautifulSoup(html_content, "lxml")
+        return await asyncio.to_thread(self.extract_content_sync, html_content, url)
+    
+    def extract_content_sync(
+        self,
+        html_content: str,
+        url: str
+    ) -> tuple[bool, Optional[str], Optional[str], Optional[str]]:
+        """
+        Extract title and main content from one parse of the HTML.
+        
+        A single lxml tree is shared by trafilatura's content and metadata
+        extraction, the <title> fallback and the fallback text extractor.
+        
+        Args:
+            html_content: Raw HTML content
+            url: Original URL (for logging)
             
-            # Extract title
-            title = None
-            title_tag = soup.find("title")
-            if title_tag:
-                title = title_tag.get_text().strip()
+        Returns:
+            Tuple of (success, title, content, error_message)
+        """
+        tree = load_html(html_content)
+        if tree is None:
+            return False, None, None, "Failed to parse HTML"
+        
+        # Read before extraction, which may prune the tree
+        page_title = self._page_title(tree)
+        
+        # Extract using trafilatura (best for article content)
+        result = trafilatura.bare_extraction(
+            tree,
+            url=url,
+            include_links=False,
+            include_images=False,
+            include_tables=True,
+            with_metadata=True,
+        )
+        if result is not None and not isinstance(result, dict):
+            # trafilatura >= 1.9 returns a Document
+            result = result.as_dict()
+        result = result or {}
+        
+        extracted_text = result.get("text")
+        if not extracted_text or len(extracted_text.strip()) < 100:
+            # Fallback to plain tree text if trafilatura fails
+            self.logger.info("url_fallback_lxml", url=url)
+            return self._extract_fallback(tree, page_title, url)
+        
+        # Title from trafilatura metadata, then the page's <title>
+        title = result.get("title") or result.get("sitename") or page_title
+        
+        self.logger.info(
+            "url_extracted",
+            url=url,
+            text_length=len(extracted_text)
+        )
+        
+        return True, title, extracted_text, None
+    
+    def _page_title(self, tree) -> Optional[str]:
+        """Get the document's <title> text."""
+        title = tree.findtext(".//title")
+        return title.strip() if title and title.strip() else None
+    
+    def _extract_fallback(
+        self,
+        tree,
+        title: Optional[str],
+        url: str
+    ) -> tuple[bool, Optional[str], Optional[str], Optional[str]]:
+        """
+        Fallback content extraction from the parsed tree.
+        
+        Args:
+            tree: Parsed HTML tree (modified in place)
+            title: Page <title> text
+            url: Original URL (for logging)
             
+        Returns:
+            Tuple of (success, title, content, error_message)
+        """
+        try:
             # Remove script and style elements
-            for script in soup(["script", "style", "nav", "footer", "header"]):
-                script.decompose()
+            for element in tree.xpath("//script|//style|//nav|//footer|//header"):
+                element.drop_tree()
             
             # Get text from main content areas
             main_content = None
-            for tag in ["article", "main", "div[class*='content']"]:
-                content_element = soup.find(tag)
-                if content_element:
-                    main_content = content_element.get_text()
+            for xpath in ["//article", "//main", "//div[contains(@class, 'content')]"]:
+                found = tree.xpath(xpath)
+                if found:
+                    main_content = found[0].text_content()
                     break
             
             # Fallback to body
             if not main_content:
-                body = soup.find("body")
-                if body:
-                    main_content = body.get_text()
+                body = tree.find(".//body")
+                if body is not None:
+                    main_content = body.text_content()
             
             if not main_content or len(main_content.strip()) < 100:
                 return False, None, None, "No sufficient content extracted"
@@ -157,7 +359,7 @@ class URLService:
             content = "\n".join(line for line in lines if line)
             
             self.logger.info(
-                "url_extracted_bs4",
+                "url_extracted_fallback",
                 url=url,
                 text_length=len(content)
             )
@@ -165,6 +367,6 @@ class URLService:
             return True, title, content, None
         
         except Exception as e:
-            error_msg = f"BeautifulSoup extraction failed: {str(e)}"
-            self.logger.error("url_bs4_error", url=url, error=str(e))
+            error_msg = f"Fallback extraction failed: {str(e)}"
+            self.logger.error("url_fallback_error", url=url, error=str(e))
             return False, None, None, error_msg
@@ -0,0 +1,70 @@
+"""
+Benchmark: HTML extraction throughput on a corpus of saved pages.
+
+Compares the single-parse URLService pipeline with the previous one
+(trafilatura.extract + trafilatura.extract_metadata + BeautifulSoup title,
+each parsing the page separately). Runs on one core. From backend/:
+
+    python -m benchmarks.bench_html_extraction path/to/pages/ [--rounds 3]
+
+The corpus is a directory of *.html files saved as UTF-8.
+"""
+import argparse
+import os
+import time
+from pathlib import Path
+
+# Settings require database fields; the benchmark never connects
+for _name in ("POSTGRES_HOST", "POSTGRES_USER", "POSTGRES_PASSWORD", "POSTGRES_DB"):
+    os.environ.setdefault(_name, "bench")
+
+import structlog  # noqa: E402
+import trafilatura  # noqa: E402
+
+from app.services.url_service import URLService  # noqa: E402
+
+
+def legacy_extract(html: str) -> None:
+    from bs4 import BeautifulSoup
+
+    text = trafilatura.extract(
+        html, include_links=False, include_images=False, include_tables=True
+    )
+    if text and len(text.strip()) >= 100:
+        metadata = trafilatura.extract_metadata(html)
+        if not (metadata and (metadata.title or metadata.sitename)):
+            BeautifulSoup(html, "lxml").find("title")
+
+
+def run(label: str, extract, pages: list[str], rounds: int) -> None:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for html in pages:
+            extract(html)
+    elapsed = time.perf_counter() - started
+    print(f"{label:>14}: {len(pages) * rounds / elapsed:8.1f} pages/sec")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("corpus", type=Path, help="Directory of saved .html pages")
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    pages = [p.read_text(encoding="utf-8") for p in sorted(args.corpus.glob("*.html"))]
+    if not pages:
+        raise SystemExit(f"No .html files in {args.corpus}")
+
+    # Keep per-page log lines out of the timing
+    structlog.configure(
+        wrapper_class=structlog.make_filtering_bound_logger(40)
+    )
+    service = URLService()
+
+    print(f"{len(pages)} pages x {args.rounds} rounds")
+    run("single-parse", lambda html: service.extract_content_sync(html, ""), pages, args.rounds)
+    run("legacy", legacy_extract, pages, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Microbenchmark: RSSHub route matching cost as the route table grows.
+
+Compares the host-indexed RSSHubRouteTable with a linear scan over
+uncompiled patterns (the previous matcher). Run from backend/:
+
+    python -m benchmarks.bench_rsshub_routes
+"""
+import os
+import re
+import timeit
+
+# Settings require database fields; the benchmark never connects
+for _name in ("POSTGRES_HOST", "POSTGRES_USER", "POSTGRES_PASSWORD", "POSTGRES_DB"):
+    os.environ.setdefault(_name, "bench")
+
+from app.services.rsshub_routes import RSSHubRouteTable  # noqa: E402
+
+SIZES = [10, 100, 1000, 5000]
+ROUTES_PER_HOST = 4
+LOOKUPS = 2000
+
+
+def make_rules(count: int) -> list[dict]:
+    rules = []
+    for i in range(count):
+        host = f"site{i // ROUTES_PER_HOST}.example.com"
+        kind = i % ROUTES_PER_HOST
+        rules.append(
+            {
+                "hosts": [host],
+                "path": rf"^/k{kind}/(?P<id>\d+)",
+                "template": f"/site{i // ROUTES_PER_HOST}/k{kind}/{{id}}",
+            }
+        )
+    return rules
+
+
+def linear_match(rules: list[dict], url: str):
+    hostname = url.split("/")[2]
+    path = "/" + url.split("/", 3)[3]
+    for rule in rules:
+        if not any(re.search(re.escape(host), hostname) for host in rule["hosts"]):
+            continue
+        match = re.match(rule["path"], path)
+        if match:
+            return rule["template"].format_map(match.groupdict())
+    return None
+
+
+def main() -> None:
+    print(f"{'routes':>8} {'indexed us/op':>14} {'linear us/op':>14}")
+    for size in SIZES:
+        rules = make_rules(size)
+        table = RSSHubRouteTable(rules)
+        # Worst case for the linear scan: the last host's last rule
+        last = (size - 1) // ROUTES_PER_HOST
+        url = f"https://www.site{last}.example.com/k{(size - 1) % ROUTES_PER_HOST}/42"
+        assert table.match(url) == linear_match(rules, url)
+
+        indexed = timeit.timeit(lambda: table.match(url), number=LOOKUPS)
+        linear = timeit.timeit(lambda: linear_match(rules, url), number=LOOKUPS // 10) * 10
+        print(
+            f"{size:>8} {indexed / LOOKUPS * 1e6:>14.2f} {linear / LOOKUPS * 1e6:>14.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
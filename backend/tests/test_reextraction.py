@@ -0,0 +1,108 @@
+"""
+Re-extraction must report pages ingested from an RSS crawl as unchanged.
+
+Feed refresh stores crawled full text with a raw_fetch_id; re-extraction
+re-runs the extractor over the archived page and compares content hashes.
+From backend/:
+
+    python -m pytest tests
+"""
+import os
+
+# Settings require database fields; the tests never connect
+for _name in ("POSTGRES_HOST", "POSTGRES_USER", "POSTGRES_PASSWORD", "POSTGRES_DB"):
+    os.environ.setdefault(_name, "test")
+
+from app.services import reextraction_service  # noqa: E402
+from app.services.boilerplate_service import BoilerplateModel  # noqa: E402
+from app.services.feed_refresh_service import FeedRefreshService  # noqa: E402
+from app.services.hashing import compute_content_hash  # noqa: E402
+from app.services.rss_service import RSSEntry  # noqa: E402
+from app.services.url_service import PageFetchResult, URLService  # noqa: E402
+
+# Repeated in every article body, so the source's model learns it as boilerplate
+SIGN_OFF = "Thanks for reading. Subscribe to the newsletter for weekly updates on everything we cover."
+
+PARAGRAPHS = [
+    (
+        "Engineers at the observatory finished calibrating the new spectrograph this week, "
+        "after months of delays caused by a shortage of cooling components."
+    ),
+    (
+        "The instrument will measure the chemical makeup of distant galaxies, and the first "
+        "survey is scheduled to begin before the end of the year if the weather allows it."
+    ),
+    (
+        "Funding for the second phase was approved by the regional council in a close vote, "
+        "with several members asking for more detail on long-term maintenance costs."
+    ),
+]
+
+
+def _page_html(index: int) -> str:
+    return (
+        f"<html><head><title>Article {index}</title></head><body>"
+        f"<nav><a href='/'>Home</a> <a href='/news'>News</a></nav>"
+        f"<article><p>{PARAGRAPHS[index]}</p><p>{SIGN_OFF}</p></article>"
+        f"<footer>Copyright Example News</footer></body></html>"
+    )
+
+
+def _model() -> BoilerplateModel:
+    return BoilerplateModel(
+        fingerprints={},
+        entries_seen=0,
+        decay=1.0,
+        min_occurrences=2.0,
+        min_entries=1,
+        max_fingerprints=1000,
+    )
+
+
+def _entry(index: int, content: str = "") -> RSSEntry:
+    return RSSEntry(
+        title=f"Article {index}",
+        url=f"https://example.com/articles/{index}",
+        content=content,
+        summary=None,
+        author=None,
+        published_at=None,
+        guid=f"https://example.com/articles/{index}",
+        updated_at=None,
+    )
+
+
+def test_reextracting_unchanged_crawled_page_is_unchanged(monkeypatch):
+    pages_html = {f"https://example.com/articles/{i}": _page_html(i) for i in range(len(PARAGRAPHS))}
+    entries = [_entry(i) for i in range(len(PARAGRAPHS))]
+
+    pages = {}
+    for url, html in pages_html.items():
+        success, title, content, error = URLService().extract_content_sync(html, url)
+        assert success, error
+        assert SIGN_OFF in content
+        pages[url] = PageFetchResult(True, title=title, content=content, html=html)
+
+    service = FeedRefreshService(db=None)
+    bodies = service._entry_bodies(entries, pages, _model())
+
+    # The archive holds the crawled HTML, keyed by its sha256
+    monkeypatch.setattr(
+        reextraction_service, "read_archived", lambda sha256: pages_html[sha256].encode("utf-8")
+    )
+    for entry, (content, _, _) in zip(entries, bodies):
+        success, reextracted, error = reextraction_service._reextract(entry.url, entry.url)
+        assert success, error
+        assert compute_content_hash(reextracted) == compute_content_hash(content)
+
+
+def test_feed_bodies_are_still_stripped():
+    entries = [
+        _entry(i, f"<p>{paragraph}</p><p>{SIGN_OFF}</p>") for i, paragraph in enumerate(PARAGRAPHS)
+    ]
+
+    service = FeedRefreshService(db=None)
+    bodies = service._entry_bodies(entries, {}, _model())
+
+    for paragraph, (content, _, _) in zip(PARAGRAPHS, bodies):
+        assert content == paragraph
@@ -0,0 +1,80 @@
+"""
+Streamed feed parsing must tolerate malformed ("bozo") feeds like feedparser.
+From backend/:
+
+    python -m pytest tests
+"""
+import asyncio
+import os
+
+# Settings require database fields; the tests never connect
+for _name in ("POSTGRES_HOST", "POSTGRES_USER", "POSTGRES_PASSWORD", "POSTGRES_DB"):
+    os.environ.setdefault(_name, "test")
+
+import httpx  # noqa: E402
+import pytest  # noqa: E402
+
+from app.services import rss_service  # noqa: E402
+from app.services.rss_service import FeedParseError, FeedStream, RSSService  # noqa: E402
+
+FEED_URL = "https://example.com/feed.xml"
+
+# Stray ampersands and HTML entities that XML does not define
+MALFORMED_ITEM = (
+    "<item><title>Tom & Jerry, episode {index}&nbsp;</title>"
+    "<link>https://example.com/episodes/{index}</link>"
+    "<guid>episode-{index}</guid>"
+    "<description>Rated &copy; by viewers & critics</description></item>"
+)
+
+
+class ChunkedStream(httpx.AsyncByteStream):
+    """Response body delivered in small chunks, as from the network."""
+
+    def __init__(self, body: bytes, chunk_size: int = 512):
+        self.body = body
+        self.chunk_size = chunk_size
+
+    async def __aiter__(self):
+        for start in range(0, len(self.body), self.chunk_size):
+            yield self.body[start:start + self.chunk_size]
+
+
+def _response(body: bytes) -> httpx.Response:
+    return httpx.Response(
+        200,
+        headers={"content-type": "application/rss+xml"},
+        stream=ChunkedStream(body),
+        request=httpx.Request("GET", FEED_URL),
+    )
+
+
+async def _entries(body: bytes) -> list:
+    return [entry async for entry in FeedStream(RSSService(), _response(body)).entries()]
+
+
+def test_malformed_feed_over_threshold_keeps_entries(monkeypatch):
+    items = "".join(MALFORMED_ITEM.format(index=index) for index in range(50))
+    body = (
+        '<?xml version="1.0" encoding="utf-8"?><rss version="2.0"><channel>'
+        f"<title>Cartoons</title>{items}</channel></rss>"
+    ).encode("utf-8")
+    monkeypatch.setattr(rss_service.settings, "rss_stream_parse_min_bytes", 1024)
+    assert len(body) > rss_service.settings.rss_stream_parse_min_bytes
+
+    entries = asyncio.run(_entries(body))
+    buffered = asyncio.run(RSSService()._parse_buffered(body, _response(body)))
+
+    assert len(entries) == 50
+    assert [entry.key for entry in entries] == [entry.key for entry in buffered]
+    assert entries[49].url == "https://example.com/episodes/49"
+    assert "episode 49" in entries[49].title
+    assert "by viewers" in entries[49].summary
+
+
+def test_non_feed_over_threshold_is_a_parse_error(monkeypatch):
+    body = ("<html><body>" + "<p>Not a feed</p>" * 200 + "</body></html>").encode("utf-8")
+    monkeypatch.setattr(rss_service.settings, "rss_stream_parse_min_bytes", 1024)
+
+    with pytest.raises(FeedParseError):
+        asyncio.run(_entries(body))